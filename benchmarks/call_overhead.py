@@ -0,0 +1,69 @@
+""" Measure the per-call overhead of the FMI functions in a tight doStep() / getReal() loop
+
+usage: python call_overhead.py [-n STEPS] FMU
+
+The FMU must support co-simulation (FMI 2.0) and have at least one Real output.
+"""
+
+import argparse
+import shutil
+from ctypes import c_double, c_uint
+from functools import partial
+from time import perf_counter
+
+from fmpy import read_model_description, extract, instantiate_fmu
+
+
+def run(fmu, c_functions, vrs, n_steps):
+
+    vr = (c_uint * len(vrs))(*vrs)
+    value = (c_double * len(vrs))()
+    step_size = 1e-3
+
+    if c_functions:
+        # call the status-checking functions that are bound to the instance
+        doStep = fmu._getFunction('fmi2DoStep')
+        getReal = fmu._getFunction('fmi2GetReal')
+    else:
+        # go through the methods of the class and _FMU._call()
+        doStep = partial(type(fmu).fmi2DoStep, fmu)
+        getReal = partial(type(fmu).fmi2GetReal, fmu)
+
+    component = fmu.component
+
+    start = perf_counter()
+
+    for i in range(n_steps):
+        doStep(component, i * step_size, step_size, 1)
+        getReal(component, vr, len(vrs), value)
+
+    return perf_counter() - start
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('filename', help="FMI 2.0 co-simulation FMU")
+    parser.add_argument('-n', '--steps', type=int, default=100000, help="number of steps")
+    args = parser.parse_args()
+
+    model_description = read_model_description(args.filename)
+
+    vrs = [v.valueReference for v in model_description.modelVariables if v.causality == 'output' and v.type == 'Real']
+
+    unzipdir = extract(args.filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'CoSimulation')
+
+    for c_functions, label in [(False, '_call()'), (True, 'bound functions')]:
+        fmu.reset()
+        fmu.setupExperiment()
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+        elapsed = run(fmu, c_functions, vrs, args.steps)
+        print(f"{label:>16}: {elapsed / args.steps * 1e6:.2f} us per step ({args.steps} steps)")
+
+    fmu.terminate()
+    fmu.freeInstance()
+
+    shutil.rmtree(unzipdir, ignore_errors=True)
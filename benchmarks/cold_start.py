@@ -0,0 +1,46 @@
+""" Compare the time to extract, load and instantiate FMUs
+
+usage: python cold_start.py FILENAME [FILENAME ...] [-n RUNS]
+
+The FMUs are simulated with a fresh extraction, with the extraction cache and with the shared library
+loaded from memory (Linux only) and the median of the cold start times is reported per FMU.
+"""
+
+import argparse
+import os
+from statistics import median
+
+from fmpy import simulate_fmu
+from fmpy.extraction_cache import extraction_cache
+from fmpy.memfd import can_load_from_memory
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('filenames', nargs='+', help="FMUs to simulate")
+    parser.add_argument('-n', '--runs', type=int, default=10, help="number of runs per FMU")
+    args = parser.parse_args()
+
+    variants = [('extract', False, False), ('extraction cache', True, False)]
+
+    if can_load_from_memory():
+        variants.append(('load from memory', False, True))
+
+    for filename in args.filenames:
+
+        print(os.path.basename(filename))
+
+        for label, use_cache, load_from_memory in variants:
+
+            extraction_cache.enabled = use_cache
+
+            times = []
+
+            for _ in range(args.runs):
+                result = simulate_fmu(filename, load_from_memory=load_from_memory)
+                times.append(result.statistics['cold_start'])
+
+            print(f"  {label}: {median(times) * 1e3:.2f} ms")
+
+        extraction_cache.clear()
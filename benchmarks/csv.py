@@ -0,0 +1,120 @@
+""" Compare the vectorized read_csv() and write_csv() with the previous row-by-row implementation
+
+usage: python csv.py [-r ROWS] [-c COLUMNS] [-a ARRAY_SIZE]
+"""
+
+import argparse
+import os
+from collections.abc import Iterable
+from tempfile import mkdtemp
+from time import perf_counter
+
+import numpy as np
+
+from fmpy.util import read_csv, write_csv
+
+
+def read_csv_rows(filename):
+    """ Previous implementation of read_csv() """
+
+    def parse(line):
+        row = []
+        for literal in line.rstrip().split(','):
+            values = literal.split(' ')
+            if len(values) > 1:
+                row.append(tuple(map(float, values)))
+            else:
+                row.append(float(literal))
+        return tuple(row)
+
+    with open(filename, 'r') as csv:
+
+        cols = []
+
+        names = csv.readline().rstrip().split(',')
+
+        rows = []
+
+        for line in csv:
+
+            if not cols:
+                for name, literal in zip(names, line.rstrip().split(',')):
+                    n = len(literal.split(' '))
+                    cols.append((name.strip('"'), np.float64, (n,) if n > 1 else None))
+
+            rows.append(parse(line))
+
+    return np.array(rows, dtype=np.dtype(cols))
+
+
+def write_csv_rows(filename, result):
+    """ Previous implementation of write_csv() """
+
+    with open(filename, 'w') as csv:
+
+        csv.write(','.join(map(lambda n: f'"{n}"', result.dtype.names)) + '\n')
+
+        for i in range(len(result)):
+            for j, name in enumerate(result.dtype.names):
+                value = result[i][name]
+                if isinstance(value, Iterable):
+                    literal = ' '.join(map(lambda v: f'{v:.16g}', value.flatten()))
+                else:
+                    literal = str(value)
+                if j > 0:
+                    csv.write(',')
+                csv.write(literal)
+            csv.write('\n')
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-r', '--rows', type=int, default=100000, help="number of rows")
+    parser.add_argument('-c', '--columns', type=int, default=10, help="number of scalar columns")
+    parser.add_argument('-a', '--array-size', type=int, default=3, help="size of the array column (0: no array column)")
+    args = parser.parse_args()
+
+    dtype = [('time', np.float64)] + [(f'x{i}', np.float64) for i in range(args.columns)]
+
+    if args.array_size > 0:
+        dtype.append(('a', np.float64, (args.array_size,)))
+
+    result = np.zeros(args.rows, dtype=dtype)
+    result['time'] = np.linspace(0, 1, args.rows)
+
+    rng = np.random.default_rng(0)
+
+    for name in result.dtype.names[1:]:
+        result[name] = rng.standard_normal(result[name].shape)
+
+    work_dir = mkdtemp()
+
+    results = []
+
+    for label, write, read in [('row-by-row', write_csv_rows, read_csv_rows), ('vectorized', write_csv, read_csv)]:
+
+        filename = os.path.join(work_dir, f'{label}.csv')
+
+        start = perf_counter()
+        write(filename, result)
+        t_write = perf_counter() - start
+
+        start = perf_counter()
+        traj = read(filename)
+        t_read = perf_counter() - start
+
+        with open(filename, 'rb') as f:
+            results.append((f.read(), traj))
+
+        os.remove(filename)
+
+        print(f"{label}: write {t_write:.3f} s, read {t_read:.3f} s")
+
+    # both implementations write the same file and read the same trajectories
+    (content1, traj1), (content2, traj2) = results
+
+    assert content1 == content2
+    assert np.array_equal(traj1, traj2)
+
+    os.rmdir(work_dir)
@@ -0,0 +1,83 @@
+""" Compare the cost of the Python and the native right-hand-side and root functions of CVode
+
+usage: python cvode_callbacks.py FILENAME [-n CALLS]
+
+FILENAME must be a model exchange FMU with continuous states.
+"""
+
+import argparse
+import shutil
+from ctypes import addressof, c_double
+from time import perf_counter
+
+from fmpy import read_model_description, extract, instantiate_fmu
+from fmpy.cvode_callbacks import create_callback_data
+from fmpy.simulation import Input
+from fmpy.sundials import CVodeSolver
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('filename', help="model exchange FMU")
+    parser.add_argument('-n', '--calls', type=int, default=100000, help="number of calls")
+    args = parser.parse_args()
+
+    model_description = read_model_description(args.filename)
+
+    unzipdir = extract(args.filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'ModelExchange')
+
+    is_fmi2 = model_description.fmiVersion == '2.0'
+    is_fmi3 = model_description.fmiVersion.startswith('3.0')
+
+    if is_fmi2:
+        fmu.setupExperiment()
+
+    if is_fmi2 or is_fmi3:
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+        fmu.enterContinuousTimeMode()
+    else:
+        fmu.initialize()
+
+    input = Input(fmu, model_description, None)
+
+    nz = model_description.numberOfEventIndicators
+    gout = (c_double * max(nz, 1))()
+
+    for label, callback_data in [('Python', None), ('native', create_callback_data(fmu))]:
+
+        solver = CVodeSolver(nx=model_description.numberOfContinuousStates,
+                             nz=nz,
+                             get_x=fmu.getContinuousStates,
+                             set_x=fmu.setContinuousStates,
+                             get_dx=fmu.getContinuousStateDerivatives if is_fmi3 else fmu.getDerivatives,
+                             get_z=fmu.getEventIndicators,
+                             get_nominals=fmu.getNominalsOfContinuousStates if is_fmi2 or is_fmi3 else fmu.getNominalContinuousStates,
+                             set_time=fmu.setTime,
+                             input=input,
+                             startTime=0.0,
+                             callbackData=callback_data)
+
+        user_data = None if callback_data is None else addressof(callback_data)
+
+        start = perf_counter()
+        for _ in range(args.calls):
+            solver.f_(0.0, solver.x, solver.x, user_data)
+        rhs = (perf_counter() - start) / args.calls
+
+        start = perf_counter()
+        for _ in range(args.calls):
+            solver.g_(0.0, solver.x, gout, user_data)
+        root = (perf_counter() - start) / args.calls
+
+        print(f"{label}: {rhs * 1e6:.2f} µs / right-hand-side, {root * 1e6:.2f} µs / root function")
+
+        del solver
+
+    fmu.terminate()
+    fmu.freeInstance()
+
+    shutil.rmtree(unzipdir, ignore_errors=True)
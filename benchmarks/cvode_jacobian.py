@@ -0,0 +1,69 @@
+""" Compare the solver statistics of CVode with difference quotients and with a Jacobian function
+
+usage: python cvode_jacobian.py [-n STATES]
+
+Integrates the stiff linear system dx/dt = A x with a tridiagonal matrix A.
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from fmpy.sundials import CVodeSolver
+
+
+class NoInput(object):
+
+    def apply(self, time):
+        pass
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--states', type=int, default=200, help="number of states")
+    args = parser.parse_args()
+
+    nx = args.states
+
+    A = np.diag(-np.logspace(0, 4, nx)) + np.eye(nx, k=1) + np.eye(nx, k=-1)
+
+    x = np.ones(nx)
+
+    def get_x(px, nx):
+        np.ctypeslib.as_array(px, (nx,))[:] = x
+
+    def set_x(px, nx):
+        x[:] = np.ctypeslib.as_array(px, (nx,))
+
+    def get_dx(pdx, nx):
+        np.ctypeslib.as_array(pdx, (nx,))[:] = A @ x
+
+    def get_nominals(pnominals, nx):
+        np.ctypeslib.as_array(pnominals, (nx,))[:] = 1.0
+
+    def get_jac(J):
+        J[:] = A
+
+    def run(jac):
+
+        x[:] = 1.0
+
+        solver = CVodeSolver(nx=nx, nz=0, get_x=get_x, set_x=set_x, get_dx=get_dx, get_z=None,
+                             get_nominals=get_nominals, set_time=lambda t: None, input=NoInput(),
+                             startTime=0.0, maxStep=1.0, relativeTolerance=1e-6, maxNumSteps=100000,
+                             get_jac=jac)
+
+        start = perf_counter()
+        solver.step(0.0, 10.0)
+        elapsed = perf_counter() - start
+
+        return elapsed, solver.statistics()
+
+    # warm up
+    run(get_jac)
+
+    for label, jac in [('difference quotients', None), ('Jacobian function', get_jac)]:
+        elapsed, statistics = run(jac)
+        print(f"{label}: {elapsed * 1e3:.1f} ms, " + ", ".join(f"{k}={v}" for k, v in statistics.items()))
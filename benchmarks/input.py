@@ -0,0 +1,85 @@
+""" Measure the cost of Input.apply() and Input.nextEvent() for large input tables
+
+usage: python input.py FILENAME [-r ROWS] [-n CALLS]
+
+The input table contains a saw tooth with a time event every 1000 rows for every continuous input and
+a step every 1000 rows for every discrete input.
+"""
+
+import argparse
+import shutil
+from time import perf_counter
+
+import numpy as np
+
+from fmpy import read_model_description, extract, instantiate_fmu
+from fmpy.simulation import Input
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('filename', help="FMU with inputs")
+    parser.add_argument('-r', '--rows', type=int, default=1000000, help="number of rows of the input table")
+    parser.add_argument('-n', '--calls', type=int, default=100000, help="number of calls")
+    args = parser.parse_args()
+
+    model_description = read_model_description(args.filename)
+
+    inputs = [v for v in model_description.modelVariables if v.causality == 'input' and not v.shape]
+
+    if not inputs:
+        raise Exception("The FMU has no scalar inputs.")
+
+    t = np.linspace(0, 1, args.rows)
+
+    # time events
+    t[1000::1000] = t[999:-1:1000]
+
+    saw_tooth = (np.arange(args.rows) % 1000) / 1000
+
+    dtype = [('time', np.float64)] + [(v.name, np.float64) for v in inputs]
+
+    signals = np.zeros(args.rows, dtype=dtype)
+
+    signals['time'] = t
+
+    for v in inputs:
+        if v.variability == 'continuous':
+            signals[v.name] = saw_tooth
+        else:
+            signals[v.name] = (np.arange(args.rows) // 1000) % 2
+
+    unzipdir = extract(args.filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'CoSimulation')
+
+    if model_description.fmiVersion == '2.0':
+        fmu.setupExperiment()
+
+    if model_description.fmiVersion == '1.0':
+        fmu.initialize()
+    else:
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+
+    input = Input(fmu, model_description, signals)
+
+    times = np.linspace(0, 1, args.calls).tolist()
+
+    start = perf_counter()
+    for time in times:
+        input.apply(time)
+    apply = (perf_counter() - start) / args.calls
+
+    start = perf_counter()
+    for time in times:
+        input.nextEvent(time)
+    next_event = (perf_counter() - start) / args.calls
+
+    print(f"{len(inputs)} inputs, {args.rows} rows: {apply * 1e6:.2f} µs / apply(), {next_event * 1e6:.2f} µs / nextEvent()")
+
+    fmu.terminate()
+    fmu.freeInstance()
+
+    shutil.rmtree(unzipdir, ignore_errors=True)
@@ -0,0 +1,42 @@
+""" Measure the latency of instantiate_fmu() and freeInstance()
+
+usage: python instantiate.py [-n INSTANCES] [--fmi-type TYPE] FMU
+"""
+
+import argparse
+import shutil
+from time import perf_counter
+
+from fmpy import read_model_description, extract, instantiate_fmu
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('filename', help="FMU to instantiate")
+    parser.add_argument('-n', '--instances', type=int, default=1000, help="number of instances")
+    parser.add_argument('--fmi-type', choices=['ModelExchange', 'CoSimulation'], help="the interface type")
+    args = parser.parse_args()
+
+    model_description = read_model_description(args.filename)
+
+    unzipdir = extract(args.filename)
+
+    # warm up
+    instantiate_fmu(unzipdir, model_description, args.fmi_type).freeInstance()
+
+    instantiate = 0
+    free = 0
+
+    for _ in range(args.instances):
+        start = perf_counter()
+        fmu = instantiate_fmu(unzipdir, model_description, args.fmi_type)
+        instantiated = perf_counter()
+        fmu.freeInstance()
+        instantiate += instantiated - start
+        free += perf_counter() - instantiated
+
+    print(f"instantiate_fmu(): {instantiate / args.instances * 1e3:.3f} ms")
+    print(f"freeInstance():    {free / args.instances * 1e3:.3f} ms")
+
+    shutil.rmtree(unzipdir, ignore_errors=True)
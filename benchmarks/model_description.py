@@ -0,0 +1,51 @@
+""" Measure the time and peak memory to read model descriptions
+
+usage: python model_description.py FILENAME [FILENAME ...] [--validate] [--lazy]
+
+Every model description is read in a new process and the increase of the peak resident set size
+(Linux and macOS) is reported together with the time to read the model description. With --lazy only
+the header of the model description is read.
+"""
+
+import argparse
+import multiprocessing
+import sys
+from time import perf_counter
+
+
+def read(filename, validate, lazy):
+
+    import resource
+    from fmpy import read_model_description
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = perf_counter()
+    model_description = read_model_description(filename, validate=validate, use_cache=False, lazy=lazy)
+    time = perf_counter() - start
+    name = model_description.modelName
+
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    scale = 1 if sys.platform == 'darwin' else 1024
+
+    return name, time, (after - before) * scale
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('filenames', nargs='+', help="FMUs or XML files to read")
+    parser.add_argument('--validate', action='store_true', help="validate the model descriptions")
+    parser.add_argument('--lazy', action='store_true', help="read only the header of the model descriptions")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+
+    for filename in args.filenames:
+
+        with context.Pool(1) as pool:
+            name, time, memory = pool.apply(read, (filename, args.validate, args.lazy))
+
+        print(f"{filename} ({name}): {time:.3f} s, {memory / 1024 ** 2:.0f} MB")
@@ -0,0 +1,77 @@
+""" Measure the recording overhead and the peak memory of the Recorder
+
+usage: python recorder.py FILENAME [-n SAMPLES]
+
+The Recorder is compared to a list of tuples that is converted to a structured array at the end.
+"""
+
+import argparse
+import shutil
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from fmpy import read_model_description, extract, instantiate_fmu
+from fmpy.simulation import Recorder
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('filename', help="co-simulation FMU")
+    parser.add_argument('-n', '--samples', type=int, default=1000000, help="number of samples")
+    args = parser.parse_args()
+
+    model_description = read_model_description(args.filename)
+
+    unzipdir = extract(args.filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'CoSimulation')
+
+    if model_description.fmiVersion == '2.0':
+        fmu.setupExperiment()
+
+    if model_description.fmiVersion == '1.0':
+        fmu.initialize()
+    else:
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+
+    def record_rows():
+        recorder = Recorder(fmu, model_description)
+        rows = []
+        for i in range(args.samples):
+            rows.append((float(i),) + recorder.plan.read().copy().item())
+        return np.array(rows, dtype=np.dtype(recorder.cols))
+
+    def record_chunks():
+        recorder = Recorder(fmu, model_description)
+        for i in range(args.samples):
+            recorder.sample(float(i))
+        return recorder.result()
+
+    for label, record in [('list of tuples', record_rows), ('chunks', record_chunks)]:
+
+        start = perf_counter()
+        record()
+        duration = perf_counter() - start
+
+        # measure the memory in a separate run as tracing slows down the allocations
+        tracemalloc.start()
+
+        result = record()
+
+        _, peak = tracemalloc.get_traced_memory()
+
+        tracemalloc.stop()
+
+        print(f"{label}: {duration / args.samples * 1e6:.2f} µs / sample, "
+              f"peak memory {peak / 1e6:.1f} MB ({peak / result.nbytes:.1f} x result)")
+
+        del result
+
+    fmu.terminate()
+    fmu.freeInstance()
+
+    shutil.rmtree(unzipdir, ignore_errors=True)
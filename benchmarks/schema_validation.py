@@ -0,0 +1,78 @@
+""" Measure the throughput of the validation of model descriptions
+
+usage: python schema_validation.py DIRECTORY [-n RUNS] [--threads THREADS]
+
+The modelDescription.xml of all FMUs in DIRECTORY (and its subdirectories) are validated against the
+compiled schemas of the schema registry and against schemas that are compiled for every FMU.
+"""
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+from lxml import etree
+
+import fmpy
+from fmpy import read_model_description
+
+
+def validate_registry(filename):
+    read_model_description(filename, validate=True, use_cache=False)
+
+
+def validate_compile(filename):
+    """ Validate against a newly compiled schema (the behavior before the schema registry) """
+
+    from zipfile import ZipFile
+
+    with ZipFile(filename, 'r') as zf:
+        root = etree.fromstring(zf.read('modelDescription.xml'))
+
+    fmi_version = root.get('fmiVersion')
+
+    module_dir = os.path.dirname(fmpy.__file__)
+
+    if fmi_version == '1.0':
+        schema_file = os.path.join(module_dir, 'schema', 'fmi1', 'fmiModelDescription.xsd')
+    elif fmi_version == '2.0':
+        schema_file = os.path.join(module_dir, 'schema', 'fmi2', 'fmi2ModelDescription.xsd')
+    else:
+        schema_file = os.path.join(module_dir, 'schema', 'fmi3', 'fmi3ModelDescription.xsd')
+
+    schema = etree.XMLSchema(file=schema_file)
+    schema.validate(root)
+
+    read_model_description(filename, validate=False, use_cache=False)
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', help="directory with the FMUs")
+    parser.add_argument('-n', '--runs', type=int, default=3, help="number of runs")
+    parser.add_argument('--threads', type=int, default=1, help="number of threads")
+    args = parser.parse_args()
+
+    filenames = sorted(str(p) for p in Path(args.directory).rglob('*.fmu'))
+
+    if not filenames:
+        parser.error(f"No FMUs found in {args.directory}.")
+
+    print(f"{len(filenames)} FMUs, {args.threads} thread(s)")
+
+    for name, validate in [('compile per FMU', validate_compile), ('schema registry', validate_registry)]:
+
+        best = float('inf')
+
+        for _ in range(args.runs):
+
+            start = perf_counter()
+
+            with ThreadPoolExecutor(max_workers=args.threads) as executor:
+                list(executor.map(validate, filenames))
+
+            best = min(best, perf_counter() - start)
+
+        print(f"{name:<16} {best:8.3f} s {len(filenames) / best:10.1f} FMUs/s")
@@ -0,0 +1,327 @@
+#include <math.h>
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#if defined _WIN32 || defined __CYGWIN__
+  #define EXPORT __declspec(dllexport)
+#else
+  #if __GNUC__ >= 4
+    #define EXPORT __attribute__ ((visibility ("default")))
+  #else
+    #define EXPORT
+  #endif
+#endif
+
+/* value types of the input groups */
+typedef enum {
+    TYPE_FLOAT64,
+    TYPE_FLOAT32,
+    TYPE_INT8,
+    TYPE_UINT8,
+    TYPE_INT16,
+    TYPE_UINT16,
+    TYPE_INT32,
+    TYPE_UINT32,
+    TYPE_INT64,
+    TYPE_UINT64,
+    TYPE_BOOL
+} ValueType;
+
+/* return codes of runLoop() */
+typedef enum {
+    LOOP_FINISHED,       /* the stop time has been reached */
+    LOOP_MAX_STEPS,      /* maxSteps have been performed */
+    LOOP_DISCARD,        /* doStep() returned fmi2Discard */
+    LOOP_ERROR,          /* an FMI function returned an error (see status) */
+    LOOP_TERMINATE,      /* the FMU requested to terminate the simulation */
+    LOOP_EARLY_RETURN    /* the FMU returned early from doStep() */
+} LoopResult;
+
+typedef int (*fmi2DoStepType)(void *c, double currentCommunicationPoint, double communicationStepSize, int noSetFMUStatePriorToCurrentPoint);
+typedef int (*fmi3DoStepType)(void *instance, double currentCommunicationPoint, double communicationStepSize, bool noSetFMUStatePriorToCurrentPoint, bool *eventHandlingNeeded, bool *terminateSimulation, bool *earlyReturn, double *lastSuccessfulTime);
+
+/* fmi2Get/Set{Type}() */
+typedef int (*fmi2AccessType)(void *c, const unsigned int vr[], size_t nvr, void *values);
+
+/* fmi3Get/Set{Type}() */
+typedef int (*fmi3AccessType)(void *instance, const unsigned int vr[], size_t nvr, void *values, size_t nValues);
+
+typedef struct {
+    void *function;             /* setter or getter */
+    const unsigned int *vrs;
+    size_t nvr;
+    void *values;               /* nvr values of the respective type */
+    int type;                   /* ValueType of the values (inputs only) */
+    int discrete;               /* hold the values between the samples (inputs only) */
+    const double *table;        /* nvr x nt samples (inputs only) */
+} VariableGroup;
+
+typedef struct {
+
+    int fmiVersion;             /* 2 or 3 */
+    void *instance;
+    void *doStep;
+    int canHandleVariableCommunicationStepSize;
+
+    double startTime;
+    double stopTime;
+    double outputInterval;
+
+    /* input */
+    size_t nt;
+    const double *t;
+    size_t nEvents;
+    const double *tEvents;
+    size_t nInputs;
+    VariableGroup *inputs;
+
+    /* output */
+    size_t nOutputs;
+    VariableGroup *outputs;
+    const char *record;         /* the values of the outputs */
+    size_t recordSize;
+
+    /* state of the loop */
+    double time;
+    long long nSteps;
+    double lastSuccessfulTime;
+    int status;
+
+    /* cursors into t and tEvents (see Input._index()) */
+    size_t inputIndex;
+    size_t eventIndex;
+
+} LoopData;
+
+/* math.isclose() with the default tolerances */
+static bool isClose(double a, double b) {
+    return a == b || fabs(a - b) <= 1e-9 * fmax(fabs(a), fabs(b));
+}
+
+static int callAccess(LoopData *data, VariableGroup *group) {
+    if (data->fmiVersion == 3) {
+        return ((fmi3AccessType)group->function)(data->instance, group->vrs, group->nvr, group->values, group->nvr);
+    } else {
+        return ((fmi2AccessType)group->function)(data->instance, group->vrs, group->nvr, group->values);
+    }
+}
+
+static void setValue(VariableGroup *group, size_t i, double value) {
+    switch (group->type) {
+        case TYPE_FLOAT64: ((double   *)group->values)[i] = value; break;
+        case TYPE_FLOAT32: ((float    *)group->values)[i] = (float)value; break;
+        case TYPE_INT8:    ((int8_t   *)group->values)[i] = (int8_t)value; break;
+        case TYPE_UINT8:   ((uint8_t  *)group->values)[i] = (uint8_t)value; break;
+        case TYPE_INT16:   ((int16_t  *)group->values)[i] = (int16_t)value; break;
+        case TYPE_UINT16:  ((uint16_t *)group->values)[i] = (uint16_t)value; break;
+        case TYPE_INT32:   ((int32_t  *)group->values)[i] = (int32_t)value; break;
+        case TYPE_UINT32:  ((uint32_t *)group->values)[i] = (uint32_t)value; break;
+        case TYPE_INT64:   ((int64_t  *)group->values)[i] = (int64_t)value; break;
+        case TYPE_UINT64:  ((uint64_t *)group->values)[i] = (uint64_t)value; break;
+        case TYPE_BOOL:    ((bool     *)group->values)[i] = value != 0.0; break;
+    }
+}
+
+/* apply the input at the right hand side of discontinuities (see Input.interpolate()) */
+static int applyInput(LoopData *data, double time) {
+
+    const size_t nt = data->nt;
+    const double *t = data->t;
+
+    if (data->nInputs == 0) {
+        return 0;
+    }
+
+    /* left insert index, starting at the index of the previous step */
+    size_t i0 = data->inputIndex;
+
+    while (i0 > 0 && t[i0 - 1] >= time) {
+        i0--;
+    }
+
+    while (i0 < nt && t[i0] < time) {
+        i0++;
+    }
+
+    data->inputIndex = i0;
+
+    for (size_t j = 0; j < data->nInputs; j++) {
+
+        VariableGroup *group = &data->inputs[j];
+
+        for (size_t k = 0; k < group->nvr; k++) {
+
+            const double *row = &group->table[k * nt];
+            double value;
+
+            if (nt < 2 || i0 == 0) {
+                value = row[0];
+            } else if (i0 == nt) {
+                value = row[nt - 1];
+            } else if (group->discrete) {
+                size_t i = i0 - 1;
+                while (i + 1 < nt && (t[i + 1] < time || isClose(time, t[i + 1]))) {
+                    i++;
+                }
+                value = row[i];
+            } else if (isClose(time, t[i0]) && i0 < nt - 1 && isClose(t[i0], t[i0 + 1])) {
+                size_t i = i0;
+                while (i < nt - 1 && isClose(t[i], t[i + 1])) {
+                    i++;
+                }
+                value = row[i];
+            } else {
+                const double t0 = t[i0 - 1];
+                const double t1 = t[i0];
+                const double w0 = (t1 - time) / (t1 - t0);
+                value = w0 * row[i0 - 1] + (1 - w0) * row[i0];
+            }
+
+            setValue(group, k, value);
+        }
+
+        const int status = callAccess(data, group);
+
+        if (status > 1) {
+            data->status = status;
+            return -1;
+        }
+    }
+
+    return 0;
+}
+
+/* get the first event after time (tEvents is sorted) */
+static double nextInputEvent(LoopData *data, double time) {
+
+    const double *tEvents = data->tEvents;
+
+    /* index of the first event after time, starting at the index of the previous step */
+    size_t i = data->eventIndex;
+
+    while (i > 0 && (tEvents[i - 1] > time && !isClose(tEvents[i - 1], time))) {
+        i--;
+    }
+
+    while (i < data->nEvents && (tEvents[i] <= time || isClose(tEvents[i], time))) {
+        i++;
+    }
+
+    data->eventIndex = i;
+
+    return i < data->nEvents ? tEvents[i] : INFINITY;
+}
+
+static int record(LoopData *data, char *buffer, size_t *nRows) {
+
+    for (size_t j = 0; j < data->nOutputs; j++) {
+
+        const int status = callAccess(data, &data->outputs[j]);
+
+        if (status > 1) {
+            data->status = status;
+            return -1;
+        }
+    }
+
+    char *row = buffer + *nRows * (sizeof(double) + data->recordSize);
+
+    memcpy(row, &data->time, sizeof(double));
+    memcpy(row + sizeof(double), data->record, data->recordSize);
+
+    (*nRows)++;
+
+    return 0;
+}
+
+/* perform up to maxSteps communication steps as in simulateCS() and record the outputs after every step
+   into buffer (rows of the time followed by the record) */
+EXPORT int runLoop(LoopData *data, char *buffer, size_t maxSteps, size_t *nRows) {
+
+    *nRows = 0;
+
+    for (size_t step = 0; step < maxSteps; step++) {
+
+        double time = data->time;
+
+        if (time > data->stopTime || isClose(time, data->stopTime)) {
+            return LOOP_FINISHED;
+        }
+
+        const double nextRegularPoint = data->startTime + (data->nSteps + 1) * data->outputInterval;
+
+        double nextCommunicationPoint = nextRegularPoint;
+
+        const double nextInputEventTime = nextInputEvent(data, time);
+
+        if (data->canHandleVariableCommunicationStepSize &&
+            nextCommunicationPoint > nextInputEventTime &&
+            !isClose(nextCommunicationPoint, nextInputEventTime)) {
+            nextCommunicationPoint = nextInputEventTime;
+        }
+
+        if (nextCommunicationPoint > data->stopTime && !isClose(nextCommunicationPoint, data->stopTime)) {
+            if (data->canHandleVariableCommunicationStepSize) {
+                nextCommunicationPoint = data->stopTime;
+            } else {
+                return LOOP_FINISHED;
+            }
+        }
+
+        const double stepSize = nextCommunicationPoint - time;
+
+        if (applyInput(data, time)) {
+            return LOOP_ERROR;
+        }
+
+        bool terminateSimulation = false;
+
+        if (data->fmiVersion == 3) {
+
+            bool eventHandlingNeeded = false;
+            bool earlyReturn = false;
+            double lastSuccessfulTime = 0.0;
+
+            const int status = ((fmi3DoStepType)data->doStep)(data->instance, time, stepSize, true, &eventHandlingNeeded, &terminateSimulation, &earlyReturn, &lastSuccessfulTime);
+
+            if (status > 1) {
+                data->status = status;
+                return LOOP_ERROR;
+            }
+
+            if (earlyReturn) {
+                data->lastSuccessfulTime = lastSuccessfulTime;
+                return LOOP_EARLY_RETURN;
+            }
+
+        } else {
+
+            const int status = ((fmi2DoStepType)data->doStep)(data->instance, time, stepSize, 1);
+
+            if (status == 2) {
+                return LOOP_DISCARD;
+            } else if (status > 2) {
+                data->status = status;
+                return LOOP_ERROR;
+            }
+        }
+
+        data->time = nextCommunicationPoint;
+
+        if (record(data, buffer, nRows)) {
+            return LOOP_ERROR;
+        }
+
+        if (terminateSimulation) {
+            return LOOP_TERMINATE;
+        }
+
+        if (isClose(data->time, nextRegularPoint)) {
+            data->nSteps++;
+        }
+    }
+
+    return LOOP_MAX_STEPS;
+}
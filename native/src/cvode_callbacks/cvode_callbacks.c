@@ -0,0 +1,103 @@
+#include <stddef.h>
+
+#if defined _WIN32 || defined __CYGWIN__
+  #define EXPORT __declspec(dllexport)
+#else
+  #if __GNUC__ >= 4
+    #define EXPORT __attribute__ ((visibility ("default")))
+  #else
+    #define EXPORT
+  #endif
+#endif
+
+/* The signatures of these functions are the same in FMI 1.0, 2.0 and 3.0 and
+   the status codes 0 (OK), 1 (Warning), 2 (Discard), 3 (Error) and 4 (Fatal)
+   have the same meaning */
+typedef int (*SetTimeType)(void *instance, double time);
+typedef int (*SetRealArrayType)(void *instance, const double values[], size_t n);
+typedef int (*GetRealArrayType)(void *instance, double values[], size_t n);
+
+typedef double *(*GetArrayPointerType)(void *v);
+
+typedef void (*ApplyInputType)(double time);
+
+typedef struct {
+
+    /* FMU instance and functions */
+    void *instance;
+    SetTimeType setTime;
+    SetRealArrayType setContinuousStates;
+    GetRealArrayType getDerivatives;
+    GetRealArrayType getEventIndicators;
+
+    /* N_VGetArrayPointer() of the serial N_Vector */
+    GetArrayPointerType getArrayPointer;
+
+    size_t nx;
+    size_t nz;
+
+    /* the model has no continuous states (a dummy state is integrated) */
+    int discrete;
+
+    /* Python callbacks to apply the input (NULL: no input) */
+    ApplyInputType applyInputRhs;
+    ApplyInputType applyInputRoot;
+
+    /* status of the last FMI call that failed */
+    int status;
+
+} CallbackData;
+
+#define CALL(f) status = f; \
+    if (status > 1) { \
+        data->status = status; \
+        return status == 2 ? 1 : -1; \
+    }
+
+/* right-hand-side function (CVRhsFn) */
+EXPORT int rhs(double t, void *y, void *ydot, void *user_data) {
+
+    CallbackData *data = (CallbackData *)user_data;
+    int status;
+
+    CALL(data->setTime(data->instance, t));
+
+    if (data->applyInputRhs) {
+        data->applyInputRhs(t);
+    }
+
+    double *dx = data->getArrayPointer(ydot);
+
+    if (data->discrete) {
+        for (size_t i = 0; i < data->nx; i++) {
+            dx[i] = 0.0;
+        }
+        return 0;
+    }
+
+    CALL(data->setContinuousStates(data->instance, data->getArrayPointer(y), data->nx));
+    CALL(data->getDerivatives(data->instance, dx, data->nx));
+
+    return 0;
+}
+
+/* root function (CVRootFn) */
+EXPORT int root(double t, void *y, double *gout, void *user_data) {
+
+    CallbackData *data = (CallbackData *)user_data;
+    int status;
+
+    CALL(data->setTime(data->instance, t));
+
+    if (data->applyInputRoot) {
+        data->applyInputRoot(t);
+    }
+
+    if (!data->discrete) {
+        CALL(data->setContinuousStates(data->instance, data->getArrayPointer(y), data->nx));
+    }
+
+    CALL(data->getEventIndicators(data->instance, gout, data->nz));
+
+    return 0;
+}
@@ -140,38 +140,26 @@ def fmi_info(filename):
         fmi_types     list of supported FMI types ('CoSimulation', 'ModelExchange')
     """
 
-    from lxml import etree
-    import zipfile
+    from .model_description import read_model_description
 
     fmi_types = []
 
-    # open the FMU
-    with zipfile.ZipFile(filename, 'r') as zf:
-
-        # read the model description
-        md = zf.open('modelDescription.xml')
-        tree = etree.parse(md)
-        root = tree.getroot()
-        fmi_version = root.get('fmiVersion')
+    # read the header of the model description
+    model_description = read_model_description(filename, validate=False, lazy=True)
 
-        # get the supported FMI types
-        if fmi_version == '1.0':
+    fmi_version = model_description.fmiVersion
 
-            if root.find('Implementation') is not None:
-                fmi_types.append('CoSimulation')
-            else:
-                fmi_types.append('ModelExchange')
+    # get the supported FMI types
+    if fmi_version in {'1.0', '2.0'}:
 
-        elif fmi_version == '2.0':
+        if model_description.modelExchange is not None:
+            fmi_types.append('ModelExchange')
 
-            if root.find('ModelExchange') is not None:
-                fmi_types.append('ModelExchange')
+        if model_description.coSimulation is not None:
+            fmi_types.append('CoSimulation')
 
-            if root.find('CoSimulation') is not None:
-                fmi_types.append('CoSimulation')
-
-        else:
-            raise Exception("Unsupported FMI version %s" % fmi_version)
+    else:
+        raise Exception("Unsupported FMI version %s" % fmi_version)
 
     return fmi_version, fmi_types
 
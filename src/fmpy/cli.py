@@ -59,9 +59,10 @@ Python version:     {sys.version}
     simulate_group.add_argument('--start-values', nargs='+', help="Name-value pairs of start values")
     simulate_group.add_argument('--apply-default-start-values', action='store_true', help="Apply the start values from the model description")
     simulate_group.add_argument('--output-interval', type=float, help="Interval for sampling the output")
-    simulate_group.add_argument('--input-file', help="CSV file to use as input")
+    simulate_group.add_argument('--input-file', help="CSV or NPY file to use as input (read in chunks or memory-mapped)")
     simulate_group.add_argument('--output-variables', nargs='+', help="Variables to record")
-    simulate_group.add_argument('--output-file', help="CSV to store the results")
+    simulate_group.add_argument('--output-file', help="CSV, NPZ, Arrow IPC (Feather), Parquet or Dymola result (MAT v4) file to store the results")
+    simulate_group.add_argument('--output-format', choices=['csv', 'npz', 'feather', 'parquet', 'mat'], help="Format of the output file (default: determined from the file extension)")
     simulate_group.add_argument('--timeout', type=float, help="Max. time to wait for the simulation to finish")
     simulate_group.add_argument('--debug-logging', action='store_true', help="Enable the FMU's debug logging")
     simulate_group.add_argument('--visible', action='store_true', help="Enable interactive mode")
@@ -167,7 +168,7 @@ Python version:     {sys.version}
     elif args.command == 'simulate':
 
         from fmpy import simulate_fmu
-        from fmpy.util import read_csv, write_csv, plot_result
+        from fmpy.util import read_csv, write_result, plot_result
 
         if args.start_values:
             if len(args.start_values) % 2 != 0:
@@ -176,7 +177,13 @@ Python version:     {sys.version}
         else:
             start_values = {}
 
-        input = read_csv(args.input_file) if args.input_file else None
+        if args.input_file is None:
+            input = None
+        elif args.input_file.lower().endswith('.npy'):
+            import numpy as np
+            input = np.load(args.input_file, mmap_mode='r')
+        else:
+            input = read_csv(args.input_file, chunk_size=65536)
 
         if args.fmi_logging:
             fmi_call_logger = lambda s: print('[FMI] ' + s)
@@ -203,7 +210,7 @@ Python version:     {sys.version}
                               fmi_call_logger=fmi_call_logger)
 
         if args.output_file:
-            write_csv(filename=args.output_file, result=result)
+            write_result(filename=args.output_file, result=result, format=args.output_format)
 
         if args.show_plot:
             plot_result(result=result, window_title=args.fmu_filename)
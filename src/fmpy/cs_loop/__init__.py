@@ -0,0 +1,243 @@
+import os
+from ctypes import *
+
+import numpy as np
+
+import fmpy
+
+library_dir, _ = os.path.split(__file__)
+
+cs_loop = cdll.LoadLibrary(os.path.join(library_dir, fmpy.platform, 'cs_loop' + fmpy.sharedLibraryExtension))
+
+# value types (see cs_loop.c)
+TYPE_FLOAT64, TYPE_FLOAT32, TYPE_INT8, TYPE_UINT8, TYPE_INT16, TYPE_UINT16, TYPE_INT32, TYPE_UINT32, TYPE_INT64, \
+    TYPE_UINT64, TYPE_BOOL = range(11)
+
+# return codes of runLoop()
+LOOP_FINISHED, LOOP_MAX_STEPS, LOOP_DISCARD, LOOP_ERROR, LOOP_TERMINATE, LOOP_EARLY_RETURN = range(6)
+
+# variable type -> (type of the FMI function, value type)
+_types = {
+    '2.0': {
+        'Real':        ('Real',    TYPE_FLOAT64),
+        'Integer':     ('Integer', TYPE_INT32),
+        'Enumeration': ('Integer', TYPE_INT32),
+        'Boolean':     ('Boolean', TYPE_INT32),
+    },
+    '3.0': {
+        'Float32':     ('Float32', TYPE_FLOAT32),
+        'Float64':     ('Float64', TYPE_FLOAT64),
+        'Int8':        ('Int8',    TYPE_INT8),
+        'UInt8':       ('UInt8',   TYPE_UINT8),
+        'Int16':       ('Int16',   TYPE_INT16),
+        'UInt16':      ('UInt16',  TYPE_UINT16),
+        'Int32':       ('Int32',   TYPE_INT32),
+        'UInt32':      ('UInt32',  TYPE_UINT32),
+        'Int64':       ('Int64',   TYPE_INT64),
+        'UInt64':      ('UInt64',  TYPE_UINT64),
+        'Enumeration': ('Int64',   TYPE_INT64),
+        'Boolean':     ('Boolean', TYPE_BOOL),
+    }
+}
+
+
+class VariableGroup(Structure):
+
+    _fields_ = [
+        ('function', c_void_p),
+        ('vrs', c_void_p),
+        ('nvr', c_size_t),
+        ('values', c_void_p),
+        ('type', c_int),
+        ('discrete', c_int),
+        ('table', c_void_p),
+    ]
+
+
+class LoopData(Structure):
+
+    _fields_ = [
+        ('fmiVersion', c_int),
+        ('instance', c_void_p),
+        ('doStep', c_void_p),
+        ('canHandleVariableCommunicationStepSize', c_int),
+        ('startTime', c_double),
+        ('stopTime', c_double),
+        ('outputInterval', c_double),
+        ('nt', c_size_t),
+        ('t', c_void_p),
+        ('nEvents', c_size_t),
+        ('tEvents', c_void_p),
+        ('nInputs', c_size_t),
+        ('inputs', POINTER(VariableGroup)),
+        ('nOutputs', c_size_t),
+        ('outputs', POINTER(VariableGroup)),
+        ('record', c_void_p),
+        ('recordSize', c_size_t),
+        ('time', c_double),
+        ('nSteps', c_longlong),
+        ('lastSuccessfulTime', c_double),
+        ('status', c_int),
+        ('inputIndex', c_size_t),
+        ('eventIndex', c_size_t),
+    ]
+
+
+runLoop = getattr(cs_loop, 'runLoop')
+runLoop.argtypes = [POINTER(LoopData), c_void_p, c_size_t, POINTER(c_size_t)]
+runLoop.restype = c_int
+
+
+class CoSimulationLoop(object):
+    """ Native co-simulation loop that performs the communication steps of simulateCS() in C
+
+    The inputs are interpolated and applied and the outputs are recorded without calling back into Python.
+    Only FMI 2.0 and 3.0 co-simulation FMUs without event mode, early return and input derivatives are supported.
+    """
+
+    def __init__(self, fmu, model_description, input, recorder, start_time, stop_time, output_interval, time):
+        """
+        Parameters:
+            fmu                the FMU instance (FMU2Slave or FMU3Slave)
+            model_description  the model description
+            input              the Input
+            recorder           the Recorder
+            start_time         the start time of the simulation
+            stop_time          the stop time of the simulation
+            output_interval    the output interval
+            time               the current time
+        """
+
+        if model_description.fmiVersion == '2.0':
+            version = '2.0'
+            prefix = 'fmi2'
+        elif model_description.fmiVersion.startswith('3.0'):
+            version = '3.0'
+            prefix = 'fmi3'
+        else:
+            raise Exception(f"The native co-simulation loop does not support FMI version {model_description.fmiVersion}.")
+
+        if fmu.fmiCallLogger is not None:
+            raise Exception("The native co-simulation loop cannot be used with an FMI call logger.")
+
+        if recorder._filtered:
+            raise Exception("The native co-simulation loop does not support the interval, decimation and deadband of the recorder.")
+
+        self.fmu = fmu
+        self.recorder = recorder
+        self.types = _types[version]
+
+        data = LoopData()
+
+        data.fmiVersion = 3 if version == '3.0' else 2
+        data.instance = fmu.component
+        data.doStep = self._function(f'{prefix}DoStep')
+        data.canHandleVariableCommunicationStepSize = bool(model_description.coSimulation.canHandleVariableCommunicationStepSize)
+        data.startTime = start_time
+        data.stopTime = stop_time
+        data.outputInterval = output_interval
+        data.time = time
+
+        # the arrays referenced by the LoopData
+        self._arrays = []
+
+        if input.windowed:
+            raise Exception("The native co-simulation loop does not support memory-mapped inputs.")
+
+        # input
+        if input.t is not None:
+
+            self.t = np.ascontiguousarray(input.t, dtype=np.float64)
+            self.t_events = np.ascontiguousarray(input.t_events, dtype=np.float64)
+
+            data.nt = self.t.size
+            data.t = self.t.ctypes.data
+            data.nEvents = self.t_events.size
+            data.tEvents = self.t_events.ctypes.data
+
+            groups = []
+
+            for discrete, infos in [(False, input.continuous), (True, input.discrete)]:
+
+                for info in infos:
+
+                    if info.table.ndim != 2:
+                        raise Exception("The native co-simulation loop does not support array inputs.")
+
+                    table = np.ascontiguousarray(info.table, dtype=np.float64)
+
+                    self._arrays.append(table)
+
+                    function_type, value_type = self.types[info.type]
+
+                    groups.append(VariableGroup(
+                        function=self._function(f'{prefix}Set{function_type}'),
+                        vrs=addressof(info.vrs),
+                        nvr=len(info.vrs),
+                        values=addressof(info.values),
+                        type=value_type,
+                        discrete=discrete,
+                        table=table.ctypes.data)
+                    )
+
+            data.nInputs = len(groups)
+            self.inputs = (VariableGroup * len(groups))(*groups)
+            data.inputs = self.inputs
+
+        # output
+        plan = recorder.plan
+
+        groups = []
+
+        for type, vrs, values, _, _, _ in plan._groups:
+            function_type, _ = self.types[type]
+            groups.append(VariableGroup(
+                function=self._function(f'{prefix}Get{function_type}'),
+                vrs=vrs.ctypes.data,
+                nvr=vrs.size,
+                values=values.ctypes.data)
+            )
+
+        data.nOutputs = len(groups)
+        self.outputs = (VariableGroup * len(groups))(*groups)
+        data.outputs = self.outputs
+
+        self.record = plan.record.reshape(1)
+        data.record = self.record.ctypes.data
+        data.recordSize = plan.dtype.itemsize
+
+        self.data = data
+
+    def _function(self, fname):
+        """ Get the address of an FMI function """
+        return cast(getattr(self.fmu.dll, self.fmu._functionSymbol(fname)), c_void_p).value
+
+    @property
+    def time(self):
+        return self.data.time
+
+    @property
+    def status(self):
+        """ The status of the last FMI call that failed """
+        return self.data.status
+
+    def run(self, max_steps):
+        """ Perform up to max_steps communication steps and record the outputs
+
+        Parameters:
+            max_steps  maximum number of steps
+
+        Returns:
+            the return code (LOOP_FINISHED, LOOP_MAX_STEPS, ...)
+        """
+
+        # the rows are written directly to the chunks of the recorder
+        rows = self.recorder.reserve(max_steps)
+
+        n_rows = c_size_t()
+
+        result = runLoop(byref(self.data), rows.ctypes.data, max_steps, byref(n_rows))
+
+        self.recorder.commit(n_rows.value)
+
+        return result
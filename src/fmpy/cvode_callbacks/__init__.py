@@ -0,0 +1,66 @@
+import os
+from ctypes import *
+import fmpy
+
+library_dir, _ = os.path.split(__file__)
+
+cvode_callbacks = cdll.LoadLibrary(os.path.join(library_dir, fmpy.platform, 'cvode_callbacks' + fmpy.sharedLibraryExtension))
+
+ApplyInputType = CFUNCTYPE(None, c_double)
+
+
+class CallbackData(Structure):
+    """ User data of the native right-hand-side and root functions (see cvode_callbacks.c) """
+
+    _fields_ = [
+        ('instance', c_void_p),
+        ('setTime', c_void_p),
+        ('setContinuousStates', c_void_p),
+        ('getDerivatives', c_void_p),
+        ('getEventIndicators', c_void_p),
+        ('getArrayPointer', c_void_p),
+        ('nx', c_size_t),
+        ('nz', c_size_t),
+        ('discrete', c_int),
+        ('applyInputRhs', ApplyInputType),
+        ('applyInputRoot', ApplyInputType),
+        ('status', c_int),
+    ]
+
+
+""" Right-hand-side function (CVRhsFn) that calls setTime(), setContinuousStates() and getDerivatives() of the FMU """
+rhs = cvode_callbacks.rhs
+
+""" Root function (CVRootFn) that calls setTime(), setContinuousStates() and getEventIndicators() of the FMU """
+root = cvode_callbacks.root
+
+
+def create_callback_data(fmu):
+    """ Create the CallbackData with the instance and the FMI functions of a model exchange FMU
+
+    Parameters:
+        fmu  the FMU instance (FMU1Model, FMU2Model or FMU3Model)
+
+    Returns:
+        the CallbackData
+    """
+
+    from fmpy.fmi1 import FMU1Model
+    from fmpy.fmi3 import FMU3Model
+
+    if isinstance(fmu, FMU1Model):
+        names = ['fmi1SetTime', 'fmi1SetContinuousStates', 'fmi1GetDerivatives', 'fmi1GetEventIndicators']
+    elif isinstance(fmu, FMU3Model):
+        names = ['fmi3SetTime', 'fmi3SetContinuousStates', 'fmi3GetContinuousStateDerivatives', 'fmi3GetEventIndicators']
+    else:
+        names = ['fmi2SetTime', 'fmi2SetContinuousStates', 'fmi2GetDerivatives', 'fmi2GetEventIndicators']
+
+    functions = [cast(getattr(fmu.dll, fmu._functionSymbol(name)), c_void_p).value for name in names]
+
+    data = CallbackData()
+
+    data.instance = fmu.component
+
+    data.setTime, data.setContinuousStates, data.getDerivatives, data.getEventIndicators = functions
+
+    return data
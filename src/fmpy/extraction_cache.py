@@ -0,0 +1,235 @@
+""" Process-wide cache of extracted FMUs
+
+The FMUs are extracted once into a directory that is named after the SHA-256 of the archive and reused by
+subsequent users. The directories are reference counted and the least recently used directories are removed
+when the extracted files exceed the disk budget of the cache.
+"""
+
+import os
+import shutil
+import threading
+from os import PathLike
+from time import monotonic
+
+from attrs import define, field
+
+
+@define(eq=False)
+class _Entry:
+
+    digest: str
+    """ SHA-256 of the FMU """
+
+    path: str
+    """ Directory that contains the extracted files """
+
+    size: int = 0
+    """ Size of the extracted files in bytes """
+
+    users: int = 0
+    """ Number of users that have acquired the directory """
+
+    exclusive: bool = False
+    """ The directory is used by a single user """
+
+    include: tuple[str, ...] | None = None
+    """ Prefixes of the extracted files (None: all files) """
+
+    lastUsed: float = field(factory=monotonic)
+    """ Time of the last release """
+
+
+class ExtractionCache(object):
+    """ Cache of extracted FMUs that is shared by all users in a process
+
+    acquire() returns the directory with the extracted files of an FMU and release() returns it to the cache.
+    Directories that are not in use are removed in least recently used order when the extracted files exceed
+    maxSize. The directories that are in use are never removed.
+    """
+
+    def __init__(self, directory: str | PathLike | None = None, maxSize: int = 2 * 1024 ** 3, enabled: bool = True):
+        """
+        Parameters:
+            directory  directory for the extracted FMUs (None: temporary directory that is removed on exit)
+            maxSize    disk budget for the extracted files in bytes
+            enabled    use the cache (False: extract to a new temporary directory for every user)
+        """
+
+        self.directory = None if directory is None else os.fspath(directory)
+        self.maxSize = maxSize
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._entries = {}  # path -> _Entry
+        self._digests = {}  # (path, size, mtime) -> SHA-256
+        self._temporary = set()  # directories of the users if the cache is disabled
+        self._cacheDir = None
+
+    def _cacheDirectory(self):
+        """ Get the cache directory and remove the cached files on exit """
+
+        import atexit
+
+        if self._cacheDir is None:
+
+            if self.directory is None:
+                from tempfile import mkdtemp
+                self._cacheDir = mkdtemp(prefix='fmpy-cache-')
+                atexit.register(shutil.rmtree, self._cacheDir, True)
+            else:
+                os.makedirs(self.directory, exist_ok=True)
+                self._cacheDir = self.directory
+
+            atexit.register(self.clear)
+
+        return self._cacheDir
+
+    def _digest(self, filename):
+        """ Get the SHA-256 of a file that is cached by its path, size and modification time """
+
+        from .util import sha256_checksum
+
+        stat = os.stat(filename)
+
+        key = (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            digest = self._digests.get(key)
+
+        if digest is None:
+            digest = sha256_checksum(filename)
+            with self._lock:
+                self._digests[key] = digest
+
+        return digest
+
+    def acquire(self, filename: str | PathLike, exclusive: bool = False, include: tuple[str, ...] | None = None) -> str:
+        """ Get a directory with the extracted files of an FMU
+
+        Parameters:
+            filename   filename of the FMU
+            exclusive  get a directory that is not used by any other user (e.g. for FMUs that can only
+                       be instantiated once per process)
+            include    prefixes of the files to extract (None: all files)
+
+        Returns:
+            the directory with the extracted files that must be returned with release()
+        """
+
+        from tempfile import mkdtemp
+        from zipfile import ZipFile
+        from . import extract
+
+        if include is not None:
+            include = tuple(include)
+
+        def included(name):
+            return include is None or name.startswith(include)
+
+        if not self.enabled or not isinstance(filename, (str, PathLike)):
+            unzipdir = str(extract(filename, include=None if include is None else included))
+            with self._lock:
+                self._temporary.add(unzipdir)
+            return unzipdir
+
+        digest = self._digest(filename)
+
+        with self._lock:
+
+            for entry in self._entries.values():
+                if entry.digest == digest and entry.size > 0 and not entry.exclusive and (entry.users == 0 or not exclusive) \
+                        and (entry.include is None or entry.include == include):
+                    entry.users += 1
+                    entry.exclusive = exclusive
+                    self._evict()
+                    return entry.path
+
+            # reserve a new directory
+            entry = _Entry(digest=digest, path=mkdtemp(prefix=digest[:16] + '-', dir=self._cacheDirectory()),
+                           users=1, exclusive=exclusive, include=include)
+
+            self._entries[entry.path] = entry
+
+        try:
+            extract(filename, unzipdir=entry.path, include=None if include is None else included)
+
+            with ZipFile(filename, 'r') as zf:
+                size = sum(info.file_size for info in zf.infolist() if included(info.filename))
+        except Exception:
+            with self._lock:
+                del self._entries[entry.path]
+            shutil.rmtree(entry.path, ignore_errors=True)
+            raise
+
+        with self._lock:
+            entry.size = max(size, 1)
+            self._evict()
+
+        return entry.path
+
+    def release(self, unzipdir: str | PathLike) -> None:
+        """ Return a directory that was acquired with acquire()
+
+        Parameters:
+            unzipdir  the directory returned by acquire()
+        """
+
+        unzipdir = os.fspath(unzipdir)
+
+        with self._lock:
+
+            entry = self._entries.get(unzipdir)
+
+            if entry is not None:
+
+                if entry.users == 0:
+                    raise Exception(f'"{unzipdir}" has already been released.')
+
+                entry.users -= 1
+                entry.exclusive = False
+                entry.lastUsed = monotonic()
+
+                self._evict()
+
+                return
+
+            if unzipdir not in self._temporary:
+                raise Exception(f'"{unzipdir}" has not been acquired.')
+
+            self._temporary.remove(unzipdir)
+
+        shutil.rmtree(unzipdir, ignore_errors=True)
+
+    def _evict(self):
+        """ Remove the least recently used directories that are not in use until the cache fits maxSize """
+
+        size = self.size
+
+        for entry in sorted(self._entries.values(), key=lambda e: e.lastUsed):
+
+            if size <= self.maxSize:
+                break
+
+            if entry.users == 0:
+                del self._entries[entry.path]
+                shutil.rmtree(entry.path, ignore_errors=True)
+                size -= entry.size
+
+    @property
+    def size(self) -> int:
+        """ Size of the extracted files in bytes """
+        return sum(entry.size for entry in self._entries.values())
+
+    def clear(self) -> None:
+        """ Remove all directories that are not in use """
+
+        with self._lock:
+
+            for entry in list(self._entries.values()):
+                if entry.users == 0:
+                    del self._entries[entry.path]
+                    shutil.rmtree(entry.path, ignore_errors=True)
+
+
+extraction_cache = ExtractionCache()
+""" The process-wide extraction cache """
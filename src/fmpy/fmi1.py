@@ -5,7 +5,7 @@ import typing
 import ctypes
 import types
 
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 import os
 import pathlib
@@ -35,6 +35,9 @@ from ctypes import (
     Structure,
     CFUNCTYPE,
 )
+
+import numpy as np
+
 from . import free, freeLibrary, platform, sharedLibraryExtension, calloc
 
 
@@ -120,6 +123,43 @@ except Exception as e:
     print(f"Failed to add logger proxy function. {e}")
 
 
+def _as_ctypes_array(
+    array: np.ndarray, dtype: np.dtype, ctype: type, writeable: bool = False
+) -> ctypes.Array:
+    """Create a ctypes array that shares the memory of a NumPy array"""
+
+    if array.dtype != dtype:
+        raise Exception(
+            f"The array must be of type {np.dtype(dtype)} but was {array.dtype}."
+        )
+
+    if not array.flags.c_contiguous:
+        raise Exception("The array must be C-contiguous.")
+
+    if writeable and not array.flags.writeable:
+        raise Exception("The array must be writeable.")
+
+    return (ctype * array.size).from_address(array.ctypes.data)
+
+
+def _check_array_size(vr: np.ndarray, values: np.ndarray, nValues: bool) -> None:
+    """Check the number of values before the FMU accesses the buffer
+
+    Without nValues the FMU accesses exactly one value per value reference. With nValues (FMI 3.0) the FMU
+    checks the number of values of array variables, but every variable has at least one value.
+    """
+
+    if nValues:
+        if values.size < vr.size:
+            raise Exception(
+                f"The number of values ({values.size}) must not be less than the number of value references ({vr.size})."
+            )
+    elif values.size != vr.size:
+        raise Exception(
+            f"The number of values ({values.size}) must be equal to the number of value references ({vr.size})."
+        )
+
+
 class FMICallException(Exception):
     """Raised when an FMI call fails"""
 
@@ -138,6 +178,20 @@ class FMICallException(Exception):
         "The status returned by the FMI function"
 
 
+def _status_checking(fname: str, f: Callable) -> Callable:
+    """Wrap an FMI function that returns a status to raise an FMICallException on errors"""
+
+    def call(*args):
+        res = f(*args)
+        if res > fmi1Warning:
+            raise FMICallException(function=fname, status=res)
+        return res
+
+    call.__name__ = fname
+
+    return call
+
+
 class _FMU(object):
     """Base class for all FMUs"""
 
@@ -158,7 +212,7 @@ class _FMU(object):
             unzipDirectory   folder where the FMU has been extracted
             instanceName     the name of the FMU instance
             libraryPath      path to the shared library
-            fmiCallLogger    logger callback that takes a message as input
+            fmiCallLogger    logger callback that takes a message as input (must be set before instantiation)
             requireFunctions assert required FMI functions in the shared library
         """
 
@@ -356,7 +410,10 @@ class _FMU(object):
     def _call(self, fname: str, *args) -> Any:
         """Call and log the FMI API function"""
 
-        f = self._functions[fname]
+        f = self._functions.get(fname)
+
+        if f is None:
+            f = self._loadFunction(fname)
 
         res = f(*args)
 
@@ -370,40 +427,39 @@ class _FMU(object):
 
         return res
 
-    def _loadFunctions(self) -> None:
-        """Load the FMI API functions from the shared library"""
+    @classmethod
+    def _getSignatures(cls) -> dict[str, tuple[list[str], list[type], type]]:
+        """Get the argument names, argument types and return type of the FMI API functions
+
+        The signatures are collected from the annotations of the fmi* methods once per class.
+        """
 
-        class_name = self.__class__.__name__
-        identifier = None
+        signatures = cls.__dict__.get("_signatures")
 
-        if class_name.startswith("FMU1"):
+        if signatures is not None:
+            return signatures
+
+        if cls.__name__.startswith("FMU1"):
             prefix = "fmi1"
-            identifier = self.modelIdentifier + "_"
-        elif class_name.startswith("FMU2"):
+        elif cls.__name__.startswith("FMU2"):
             prefix = "fmi2"
         else:
             prefix = "fmi3"
 
         import inspect
 
-        for name, value in inspect.getmembers(self):
-            if name.startswith(prefix):
-                py_fun = getattr(self, name)
-                sig = inspect.signature(py_fun)
-
-                c_fun_name = name
+        signatures = dict()
 
-                if identifier:
-                    c_fun_name = identifier + c_fun_name.replace("fmi1", "fmi")
-
-                c_fun: ctypes._FuncPointer = getattr(self.dll, c_fun_name)
+        for name, value in inspect.getmembers(cls, inspect.isfunction):
+            if name.startswith(prefix):
+                sig = inspect.signature(value)
 
                 argnames = []
                 argtypes = []
 
-                for param in sig.parameters.values():
+                # skip "self"
+                for param in list(sig.parameters.values())[1:]:
                     argnames.append(param.name)
-                    import typing
 
                     if isinstance(param.annotation, types.UnionType):
                         args = typing.get_args(param.annotation)
@@ -411,9 +467,6 @@ class _FMU(object):
                     else:
                         argtypes.append(param.annotation)
 
-                c_fun.argnames = argnames
-                c_fun.argtypes = argtypes
-
                 restype = sig.return_annotation
 
                 if restype is bytes:
@@ -421,8 +474,132 @@ class _FMU(object):
                 elif restype is int:
                     restype = c_int
 
-                c_fun.restype = restype
-                self._functions[name] = c_fun
+                signatures[name] = (argnames, argtypes, restype)
+
+        cls._signatures = signatures
+
+        return signatures
+
+    def _functionSymbol(self, fname: str) -> str:
+        """Get the name of the symbol of an FMI API function in the shared library"""
+
+        if self.__class__.__name__.startswith("FMU1"):
+            return self.modelIdentifier + "_" + fname.replace("fmi1", "fmi")
+        else:
+            return fname
+
+    def _loadFunctions(self) -> None:
+        """Check the FMI API functions in the shared library
+
+        The functions are loaded on first use (see _loadFunction()).
+        """
+
+        if not self.requireFunctions:
+            return
+
+        missing = [
+            self._functionSymbol(name)
+            for name in self._getSignatures()
+            if not hasattr(self.dll, self._functionSymbol(name))
+        ]
+
+        if missing:
+            raise Exception(
+                "The shared library does not export the functions "
+                + ", ".join(missing)
+                + "."
+            )
+
+    def _loadFunction(self, fname: str) -> Callable:
+        """Load an FMI API function from the shared library"""
+
+        argnames, argtypes, restype = self._getSignatures()[fname]
+
+        c_fun_name = self._functionSymbol(fname)
+
+        try:
+            c_fun: ctypes._FuncPointer = getattr(self.dll, c_fun_name)
+        except AttributeError:
+            raise Exception(f"The shared library does not export the function {c_fun_name}.")
+
+        c_fun.argnames = argnames
+        c_fun.argtypes = argtypes
+        c_fun.restype = restype
+
+        self._functions[fname] = c_fun
+
+        if self.fmiCallLogger is None:
+            # bind the function to the instance to bypass _call()
+            if restype == c_int:
+                setattr(self, fname, _status_checking(fname, c_fun))
+            else:
+                setattr(self, fname, c_fun)
+
+        return c_fun
+
+    def _getFunction(self, fname: str) -> Callable:
+        """Get the fastest callable for an FMI API function (loads the function if necessary)"""
+
+        if fname not in self._functions:
+            self._loadFunction(fname)
+
+        return getattr(self, fname)
+
+    def _getArray(
+        self, getter, vr, values: np.ndarray | None, dtype, ctype, nValues: bool = False
+    ) -> np.ndarray:
+        """Call a getter with the buffers of NumPy arrays
+
+        Parameters:
+            getter   the FMI getter function
+            vr       value references
+            values   preallocated array for the values (None: allocate an array with one value per value reference)
+            dtype    NumPy type of the values
+            ctype    ctypes type of the values
+            nValues  pass the number of values to the getter (FMI 3.0)
+        """
+
+        vr = np.ascontiguousarray(vr, dtype=np.uint32)
+
+        if values is None:
+            values = np.empty(vr.size, dtype=dtype)
+
+        _check_array_size(vr, values, nValues)
+
+        vr_ = _as_ctypes_array(vr, np.uint32, c_uint)
+        values_ = _as_ctypes_array(values, dtype, ctype, writeable=True)
+
+        if nValues:
+            getter(self.component, vr_, len(vr_), values_, len(values_))
+        else:
+            getter(self.component, vr_, len(vr_), values_)
+
+        return values
+
+    def _setArray(self, setter, vr, values, dtype, ctype, nValues: bool = False) -> None:
+        """Call a setter with the buffers of NumPy arrays
+
+        Parameters:
+            setter   the FMI setter function
+            vr       value references
+            values   the values
+            dtype    NumPy type of the values
+            ctype    ctypes type of the values
+            nValues  pass the number of values to the setter (FMI 3.0)
+        """
+
+        vr = np.ascontiguousarray(vr, dtype=np.uint32)
+        values = np.ascontiguousarray(values, dtype=dtype)
+
+        _check_array_size(vr, values, nValues)
+
+        vr_ = _as_ctypes_array(vr, np.uint32, c_uint)
+        values_ = _as_ctypes_array(values, dtype, ctype)
+
+        if nValues:
+            setter(self.component, vr_, len(vr_), values_, len(values_))
+        else:
+            setter(self.component, vr_, len(vr_), values_)
 
 
 class _FMU1(_FMU):
@@ -574,6 +751,41 @@ class _FMU1(_FMU):
         value = (fmi1String * len(vr))(*value)
         self.fmi1SetString(self.component, vr, len(vr), value)
 
+    # Data Exchange Functions for NumPy arrays
+
+    def getRealArray(self, vr, values=None):
+        """Get Real values without intermediate copies
+
+        Parameters:
+            vr      value references as a uint32 NumPy array
+            values  preallocated float64 NumPy array to write the values to (optional)
+
+        Returns:
+            the array that contains the values
+        """
+        return self._getArray(self.fmi1GetReal, vr, values, np.float64, fmi1Real)
+
+    def getIntegerArray(self, vr, values=None):
+        return self._getArray(self.fmi1GetInteger, vr, values, np.int32, fmi1Integer)
+
+    def getBooleanArray(self, vr, values=None):
+        return self._getArray(self.fmi1GetBoolean, vr, values, np.bool_, fmi1Boolean)
+
+    def setRealArray(self, vr, values):
+        """Set Real values without intermediate copies
+
+        Parameters:
+            vr      value references as a uint32 NumPy array
+            values  float64 NumPy array that holds the values
+        """
+        self._setArray(self.fmi1SetReal, vr, values, np.float64, fmi1Real)
+
+    def setIntegerArray(self, vr, values):
+        self._setArray(self.fmi1SetInteger, vr, values, np.int32, fmi1Integer)
+
+    def setBooleanArray(self, vr, values):
+        self._setArray(self.fmi1SetBoolean, vr, values, np.bool_, fmi1Boolean)
+
 
 class FMU1Slave(_FMU1):
     """An FMI 1.0 Co-Simulation FMU"""
@@ -17,6 +17,8 @@ from ctypes import (
 
 import pathlib
 
+import numpy as np
+
 from . import free, calloc
 from .fmi1 import _FMU, printLogMessage
 
@@ -456,6 +458,42 @@ class _FMU2(_FMU):
         value = (fmi2String * len(vr))(*value)
         self.fmi2SetString(self.component, vr, len(vr), value)
 
+    # Getting and setting variable values for NumPy arrays
+
+    def getRealArray(self, vr, values=None):
+        """Get Real values without intermediate copies
+
+        Parameters:
+            vr      value references as a uint32 NumPy array
+            values  preallocated float64 NumPy array to write the values to (optional)
+
+        Returns:
+            the array that contains the values
+        """
+        return self._getArray(self.fmi2GetReal, vr, values, np.float64, fmi2Real)
+
+    def getIntegerArray(self, vr, values=None):
+        return self._getArray(self.fmi2GetInteger, vr, values, np.int32, fmi2Integer)
+
+    def getBooleanArray(self, vr, values=None):
+        # fmi2Boolean is an int
+        return self._getArray(self.fmi2GetBoolean, vr, values, np.int32, fmi2Boolean)
+
+    def setRealArray(self, vr, values):
+        """Set Real values without intermediate copies
+
+        Parameters:
+            vr      value references as a uint32 NumPy array
+            values  float64 NumPy array that holds the values
+        """
+        self._setArray(self.fmi2SetReal, vr, values, np.float64, fmi2Real)
+
+    def setIntegerArray(self, vr, values):
+        self._setArray(self.fmi2SetInteger, vr, values, np.int32, fmi2Integer)
+
+    def setBooleanArray(self, vr, values):
+        self._setArray(self.fmi2SetBoolean, vr, values, np.int32, fmi2Boolean)
+
     # Getting and setting the internal FMU state
 
     def getFMUstate(self):
@@ -28,6 +28,8 @@ from ctypes import (
 import os
 from typing import Tuple, Sequence, List, Iterable
 
+import numpy as np
+
 from . import sharedLibraryExtension, platform_tuple
 from .fmi1 import _FMU
 
@@ -120,12 +122,13 @@ class _FMU3(_FMU):
 
     def __init__(self, **kwargs):
         # build the path to the shared library
-        kwargs["libraryPath"] = os.path.join(
-            kwargs["unzipDirectory"],
-            "binaries",
-            platform_tuple,
-            kwargs["modelIdentifier"] + sharedLibraryExtension,
-        )
+        if kwargs.get("libraryPath") is None:
+            kwargs["libraryPath"] = os.path.join(
+                kwargs["unzipDirectory"],
+                "binaries",
+                platform_tuple,
+                kwargs["modelIdentifier"] + sharedLibraryExtension,
+            )
 
         super(_FMU3, self).__init__(**kwargs)
 
@@ -1542,6 +1545,89 @@ class _FMU3(_FMU):
         values = (fmi3Clock * len(values))(*values)
         self.fmi3SetClock(self.component, vr, len(vr), values)
 
+    # Getting and setting variable values for NumPy arrays
+
+    def getFloat32Array(self, vr, values=None):
+        """Get Float32 values without intermediate copies
+
+        Parameters:
+            vr      value references as a uint32 NumPy array
+            values  preallocated float32 NumPy array to write the values to (optional)
+
+        Returns:
+            the array that contains the values
+        """
+        return self._getArray(self.fmi3GetFloat32, vr, values, np.float32, fmi3Float32, nValues=True)
+
+    def getFloat64Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetFloat64, vr, values, np.float64, fmi3Float64, nValues=True)
+
+    def getInt8Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetInt8, vr, values, np.int8, fmi3Int8, nValues=True)
+
+    def getUInt8Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetUInt8, vr, values, np.uint8, fmi3UInt8, nValues=True)
+
+    def getInt16Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetInt16, vr, values, np.int16, fmi3Int16, nValues=True)
+
+    def getUInt16Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetUInt16, vr, values, np.uint16, fmi3UInt16, nValues=True)
+
+    def getInt32Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetInt32, vr, values, np.int32, fmi3Int32, nValues=True)
+
+    def getUInt32Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetUInt32, vr, values, np.uint32, fmi3UInt32, nValues=True)
+
+    def getInt64Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetInt64, vr, values, np.int64, fmi3Int64, nValues=True)
+
+    def getUInt64Array(self, vr, values=None):
+        return self._getArray(self.fmi3GetUInt64, vr, values, np.uint64, fmi3UInt64, nValues=True)
+
+    def getBooleanArray(self, vr, values=None):
+        return self._getArray(self.fmi3GetBoolean, vr, values, np.bool_, fmi3Boolean, nValues=True)
+
+    def setFloat32Array(self, vr, values):
+        """Set Float32 values without intermediate copies
+
+        Parameters:
+            vr      value references as a uint32 NumPy array
+            values  float32 NumPy array that holds the values
+        """
+        self._setArray(self.fmi3SetFloat32, vr, values, np.float32, fmi3Float32, nValues=True)
+
+    def setFloat64Array(self, vr, values):
+        self._setArray(self.fmi3SetFloat64, vr, values, np.float64, fmi3Float64, nValues=True)
+
+    def setInt8Array(self, vr, values):
+        self._setArray(self.fmi3SetInt8, vr, values, np.int8, fmi3Int8, nValues=True)
+
+    def setUInt8Array(self, vr, values):
+        self._setArray(self.fmi3SetUInt8, vr, values, np.uint8, fmi3UInt8, nValues=True)
+
+    def setInt16Array(self, vr, values):
+        self._setArray(self.fmi3SetInt16, vr, values, np.int16, fmi3Int16, nValues=True)
+
+    def setUInt16Array(self, vr, values):
+        self._setArray(self.fmi3SetUInt16, vr, values, np.uint16, fmi3UInt16, nValues=True)
+
+    def setInt32Array(self, vr, values):
+        self._setArray(self.fmi3SetInt32, vr, values, np.int32, fmi3Int32, nValues=True)
+
+    def setUInt32Array(self, vr, values):
+        self._setArray(self.fmi3SetUInt32, vr, values, np.uint32, fmi3UInt32, nValues=True)
+
+    def setInt64Array(self, vr, values):
+        self._setArray(self.fmi3SetInt64, vr, values, np.int64, fmi3Int64, nValues=True)
+
+    def setUInt64Array(self, vr, values):
+        self._setArray(self.fmi3SetUInt64, vr, values, np.uint64, fmi3UInt64, nValues=True)
+
+    def setBooleanArray(self, vr, values):
+        self._setArray(self.fmi3SetBoolean, vr, values, np.bool_, fmi3Boolean, nValues=True)
+
     # Getting Variable Dependency Information
     def getNumberOfVariableDependencies(self, valueReference: int) -> int:
         valueReference = fmi3ValueReference(valueReference)
@@ -0,0 +1,346 @@
+""" Sparse Jacobians from directional derivatives or finite differences """
+
+from ctypes import POINTER, c_double, c_uint
+
+import numpy as np
+
+
+def _get_variables(model_description, names):
+
+    variables = dict((v.name, v) for v in model_description.modelVariables)
+
+    result = []
+
+    for name in names:
+
+        if name not in variables:
+            raise Exception(f'Variable "{name}" does not exist.')
+
+        variable = variables[name]
+
+        if variable.type not in {'Real', 'Float64'}:
+            raise Exception(f'Variable "{name}" must be of type Real or Float64 but is {variable.type}.')
+
+        if variable.shape:
+            raise Exception(f'Variable "{name}" is an array which is not supported.')
+
+        result.append(variable)
+
+    return result
+
+
+def get_sparsity_pattern(model_description, unknowns, knowns):
+    """ Get the sparsity pattern of the Jacobian from the dependencies in the ModelStructure
+
+    Unknowns that are not listed in the ModelStructure or have no dependencies attribute
+    are assumed to depend on all knowns.
+
+    Parameters:
+        model_description  the model description
+        unknowns           list of names of the unknowns (rows)
+        knowns             list of names of the knowns (columns)
+
+    Returns:
+        a Boolean NumPy array of shape (len(unknowns), len(knowns))
+    """
+
+    unknown_variables = _get_variables(model_description, unknowns)
+    known_variables = _get_variables(model_description, knowns)
+
+    # the ModelStructure entries by variable
+    structure = dict()
+
+    for unknown in model_description.outputs + model_description.derivatives:
+        structure[unknown.variable] = unknown
+
+    columns = dict((variable, j) for j, variable in enumerate(known_variables))
+
+    pattern = np.zeros((len(unknowns), len(knowns)), dtype=bool)
+
+    for i, variable in enumerate(unknown_variables):
+
+        unknown = structure.get(variable)
+
+        if unknown is None or unknown.dependencies is None:
+            pattern[i, :] = True
+            continue
+
+        for dependency in unknown.dependencies:
+            j = columns.get(dependency)
+            if j is not None:
+                pattern[i, j] = True
+
+    return pattern
+
+
+def color_columns(pattern):
+    """ Group the columns of a sparsity pattern so that the columns of one group have no rows in common
+
+    Columns are assigned greedily in the order of decreasing number of non-zeros.
+
+    Parameters:
+        pattern  Boolean array of shape (m, n)
+
+    Returns:
+        an integer NumPy array with the color (0, 1, ...) of every column
+    """
+
+    pattern = np.asarray(pattern, dtype=bool)
+
+    m, n = pattern.shape
+
+    colors = np.full(n, -1, dtype=np.int64)
+
+    rows = [np.flatnonzero(pattern[:, j]) for j in range(n)]
+
+    # the colors that have been assigned to the columns of each row
+    row_colors = [set() for _ in range(m)]
+
+    for j in sorted(range(n), key=lambda j: -len(rows[j])):
+
+        forbidden = set()
+
+        for i in rows[j]:
+            forbidden |= row_colors[i]
+
+        color = 0
+
+        while color in forbidden:
+            color += 1
+
+        colors[j] = color
+
+        for i in rows[j]:
+            row_colors[i].add(color)
+
+    return colors
+
+
+class Jacobian(object):
+    """ Helper class to evaluate the Jacobian of a set of unknowns with respect to a set of knowns
+
+    Columns with the same color (see color_columns()) are evaluated together with one call to
+    getDirectionalDerivative(). If the FMU does not provide directional derivatives, forward
+    differences are calculated for every color. Continuous states are perturbed with
+    setContinuousStates(), all other knowns with setReal() / setFloat64().
+
+    The value references and buffers are created once, so the Jacobian can be evaluated
+    repeatedly (e.g. by an integrator).
+    """
+
+    def __init__(self, fmu, model_description, unknowns, knowns, pattern=None, colors=None, use_directional_derivatives=None):
+        """
+        Parameters:
+            fmu                          the FMU instance
+            model_description            the model description
+            unknowns                     list of names of the unknowns (rows)
+            knowns                       list of names of the knowns (columns)
+            pattern                      Boolean sparsity pattern (None: get_sparsity_pattern())
+            colors                       colors of the columns (None: color_columns())
+            use_directional_derivatives  use getDirectionalDerivative() (None: if provided by the FMU)
+        """
+
+        self.fmu = fmu
+        self.modelDescription = model_description
+
+        self.is_fmi3 = model_description.fmiVersion.startswith('3.0')
+
+        self.unknown_vrs = np.array([v.valueReference for v in _get_variables(model_description, unknowns)], dtype=np.uint32)
+        self.known_variables = _get_variables(model_description, knowns)
+        self.known_vrs = np.array([v.valueReference for v in self.known_variables], dtype=np.uint32)
+
+        if pattern is None:
+            pattern = get_sparsity_pattern(model_description, unknowns, knowns)
+
+        if colors is None:
+            colors = color_columns(pattern)
+
+        self.pattern = pattern
+        """ Boolean sparsity pattern """
+
+        self.colors = colors
+        """ Colors of the columns """
+
+        if use_directional_derivatives is None:
+            from .fmi1 import FMU1Slave
+            from .fmi2 import FMU2Slave
+            from .fmi3 import FMU3Slave
+            # the interface type of the instance
+            if isinstance(fmu, (FMU1Slave, FMU2Slave, FMU3Slave)):
+                interface_type = model_description.coSimulation
+            else:
+                interface_type = model_description.modelExchange
+            use_directional_derivatives = interface_type is not None and interface_type.providesDirectionalDerivative
+
+        self.use_directional_derivatives = use_directional_derivatives
+
+        n_colors = int(colors.max()) + 1 if colors.size > 0 else 0
+
+        # (rows, columns, row indices, column indices, arguments) for every color
+        self._colors = []
+
+        for color in range(n_colors):
+
+            columns = np.flatnonzero(colors == color)
+            rows = np.flatnonzero(pattern[:, columns].any(axis=1))
+
+            if rows.size == 0:
+                continue
+
+            # every row has exactly one non-zero in the columns of a color
+            r, c = np.nonzero(pattern[np.ix_(rows, columns)])
+
+            args = None
+
+            if use_directional_derivatives:
+                vUnknown_ref = (c_uint * rows.size)(*self.unknown_vrs[rows])
+                vKnown_ref = (c_uint * columns.size)(*self.known_vrs[columns])
+                seed = (c_double * columns.size)(*([1.0] * columns.size))
+                sensitivity = np.zeros(rows.size)
+                sensitivity_ = sensitivity.ctypes.data_as(POINTER(c_double))
+                if self.is_fmi3:
+                    args = (vUnknown_ref, rows.size, vKnown_ref, columns.size, seed, columns.size, sensitivity_, rows.size)
+                else:
+                    args = (vUnknown_ref, rows.size, vKnown_ref, columns.size, seed, sensitivity_)
+                args = (sensitivity, args)
+
+            self._colors.append((rows, columns, rows[r], columns[c], r, args))
+
+        if use_directional_derivatives:
+            self._getDirectionalDerivative = fmu._getFunction('fmi3GetDirectionalDerivative' if self.is_fmi3 else 'fmi2GetDirectionalDerivative')
+        else:
+            # map the knowns that are continuous states to their index in the state vector
+            if hasattr(fmu, 'getContinuousStates'):
+                state_indices = dict()
+                for i, derivative in enumerate(model_description.derivatives):
+                    state_indices[derivative.variable.derivative] = i
+                self._states = np.array([v in state_indices for v in self.known_variables], dtype=bool)
+                self._state_indices = np.array([state_indices.get(v, -1) for v in self.known_variables], dtype=np.int64)
+                self._x = np.zeros(model_description.numberOfContinuousStates)
+            else:
+                self._states = np.zeros(len(self.known_variables), dtype=bool)
+                self._state_indices = None
+                self._x = None
+
+            self._nominals = np.ones(len(knowns))
+
+            for j, variable in enumerate(self.known_variables):
+                if variable.nominal is not None:
+                    self._nominals[j] = abs(float(variable.nominal))
+
+    def _get_values(self, vrs):
+        return self.fmu.getFloat64Array(vrs) if self.is_fmi3 else self.fmu.getRealArray(vrs)
+
+    def _set_knowns(self, values):
+        """ Set the values of the knowns (continuous states through setContinuousStates()) """
+
+        states = self._states
+
+        if states.any():
+            self._x[self._state_indices[states]] = values[states]
+            self.fmu.setContinuousStates(self._x.ctypes.data_as(POINTER(c_double)), self._x.size)
+
+        others = ~states
+
+        if others.any():
+            if self.is_fmi3:
+                self.fmu.setFloat64Array(self.known_vrs[others], values[others])
+            else:
+                self.fmu.setRealArray(self.known_vrs[others], values[others])
+
+    def evaluate(self, out=None):
+        """ Evaluate the Jacobian at the current values of the knowns
+
+        Parameters:
+            out  dense NumPy array of shape (len(unknowns), len(knowns)) to write the Jacobian to
+
+        Returns:
+            out if given, otherwise the Jacobian as a scipy.sparse.csc_matrix
+        """
+
+        if out is not None:
+            out[...] = 0.0
+
+        data = []
+        row_indices = []
+        column_indices = []
+
+        if not self.use_directional_derivatives:
+
+            if self._x is not None:
+                self.fmu.getContinuousStates(self._x.ctypes.data_as(POINTER(c_double)), self._x.size)
+
+            known_values = self._get_values(self.known_vrs)
+
+            states = self._states
+
+            if states.any():
+                known_values[states] = self._x[self._state_indices[states]]
+
+            unknown_values = self._get_values(self.unknown_vrs)
+
+            h = np.sqrt(np.finfo(np.float64).eps) * np.maximum(np.abs(known_values), self._nominals)
+
+        component = self.fmu.component
+
+        for rows, columns, i, j, r, args in self._colors:
+
+            if self.use_directional_derivatives:
+                sensitivity, args = args
+                self._getDirectionalDerivative(component, *args)
+                values = sensitivity[r]
+            else:
+                perturbed = known_values.copy()
+                perturbed[columns] += h[columns]
+                self._set_knowns(perturbed)
+                values = (self._get_values(self.unknown_vrs[rows]) - unknown_values[rows])[r] / h[j]
+                self._set_knowns(known_values)
+
+            if out is not None:
+                out[i, j] = values
+            else:
+                data.append(values)
+                row_indices.append(i)
+                column_indices.append(j)
+
+        if out is not None:
+            return out
+
+        from scipy.sparse import csc_matrix
+
+        if data:
+            data = np.concatenate(data)
+            row_indices = np.concatenate(row_indices)
+            column_indices = np.concatenate(column_indices)
+        else:
+            data = np.zeros(0)
+            row_indices = column_indices = np.zeros(0, dtype=np.int64)
+
+        return csc_matrix((data, (row_indices, column_indices)), shape=self.pattern.shape)
+
+
+def compute_jacobian(fmu, model_description, unknowns, knowns, pattern=None, colors=None, use_directional_derivatives=None):
+    """ Compute the Jacobian of the unknowns with respect to the knowns (see Jacobian)
+
+    Parameters:
+        fmu                          the FMU instance
+        model_description            the model description
+        unknowns                     list of names of the unknowns (rows)
+        knowns                       list of names of the knowns (columns)
+        pattern                      Boolean sparsity pattern (None: get_sparsity_pattern())
+        colors                       colors of the columns (None: color_columns())
+        use_directional_derivatives  use getDirectionalDerivative() (None: if provided by the FMU)
+
+    Returns:
+        the Jacobian as a scipy.sparse.csc_matrix of shape (len(unknowns), len(knowns))
+    """
+
+    jacobian = Jacobian(fmu=fmu,
+                        model_description=model_description,
+                        unknowns=unknowns,
+                        knowns=knowns,
+                        pattern=pattern,
+                        colors=colors,
+                        use_directional_derivatives=use_directional_derivatives)
+
+    return jacobian.evaluate()
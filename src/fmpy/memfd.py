@@ -0,0 +1,89 @@
+""" Load the shared library of an FMU from memory (Linux only)
+
+The shared library is copied from the archive to an anonymous file created with memfd_create() and loaded
+from /proc/self/fd/<fd>, so the binaries are never written to the file system. Only the resources and the
+modelDescription.xml are extracted and only if the FMU contains resources.
+"""
+
+import os
+import sys
+from os import PathLike
+
+
+def can_load_from_memory() -> bool:
+    """ Check if the shared libraries can be loaded from memory on this platform """
+    return sys.platform.startswith('linux') and hasattr(os, 'memfd_create') and os.path.isdir('/proc/self/fd')
+
+
+class MemoryBinary(object):
+    """ Shared library of an FMU in an anonymous file """
+
+    def __init__(self, filename: str | PathLike, modelIdentifier: str, fmiVersion: str = '2.0'):
+        """
+        Parameters:
+            filename         filename of the FMU
+            modelIdentifier  the model identifier of the shared library to load
+            fmiVersion       the FMI version of the FMU
+        """
+
+        from shutil import copyfileobj
+        from tempfile import mkdtemp
+        from zipfile import ZipFile
+        from . import extract, platform, platform_tuple, sharedLibraryExtension
+
+        if not can_load_from_memory():
+            raise Exception("Loading shared libraries from memory is only supported on Linux.")
+
+        library_dir = f'binaries/{platform_tuple if fmiVersion.startswith("3.0") else platform}/'
+
+        library = library_dir + modelIdentifier + sharedLibraryExtension
+
+        self.fd = None
+
+        self.unzipDirectory = None
+        """ Directory with the extracted resources """
+
+        try:
+            with ZipFile(filename, 'r') as zf:
+
+                names = zf.namelist()
+
+                if library not in names:
+                    raise Exception(f"{filename} does not contain {library}.")
+
+                dependencies = [n for n in names if n.startswith(library_dir) and n != library and not n.endswith('/')]
+
+                if dependencies:
+                    raise Exception(f"The shared library of {filename} cannot be loaded from memory because {library_dir} contains other files.")
+
+                self.fd = os.memfd_create(modelIdentifier + sharedLibraryExtension, os.MFD_CLOEXEC)
+
+                with zf.open(library) as src, open(os.dup(self.fd), 'wb') as dst:
+                    copyfileobj(src, dst, 1024 * 1024)
+
+                has_resources = any(n.startswith('resources/') for n in names)
+
+            self.unzipDirectory = mkdtemp()
+
+            if has_resources:
+                extract(filename, unzipdir=self.unzipDirectory,
+                        include=lambda n: n.startswith('resources/') or n == 'modelDescription.xml')
+        except Exception:
+            # close the anonymous file and remove the temporary directory
+            self.close()
+            raise
+
+        self.libraryPath = f'/proc/self/fd/{self.fd}'
+        """ Path to load the shared library from """
+
+    def close(self) -> None:
+        """ Close the anonymous file and remove the extracted resources """
+
+        from shutil import rmtree
+
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+        if self.unzipDirectory is not None:
+            rmtree(self.unzipDirectory, ignore_errors=True)
@@ -1,6 +1,9 @@
 """ Object model and loader for the modelDescription.xml """
 from __future__ import annotations
 
+import gc
+import threading
+from contextlib import contextmanager
 from os import PathLike
 from pathlib import Path
 
@@ -395,6 +398,49 @@ class ModelDescription:
         self.instantiationToken = value
 
 
+class _LazyModelDescription(ModelDescription):
+    """ Model description that reads the elements after the header on first access (see read_model_description()) """
+
+    __slots__ = ('_filename', '_options')
+
+    _lazyAttributes = ('numberOfContinuousStates', 'numberOfEventIndicators', 'buildConfigurations', 'unitDefinitions',
+                       'typeDefinitions', 'modelVariables', 'outputs', 'derivatives', 'clockedStates', 'eventIndicators',
+                       'initialUnknowns')
+
+    def __init__(self, header: ModelDescription, filename: str | PathLike, options: dict):
+        """
+        Parameters:
+            header    the model description with the header attributes
+            filename  filename of the FMU or XML file or directory with extracted FMU
+            options   the options of read_model_description() to read the complete model description
+        """
+
+        from attrs import fields
+
+        for attribute in fields(ModelDescription):
+            if attribute.name not in self._lazyAttributes:
+                setattr(self, attribute.name, getattr(header, attribute.name))
+
+        self._filename = filename
+        self._options = options
+
+    def __getattr__(self, name):
+
+        # only called for attributes that have not been set
+        if name not in self._lazyAttributes:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        model_description = read_model_description(self._filename, **self._options)
+
+        for attribute in self._lazyAttributes:
+            try:
+                object.__getattribute__(self, attribute)
+            except AttributeError:
+                setattr(self, attribute, getattr(model_description, attribute))
+
+        return object.__getattribute__(self, name)
+
+
 class ValidationError(Exception):
     """ Exception raised for failed validation of the modelDescription.xml
 
@@ -469,14 +515,14 @@ def read_build_description(filename: str | PathLike | IO, validate=True) -> list
 
     if validate:
 
+        from .validation import validate_xml
+
         module_dir, _ = os.path.split(__file__)
-        schema = etree.XMLSchema(file=os.path.join(module_dir, 'schema', 'fmi3', 'fmi3BuildDescription.xsd'))
 
-        if not schema.validate(root):
-            message = "Failed to validate buildDescription.xml:"
-            for entry in schema.error_log:
-                message += "\n%s (line %d, column %d): %s" % (entry.level_name, entry.line, entry.column, entry.message)
-            raise Exception(message)
+        problems = validate_xml(root, os.path.join(module_dir, 'schema', 'fmi3', 'fmi3BuildDescription.xsd'))
+
+        if problems:
+            raise Exception("Failed to validate buildDescription.xml:" + ''.join("\n" + problem for problem in problems))
 
     build_configurations = []
 
@@ -511,7 +557,37 @@ def read_build_description(filename: str | PathLike | IO, validate=True) -> list
     return build_configurations
 
 
-def read_model_description(filename: str | PathLike | IO, validate: bool = True, validate_variable_names: bool = False, validate_model_structure: bool = False) -> ModelDescription:
+_gc_lock = threading.Lock()
+_gc_users = 0
+_gc_enabled = False
+
+
+@contextmanager
+def _gc_disabled():
+    """ Disable the garbage collector of the process while a large number of objects but no garbage is created
+
+    The calls are counted, so the garbage collector is re-enabled (if it was enabled before) when the last of
+    the nested or concurrent calls has finished.
+    """
+
+    global _gc_users, _gc_enabled
+
+    with _gc_lock:
+        if _gc_users == 0:
+            _gc_enabled = gc.isenabled()
+            gc.disable()
+        _gc_users += 1
+
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_users -= 1
+            if _gc_users == 0 and _gc_enabled:
+                gc.enable()
+
+
+def read_model_description(filename: str | PathLike | IO, validate: bool = True, validate_variable_names: bool = False, validate_model_structure: bool = False, use_cache: bool = False, lazy: bool = False) -> ModelDescription:
     """ Read the model description from an FMU without extracting it
 
     Parameters:
@@ -519,31 +595,146 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
         validate                  whether the model description should be validated
         validate_variable_names   validate the variable names against the EBNF
         validate_model_structure  validate the model structure
+        use_cache                 read the parsed model description from the persistent model description cache
+                                  (see fmpy.model_description_cache)
+        lazy                      read only the attributes of the root element, the log categories, the default
+                                  experiment and the FMI types and read the remaining attributes (e.g. modelVariables)
+                                  and validate the model description on first access (only for FMI 2.0 and 3.0 model
+                                  descriptions given by a filename)
+
+    The garbage collector of the process is disabled while the XML is parsed (see _gc_disabled()).
 
     returns:
         model_description   a ModelDescription object
     """
 
+    if lazy and isinstance(filename, (str, PathLike)):
+
+        import os
+        import zipfile
+
+        if os.path.isdir(filename):  # extracted FMU
+            xml = open(os.path.join(filename, 'modelDescription.xml'), 'rb')
+        elif os.fspath(filename).lower().endswith('.xml'):  # XML file
+            xml = open(filename, 'rb')
+        else:  # FMU
+            with zipfile.ZipFile(filename, 'r') as zf:
+                xml = zf.open('modelDescription.xml')
+
+        with xml:
+            header = _parse_model_description(xml, header_only=True)
+
+        # the FMI types of FMI 1.0 are defined after the model variables
+        if header.fmiVersion != '1.0':
+            return _LazyModelDescription(header, filename, options=dict(
+                validate=validate,
+                validate_variable_names=validate_variable_names,
+                validate_model_structure=validate_model_structure,
+                use_cache=use_cache))
+
+    if use_cache and isinstance(filename, (str, PathLike)):
+
+        from .model_description_cache import model_description_cache
+
+        if model_description_cache.enabled:
+            return model_description_cache.read(filename,
+                                                validate=validate,
+                                                validate_variable_names=validate_variable_names,
+                                                validate_model_structure=validate_model_structure)
+
     import zipfile
     from lxml import etree
     import os
     from . import validation
+
+    def open_xml():
+        """ Open the modelDescription.xml as a binary file """
+        if isinstance(filename, (str, os.PathLike)) and os.path.isdir(filename):  # extracted FMU
+            return open(os.path.join(filename, 'modelDescription.xml'), 'rb')
+        elif isinstance(filename, str) and os.path.isfile(filename) and filename.lower().endswith('.xml'):  # XML file
+            return open(filename, 'rb')
+        else:  # FMU as path or file like object
+            with zipfile.ZipFile(filename, 'r') as zf:
+                return zf.open('modelDescription.xml')
+
+    schema = None
+
+    if validate:
+
+        # read the FMI version from the root element to select the schema
+        with open_xml() as xml:
+            _, root = next(etree.iterparse(xml, events=('start',)))
+
+        fmiVersion = root.get('fmiVersion')
+
+        module_dir, _ = os.path.split(__file__)
+
+        if fmiVersion == '1.0':
+            schema_file = os.path.join(module_dir, 'schema', 'fmi1', 'fmiModelDescription.xsd')
+        elif fmiVersion == '2.0':
+            schema_file = os.path.join(module_dir, 'schema', 'fmi2', 'fmi2ModelDescription.xsd')
+        elif fmiVersion is not None and fmiVersion.startswith('3.'):
+            schema_file = os.path.join(module_dir, 'schema', 'fmi3', 'fmi3ModelDescription.xsd')
+        else:
+            raise Exception("Unsupported FMI version: %s" % fmiVersion)
+
+        schema = validation.xml_schema(schema_file)
+
+    # parsing creates many objects but no garbage
+    with _gc_disabled():
+        try:
+            with open_xml() as xml:
+                modelDescription = _parse_model_description(xml, schema=schema, filename=filename, validate=validate)
+        except Exception:
+            if schema is None:
+                raise
+            # the elements are validated while they are parsed, so the problems are collected from the complete tree
+            with open_xml() as xml:
+                problems = validation.validate_xml(etree.parse(xml).getroot(), schema_file)
+            if problems:
+                raise ValidationError(problems) from None
+            raise
+
+    if validate:
+        problems = validation.validate_model_description(modelDescription,
+                                                         validate_variable_names=validate_variable_names,
+                                                         validate_model_structure=validate_model_structure)
+        if problems:
+            raise ValidationError(problems)
+
+    return modelDescription
+
+
+def _parse_model_description(xml: IO, schema=None, filename: str | PathLike | IO | None = None, validate: bool = True, header_only: bool = False) -> ModelDescription:
+    """ Parse a modelDescription.xml with etree.iterparse()
+
+    The model variables and the unknowns of the model structure are removed from the tree as soon as they have
+    been read, so the peak memory does not depend on the size of the DOM. The references are resolved afterwards.
+
+    Parameters:
+        xml          binary file object of the modelDescription.xml
+        schema       XMLSchema to validate the elements while they are parsed (None: don't validate)
+        filename     filename passed to read_model_description() (to read the buildDescription.xml)
+        validate     whether the buildDescription.xml should be validated
+        header_only  stop before the build configurations, units, types, model variables and model structure
+
+    returns:
+        model_description   a ModelDescription object
+    """
+
+    from itertools import chain
+    from lxml import etree
     import numpy as np
 
-    # remember the original filename
-    _filename = filename
+    context = etree.iterparse(xml, events=('end',), schema=schema)
 
-    if isinstance(filename, (str, os.PathLike)) and os.path.isdir(filename):  # extracted FMU
-        filename = os.path.join(filename, 'modelDescription.xml')
-        tree = etree.parse(filename)
-    elif isinstance(filename, str) and os.path.isfile(filename) and filename.lower().endswith('.xml'):  # XML file
-        tree = etree.parse(filename)
-    else:  # FMU as path or file like object
-        with zipfile.ZipFile(filename, 'r') as zf:
-            xml = zf.open('modelDescription.xml')
-            tree = etree.parse(xml)
+    # parse the elements before the model variables
+    for _, element in context:
+        parent = element.getparent()
+        if parent is not None and parent.tag == 'ModelVariables':
+            break
 
-    root = tree.getroot()
+    root = element.getroottree().getroot()
 
     fmiVersion = root.get('fmiVersion')
 
@@ -554,22 +745,6 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
     if not is_fmi1 and not is_fmi2 and not is_fmi3:
         raise Exception("Unsupported FMI version: %s" % fmiVersion)
 
-    if validate:
-
-        module_dir, _ = os.path.split(__file__)
-
-        if is_fmi1:
-            schema = etree.XMLSchema(file=os.path.join(module_dir, 'schema', 'fmi1', 'fmiModelDescription.xsd'))
-        elif is_fmi2:
-            schema = etree.XMLSchema(file=os.path.join(module_dir, 'schema', 'fmi2', 'fmi2ModelDescription.xsd'))
-        else:
-            schema = etree.XMLSchema(file=os.path.join(module_dir, 'schema', 'fmi3', 'fmi3ModelDescription.xsd'))
-
-        if not schema.validate(root):
-            problems = ["%s (line %d, column %d): %s" % (e.level_name, e.line, e.column, e.message)
-                        for e in schema.error_log]
-            raise ValidationError(problems)
-
     modelDescription = ModelDescription()
 
     _copy_attributes(root, modelDescription, [
@@ -593,8 +768,6 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
 
     if is_fmi1:
         modelDescription.numberOfContinuousStates = int(root.get('numberOfContinuousStates'))
-    elif is_fmi2:
-        modelDescription.numberOfContinuousStates = len(root.findall('ModelStructure/Derivatives/Unknown'))
 
     # log categories
     for l in root.findall('LogCategories/Category'):
@@ -611,18 +784,7 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
         )
 
     # model description
-    if is_fmi1:
-
-        modelIdentifier = root.get('modelIdentifier')
-
-        if root.find('Implementation') is not None:
-            modelDescription.coSimulation = CoSimulation()
-            modelDescription.coSimulation.modelIdentifier = modelIdentifier
-        else:
-            modelDescription.modelExchange = ModelExchange()
-            modelDescription.modelExchange.modelIdentifier = modelIdentifier
-
-    elif is_fmi2:
+    if is_fmi2:
 
         for me in root.findall('ModelExchange'):
             modelDescription.modelExchange = ModelExchange()
@@ -652,11 +814,12 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
                               'canSerializeFMUstate',
                               'providesDirectionalDerivative'])
 
-    else:
+    elif is_fmi3:
 
         def get_fmu_state_attributes(element, object):
             object.canGetAndSetFMUstate = element.get('canGetAndSetFMUState') in {'true', '1'}
             object.canSerializeFMUstate = element.get('canSerializeFMUState') in {'true', '1'}
+            object.providesDirectionalDerivative = element.get('providesDirectionalDerivatives') in {'true', '1'}
 
         for me in root.findall('ModelExchange'):
             modelDescription.modelExchange = ModelExchange()
@@ -673,6 +836,9 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
             _copy_attributes(se, modelDescription.scheduledExecution)
             get_fmu_state_attributes(se, modelDescription.scheduledExecution)
 
+    if header_only:
+        return modelDescription
+
     # build configurations
     if is_fmi2:
 
@@ -693,9 +859,9 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
                 buildConfiguration.sourceFileSets.append(source_file_set)
                 source_file_set.sourceFiles = source_files
 
-    elif is_fmi3 and not (isinstance(_filename, (str, PathLike)) and Path(_filename).name.endswith('.xml')):
-        # read buildDescription.xml if _filename is a folder or ZIP file
-        modelDescription.buildConfigurations = read_build_description(_filename, validate=validate)
+    elif is_fmi3 and filename is not None and not (isinstance(filename, (str, PathLike)) and Path(filename).name.endswith('.xml')):
+        # read buildDescription.xml if filename is a folder or ZIP file
+        modelDescription.buildConfigurations = read_build_description(filename, validate=validate)
 
     # unit definitions
     if is_fmi1:
@@ -789,8 +955,31 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
         'continuous': {'input': 'exact', 'output': 'calculated', 'local': 'calculated', 'independent': None},
     }
 
-    # model variables
-    for variable in root.find('ModelVariables'):
+    unknowns = {}  # element name -> [(sourceline, attributes)]
+
+    # model variables and model structure
+    for _, variable in chain([(None, element)], context):
+
+        parent = variable.getparent()
+
+        if parent is None:
+            continue  # root element
+
+        if parent.tag != 'ModelVariables':
+
+            if is_fmi2 and variable.tag == 'Unknown':
+                unknowns.setdefault(parent.tag, []).append((variable.sourceline, dict(variable.attrib)))
+            elif is_fmi3 and parent.tag == 'ModelStructure':
+                unknowns.setdefault(variable.tag, []).append((variable.sourceline, dict(variable.attrib)))
+            else:
+                continue
+
+            variable.clear()
+
+            while variable.getprevious() is not None:
+                del parent[0]
+
+            continue
 
         if variable.get("name") is None:
             continue
@@ -916,6 +1105,26 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
 
         modelDescription.modelVariables.append(sv)
 
+        # remove the processed elements
+        variable.clear()
+
+        while variable.getprevious() is not None:
+            del parent[0]
+
+    if is_fmi1:
+
+        modelIdentifier = root.get('modelIdentifier')
+
+        if root.find('Implementation') is not None:
+            modelDescription.coSimulation = CoSimulation()
+            modelDescription.coSimulation.modelIdentifier = modelIdentifier
+        else:
+            modelDescription.modelExchange = ModelExchange()
+            modelDescription.modelExchange.modelIdentifier = modelIdentifier
+
+    elif is_fmi2:
+        modelDescription.numberOfContinuousStates = len(unknowns.get('Derivatives', []))
+
     variables = dict((v.valueReference, v) for v in modelDescription.modelVariables)
 
     # resolve dimension variables and calculate initial shape
@@ -940,9 +1149,9 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
                               (modelDescription.derivatives, 'Derivatives'),
                               (modelDescription.initialUnknowns, 'InitialUnknowns')]:
 
-            for u in root.findall('ModelStructure/' + element + '/Unknown'):
+            for sourceline, u in unknowns.get(element, []):
                 unknown = Unknown()
-                unknown.sourceline = u.sourceline
+                unknown.sourceline = sourceline
                 unknown.variable = modelDescription.modelVariables[int(u.get('index')) - 1]
 
                 dependencies = u.get('dependencies')
@@ -992,19 +1201,19 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
                               (modelDescription.initialUnknowns, 'InitialUnknown'),
                               (modelDescription.eventIndicators, 'EventIndicator')]:
 
-            for u in root.findall('ModelStructure/' + element):
+            for sourceline, u in unknowns.get(element, []):
                 unknown = Unknown()
-                unknown.sourceline = u.sourceline
+                unknown.sourceline = sourceline
                 unknown.variable = variables[int(u.get('valueReference'))]
 
-                if "dependencies" in u.attrib:
+                if "dependencies" in u:
                     dependencies = u.get('dependencies').strip()
                     if len(dependencies) == 0:
                         unknown.dependencies = []
                     else:
                         unknown.dependencies = list(map(lambda vr: variables[int(vr)], dependencies.split(' ')))
 
-                if "dependenciesKind" in u.attrib:
+                if "dependenciesKind" in u:
                     dependenciesKind = u.get('dependenciesKind').strip()
                     if len(dependenciesKind) == 0:
                         unknown.dependenciesKind = []
@@ -1035,15 +1244,9 @@ def read_model_description(filename: str | PathLike | IO, validate: bool = True,
         for unknown in modelDescription.eventIndicators:
             modelDescription.numberOfEventIndicators += int(np.prod(unknown.variable.shape))
 
-    if validate:
-        problems = validation.validate_model_description(modelDescription,
-                                                         validate_variable_names=validate_variable_names,
-                                                         validate_model_structure=validate_model_structure)
-        if problems:
-            raise ValidationError(problems)
-
     return modelDescription
 
+
 def _write_fmi2_model_description(model_description: ModelDescription, path: Path):
 
     from lxml.etree import ElementTree, Element, SubElement
@@ -0,0 +1,236 @@
+""" Persistent cache of parsed model descriptions
+
+The ModelDescription objects are pickled to a user cache directory. The entries are keyed by the SHA-256 of the
+modelDescription.xml and buildDescription.xml, the FMPy version and the options of read_model_description().
+The least recently used entries are removed when the files exceed the size limit of the cache.
+
+The cache is only used if it is requested with read_model_description(..., use_cache=True).
+"""
+
+import os
+import sys
+import threading
+from os import PathLike
+
+
+def _default_directory():
+    """ Get the platform specific cache directory """
+
+    home = os.path.expanduser('~')
+
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA', os.path.join(home, 'AppData', 'Local'))
+    elif sys.platform.startswith('darwin'):
+        base = os.path.join(home, 'Library', 'Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME', os.path.join(home, '.cache'))
+
+    return os.path.join(base, 'fmpy', 'model-descriptions')
+
+
+def _reduce(obj):
+    """ Reduce an attrs object to its class and the positional arguments of its constructor """
+
+    import attrs
+
+    cls = type(obj)
+
+    return cls, tuple(getattr(obj, a.name) for a in attrs.fields(cls))
+
+
+def _dumps(model_description):
+    """ Pickle a model description
+
+    The attrs classes are pickled as constructor calls, which are much faster to unpickle than the
+    __setstate__() of slotted classes.
+    """
+
+    import copyreg
+    import io
+    import pickle
+    import attrs
+    from . import model_description as module
+
+    classes = [c for n, c in vars(module).items() if isinstance(c, type) and attrs.has(c) and not n.startswith('_')]
+
+    f = io.BytesIO()
+
+    pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = copyreg.dispatch_table | {c: _reduce for c in classes}
+    pickler.dump(model_description)
+
+    return f.getvalue()
+
+
+def _loads(data):
+    """ Unpickle a model description (the garbage collector of the process is disabled while unpickling) """
+
+    import pickle
+    from .model_description import _gc_disabled
+
+    # unpickling creates many objects but no garbage
+    with _gc_disabled():
+        return pickle.loads(data)
+
+
+class ModelDescriptionCache(object):
+    """ Cache of parsed model descriptions that is shared by all processes of a user """
+
+    version = 1
+    """ Version of the cache format """
+
+    def __init__(self, directory: str | PathLike | None = None, maxSize: int = 256 * 1024 ** 2, enabled: bool = True):
+        """
+        Parameters:
+            directory  directory for the cached model descriptions (None: user cache directory)
+            maxSize    maximum size of the cached files in bytes
+            enabled    use the cache (False: always parse the model description)
+        """
+
+        self.directory = _default_directory() if directory is None else os.fspath(directory)
+        self.maxSize = maxSize
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._digests = {}  # (path, size, mtime) -> SHA-256 of the XML files
+
+    def _digest(self, filename):
+        """ Get the SHA-256 of the modelDescription.xml and buildDescription.xml of an FMU, extracted FMU or XML file """
+
+        import hashlib
+        import zipfile
+
+        filename = os.path.abspath(filename)
+
+        if os.path.isdir(filename):
+            files = [os.path.join(filename, 'modelDescription.xml'), os.path.join(filename, 'sources', 'buildDescription.xml')]
+        else:
+            files = [filename]
+
+        key = tuple((f, s.st_size, s.st_mtime_ns) for f, s in ((f, os.stat(f)) for f in files if os.path.isfile(f)))
+
+        with self._lock:
+            digest = self._digests.get(key)
+
+        if digest is not None:
+            return digest
+
+        sha256 = hashlib.sha256()
+
+        if filename.lower().endswith('.xml') or os.path.isdir(filename):
+            for file in files:
+                if os.path.isfile(file):
+                    with open(file, 'rb') as f:
+                        sha256.update(f.read())
+                sha256.update(b'\0')
+        else:
+            with zipfile.ZipFile(filename, 'r') as zf:
+                names = zf.namelist()
+                for name in ['modelDescription.xml', 'sources/buildDescription.xml']:
+                    if name in names:
+                        sha256.update(zf.read(name))
+                    sha256.update(b'\0')
+
+        digest = sha256.hexdigest()
+
+        with self._lock:
+            self._digests[key] = digest
+
+        return digest
+
+    def _path(self, filename, options):
+        """ Get the path of the cache file for a model description """
+
+        import hashlib
+        from . import __version__
+
+        key = f'{self._digest(filename)}-{__version__}-{self.version}-{sorted(options.items())}'
+
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.pickle')
+
+    def read(self, filename: str | PathLike, **options):
+        """ Read a model description from the cache or parse it and add it to the cache
+
+        Parameters:
+            filename  filename of the FMU or XML file or directory with extracted FMU
+            options   the options of read_model_description()
+
+        Returns:
+            the ModelDescription
+        """
+
+        from .model_description import read_model_description
+
+        try:
+            path = self._path(filename, options)
+        except Exception:
+            return read_model_description(filename, use_cache=False, **options)
+
+        try:
+            with open(path, 'rb') as f:
+                model_description = _loads(f.read())
+            os.utime(path)  # mark as recently used
+            return model_description
+        except Exception:
+            pass  # not cached or not readable
+
+        model_description = read_model_description(filename, use_cache=False, **options)
+
+        try:
+            self._write(path, _dumps(model_description))
+        except Exception:
+            pass  # the directory is not writable or the model description cannot be pickled
+
+        return model_description
+
+    def _write(self, path, data):
+        """ Write a cache file and remove the least recently used files if the cache exceeds maxSize """
+
+        from tempfile import NamedTemporaryFile
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # write to a temporary file, so other processes never read a partial file
+        with NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False) as f:
+            f.write(data)
+
+        os.replace(f.name, path)
+
+        entries = []
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.pickle'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(s for _, s, _ in entries)
+
+        for _, s, p in sorted(entries):
+
+            if size <= self.maxSize:
+                break
+
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+            size -= s
+
+    def clear(self) -> None:
+        """ Remove all cached model descriptions """
+
+        if not os.path.isdir(self.directory):
+            return
+
+        for name in os.listdir(self.directory):
+            if name.endswith('.pickle'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+model_description_cache = ModelDescriptionCache()
+""" The model description cache of the user """
@@ -1,6 +1,7 @@
 # noinspection PyPep8
 
 import shutil
+from bisect import bisect_left, bisect_right
 from math import isclose
 
 from fmpy.model_description import ModelDescription
@@ -11,23 +12,95 @@ from .fmi2 import *
 from .fmi2 import _FMU2
 from . import fmi3
 from . import extract
+from .extraction_cache import extraction_cache
 from .util import auto_interval, add_remoting
 import numpy as np
 from time import time as current_time
 from typing import Union, Any, Dict, Sequence, Callable
+from attrs import define
+
+
+@define(eq=False)
+class SolverOptions:
+    """ Options for the CVode solver """
+
+    method: str = 'BDF'
+    """ Linear multistep method ('BDF' or 'Adams') """
+
+    maxOrder: int | None = None
+    """ Maximum order of the linear multistep method (None: 5 for 'BDF', 12 for 'Adams') """
+
+    initialStep: float | None = None
+    """ Initial step size (None: estimated by the solver) """
+
+    minStep: float | None = None
+    """ Minimum step size (None: 0) """
+
+    maxStep: float | None = None
+    """ Maximum step size (None: (stop_time - start_time) / 50) """
+
+    maxNumSteps: int = 500
+    """ Maximum number of steps between two output points """
+
+    nativeCallbacks: bool = False
+    """ Evaluate the right-hand-side and root functions in C (see fmpy.cvode_callbacks,
+    not used if an FMI call logger is set) """
+
+    linearSolver: str = 'dense'
+    """ Linear solver for the Newton iteration ('dense', 'band' or 'spgmr') """
+
+    upperBandwidth: int | None = None
+    """ Upper bandwidth of the Jacobian for the 'band' solver (None: determine from the ModelStructure) """
+
+    lowerBandwidth: int | None = None
+    """ Lower bandwidth of the Jacobian for the 'band' solver (None: determine from the ModelStructure) """
+
+    maxKrylovDimension: int | None = None
+    """ Maximum dimension of the Krylov subspace for the 'spgmr' solver (None: 5) """
+
+    denseOutput: bool = False
+    """ Let the solver take its own steps and interpolate the states at the output points """
+
+
+@define(eq=False)
+class RecorderOptions:
+    """ Options for the recording of the results
+
+    Samples at events and at the start and end of the simulation are always recorded.
+    """
+
+    interval: float | None = None
+    """ Minimum distance between two samples (None: no minimum distance) """
+
+    decimation: int = 1
+    """ Record only every n-th sample """
+
+    deadband: float | Dict[str, float] | None = None
+    """ Record a sample only if a variable has changed by more than its tolerance since the last sample
+    (float: tolerance for all variables, dict: variable name -> tolerance for the variables to check,
+    0: record every change, None: record all samples) """
+
+    resultFile: str | None = None
+    """ Write the samples to this .npy file in chunks and return a read-only memory-mapped result
+    or to this .mat file (Dymola result) and return the result read from the file (None: keep the samples in memory) """
+
+    chunkSize: int = 65536
+    """ Number of samples that are kept in memory before they are written to the result file """
 
 
 class SimulationResult(np.ndarray):
 
-    def __new__(subtype, shape, dtype=float, buffer=None, offset=0, strides=None, order=None, modelDescription=None):
+    def __new__(subtype, shape, dtype=float, buffer=None, offset=0, strides=None, order=None, modelDescription=None, statistics=None):
         obj = super(SimulationResult, subtype).__new__(subtype, shape, dtype, buffer, offset, strides, order)
         obj.modelDescription = modelDescription
+        obj.statistics = statistics
         return obj
 
     def __array_finalize__(self, obj):
         if obj is None:
             return
         self.modelDescription = getattr(obj, 'modelDescription', None)
+        self.statistics = getattr(obj, 'statistics', None)
 
 
 def _get_output_variables(model_description, max_variables=5):
@@ -62,25 +135,301 @@ def _get_output_variables(model_description, max_variables=5):
     return model_description.modelVariables[:max_variables]
 
 
+class AccessPlan(object):
+    """ Helper class to read and write a fixed set of variables with one FMI call per type
+
+    The value references and values are kept in pinned buffers that are created once, so
+    read() and write() do not allocate or look up any functions.
+
+    Example:
+
+    >>> plan = AccessPlan(fmu, model_description, ['h', 'v'])
+    >>> plan.read()['h']
+    >>> plan.record['v'] = -1.0
+    >>> plan.write()
+    """
+
+    # type -> (NumPy dtype, ctypes type)
+    _types = {
+        '1.0': [
+            ('Real', np.float64, fmi1Real),
+            ('Integer', np.int32, fmi1Integer),
+            ('Boolean', np.bool_, fmi1Boolean),
+        ],
+        '2.0': [
+            ('Real', np.float64, fmi2Real),
+            ('Integer', np.int32, fmi2Integer),
+            ('Boolean', np.int32, fmi2Boolean),
+        ],
+        '3.0': [
+            ('Float32', np.float32, fmi3.fmi3Float32),
+            ('Float64', np.float64, fmi3.fmi3Float64),
+            ('Int8', np.int8, fmi3.fmi3Int8),
+            ('UInt8', np.uint8, fmi3.fmi3UInt8),
+            ('Int16', np.int16, fmi3.fmi3Int16),
+            ('UInt16', np.uint16, fmi3.fmi3UInt16),
+            ('Int32', np.int32, fmi3.fmi3Int32),
+            ('UInt32', np.uint32, fmi3.fmi3UInt32),
+            ('Int64', np.int64, fmi3.fmi3Int64),
+            ('UInt64', np.uint64, fmi3.fmi3UInt64),
+            ('Boolean', np.bool_, fmi3.fmi3Boolean),
+        ],
+    }
+
+    def __init__(self, fmu, modelDescription, variableNames):
+        """
+        Parameters:
+            fmu               the FMU instance
+            modelDescription  the model description instance
+            variableNames     list of variable names to read and write
+        """
+
+        from .fmi1 import _as_ctypes_array
+
+        self.fmu = fmu
+
+        is_fmi3 = modelDescription.fmiVersion.startswith('3.0')
+
+        prefix = 'fmi3' if is_fmi3 else 'fmi1' if modelDescription.fmiVersion == '1.0' else 'fmi2'
+
+        types = self._types['3.0' if is_fmi3 else modelDescription.fmiVersion]
+
+        variables = dict((v.name, v) for v in modelDescription.modelVariables)
+
+        variables_by_type = dict((t, []) for t, _, _ in types)
+
+        for name in variableNames:
+
+            if name not in variables:
+                raise Exception(f'Variable "{name}" does not exist.')
+
+            variable = variables[name]
+
+            type = variable.type
+
+            if type == 'Enumeration':
+                type = 'Int64' if is_fmi3 else 'Integer'
+
+            if type not in variables_by_type:
+                raise Exception(f'Variable "{name}" has the unsupported type {type}.')
+
+            variables_by_type[type].append(variable)
+
+        # fields of the same type are adjacent so every type can be accessed as one block
+        fields = []
+
+        for type, dtype, _ in types:
+            for variable in variables_by_type[type]:
+                if variable.shape:
+                    fields.append((variable.name, dtype, variable.shape))
+                else:
+                    fields.append((variable.name, dtype))
+
+        self.dtype = np.dtype(fields, align=True)
+        """ Structured dtype with one field per variable """
+
+        self.record = np.zeros((), dtype=self.dtype)
+        """ Structured scalar that holds the values """
+
+        self.names = [field[0] for field in fields]
+        """ The names of the variables in the order of the fields """
+
+        buffer = self.record.reshape(1).view(np.uint8)
+
+        self._groups = []  # (type, vrs, values, getter, setter, args)
+
+        for type, dtype, ctype in types:
+
+            group = variables_by_type[type]
+
+            if not group:
+                continue
+
+            vrs = np.array([v.valueReference for v in group], dtype=np.uint32)
+
+            offset = self.dtype.fields[group[0].name][1]
+            n_values = sum(int(np.prod(v.shape)) if v.shape else 1 for v in group)
+            values = buffer[offset:offset + n_values * np.dtype(dtype).itemsize].view(dtype)
+
+            vrs_ = _as_ctypes_array(vrs, np.uint32, c_uint)
+            values_ = _as_ctypes_array(values, dtype, ctype, writeable=True)
+
+            getter = fmu._getFunction(f'{prefix}Get{type}')
+            setter = fmu._getFunction(f'{prefix}Set{type}')
+
+            if is_fmi3:
+                args = (vrs_, len(vrs_), values_, len(values_))
+            else:
+                args = (vrs_, len(vrs_), values_)
+
+            # keep the arrays to save the ctypes arrays from GC
+            self._groups.append((type, vrs, values, getter, setter, args))
+
+    def read(self):
+        """ Read the values from the FMU
+
+        Returns:
+            the structured scalar that holds the values (see record)
+        """
+
+        component = self.fmu.component
+
+        for _, _, _, getter, _, args in self._groups:
+            getter(component, *args)
+
+        return self.record
+
+    def write(self, values=None):
+        """ Write the values to the FMU
+
+        Parameters:
+            values  structured NumPy array with the values to write (None: write record)
+        """
+
+        if values is not None:
+            self.record[...] = values
+
+        component = self.fmu.component
+
+        for _, _, _, _, setter, args in self._groups:
+            setter(component, *args)
+
+
+class RecordedRows(object):
+    """ Read-only sequence of the rows recorded by a Recorder """
+
+    def __init__(self, recorder):
+        self._recorder = recorder
+
+    def __len__(self):
+        return self._recorder.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [row.item() for row in self._recorder._rows()[index]]
+        return self._recorder._row(index).item()
+
+    def __iter__(self):
+        return iter(self._recorder._rows().tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self._recorder._rows()
+        return arr if dtype is None else arr.astype(dtype, copy=False)
+
+
+class ResultFile(object):
+    """ Append-only .npy file for the samples of a Recorder """
+
+    def __init__(self, filename, dtype):
+        """
+        Parameters:
+            filename  the filename of the .npy file
+            dtype     the structured dtype of the rows
+        """
+
+        self.filename = filename
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+
+        # reserve space for the largest possible shape, so the header can be rewritten in place
+        length = len(self._dict(np.iinfo(np.int64).max)) + 1
+
+        # align the data to 64 bytes
+        self._headerLength = (12 + length + 63) // 64 * 64 - 12
+
+        self._file = open(filename, 'wb')
+        self._file.write(self._header(0))
+
+    def _dict(self, n):
+        return repr({'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False, 'shape': (n,)})
+
+    def _header(self, n):
+        """ Create the header (format version 2.0) for n rows """
+
+        from struct import pack
+
+        header = self._dict(n).ljust(self._headerLength - 1) + '\n'
+
+        return b'\x93NUMPY\x02\x00' + pack('<I', self._headerLength) + header.encode('latin1')
+
+    def append(self, rows):
+        """ Append rows to the file
+
+        Parameters:
+            rows  structured NumPy array with the rows to append (see dtype)
+        """
+
+        self._file.write(np.ascontiguousarray(rows, dtype=self.dtype).tobytes())
+        self.size += rows.size
+
+    def read(self):
+        """ Read the rows that have been appended so far without closing the file
+
+        Returns:
+            a read-only memory-mapped structured NumPy array with the rows (see dtype)
+        """
+
+        if self.size == 0:
+            return np.empty(0, dtype=self.dtype)
+
+        if not self._file.closed:
+            self._file.flush()
+
+        return np.memmap(self.filename, dtype=self.dtype, mode='r', offset=12 + self._headerLength, shape=(self.size,))
+
+    def close(self):
+        """ Write the final shape to the header and close the file """
+
+        if self._file.closed:
+            return
+
+        self._file.seek(0)
+        self._file.write(self._header(self.size))
+        self._file.close()
+
+    def result(self, modelDescription=None):
+        """ Close the file and return the memory-mapped SimulationResult """
+
+        self.close()
+
+        arr = np.load(self.filename, mmap_mode='r')
+
+        info_arr = arr.view(SimulationResult)
+
+        info_arr.modelDescription = modelDescription
+
+        return info_arr
+
+
 class Recorder(object):
-    """ Helper class to record the variables during the simulation """
+    """ Helper class to record the variables during the simulation
 
-    def __init__(self, fmu, modelDescription, variableNames=None, interval=None):
+    The samples are written to typed chunks that grow geometrically, so no Python objects
+    are created per sample and the chunks are only concatenated by result().
+    """
+
+    initialChunkSize = 1024
+    """ Number of rows of the first chunk """
+
+    def __init__(self, fmu, modelDescription, variableNames=None, interval=None, decimation=1, deadband=None,
+                 resultFile=None, chunkSize=65536):
         """
         Parameters:
             fmu               the FMU instance
             modelDescription  the model description instance
             variableNames     list of variable names to record
             interval          minimum distance to the previous sample
+            decimation        record only every n-th sample
+            deadband          minimum change of the variables to record a sample (see RecorderOptions)
+            resultFile        .npy or .mat (Dymola result) file to write the samples to in chunks
+                              (None: keep the samples in memory)
+            chunkSize         number of samples that are kept in memory if resultFile is set
         """
 
         self.fmu = fmu
         self.interval = interval
-
-        self.cols = [('time', np.float64, None)]  # name, dtype, shape
-        self.rows = []
-        self.info = {}  # type -> (names, vrs, shapes, n_values, getter)
-        self.types = []
+        self.decimation = decimation
+        self.deadband = deadband
 
         self.constants = {}
         self.modelDescription = modelDescription
@@ -88,84 +437,288 @@ class Recorder(object):
         if variableNames is None:
             variableNames = [variable.name for variable in _get_output_variables(modelDescription)]
 
+        variableNames = set(variableNames)
+
+        names = []
+
         # collect the variables to record
         for sv in modelDescription.modelVariables:
 
             if sv.name == 'time':
                 continue  # "time" is reserved for the simulation time
 
-            # collect the variables to record
-            if sv.name in variableNames:
-                type = sv.type
-                if type == 'Enumeration':
-                    type = 'Integer' if modelDescription.fmiVersion in {'1.0', '2.0'} else 'Int64'
-                names, vrs, shapes, n_values, getter = self.info.get(type, ([], [], [], 0, getattr(self.fmu, 'get' + type)))
+            if sv.name in variableNames and sv.type not in {'String', 'Binary', 'Clock'}:
                 names.append(sv.name)
-                vrs.append(sv.valueReference)
-                shapes.append(sv.shape)
-                n_values += np.prod(sv.shape) if sv.shape else 1
-                self.info[type] = names, vrs, shapes, n_values, getter
+
+        self.plan = AccessPlan(fmu=fmu, modelDescription=modelDescription, variableNames=names)
+
+        variables = dict((v.name, v) for v in modelDescription.modelVariables)
 
         # create the columns for the NumPy array
-        if modelDescription.fmiVersion in ['1.0', '2.0']:
-            types = [('Real', np.float64), ('Integer', np.int32), ('Boolean', np.bool_)]
-        else:
-            types = [
-                ('Float32', np.float32),
-                ('Float64', np.float64),
-                ('Int8', np.int8),
-                ('UInt8', np.uint8),
-                ('Int16', np.int16),
-                ('UInt16', np.uint16),
-                ('Int32', np.int32),
-                ('UInt32', np.uint32),
-                ('Int64', np.int64),
-                ('UInt64', np.uint64),
-                ('Boolean', np.bool_),
-            ]
-
-        # collect the columns
-        for t, dt in types:
-            if t in self.info:
-                self.types.append(t)
-                names, _, shapes, _, _ = self.info[t]
-                self.cols += zip(names, [dt] * len(names), shapes)
-
-        # strip the shape for scalars
-        self.cols = [(n, t) if not s else (n, t, s) for n, t, s in self.cols]
+        self.cols = [('time', np.float64)]
 
-    @staticmethod
-    def _append_reshaped(row, values, shapes):
-        i = 0
-        for d in shapes:
-            if d:
-                s = np.prod(d)
-                value = np.array(values[i:i + s]).reshape(d)
-                i += s
+        for name in self.plan.names:
+
+            dtype = self.plan.dtype[name]
+
+            if variables[name].type == 'Boolean':
+                base = np.bool_
             else:
-                value = values[i]
-                i += 1
-            row.append(value)
+                base = dtype.base
+
+            if dtype.shape:
+                self.cols.append((name, base, dtype.shape))
+            else:
+                self.cols.append((name, base))
+
+        self.dtype = np.dtype([('time', np.float64), ('values', self.plan.dtype)])
+        """ The dtype of the chunks """
+
+        if resultFile is None:
+            self._file = None
+        elif str(resultFile).lower().endswith('.mat'):
+            from .util import MatFile
+            # constants and fixed parameters are stored only once
+            parameters = {name for name in self.plan.names if variables[name].variability in {'constant', 'fixed', 'parameter'}}
+            descriptions = {name: variables[name].description for name in self.plan.names}
+            self._file = MatFile(resultFile, self.cols, descriptions=descriptions, parameters=parameters)
+        else:
+            self._file = ResultFile(resultFile, self.cols)
+        self._chunkSize = chunkSize
+        self._lastTime = None  # time of the last sample written to the file
+
+        self._chunks = []  # the full chunks
+        self._chunk = np.empty(0, dtype=self.dtype)  # the current chunk
+        self._time = self._chunk['time']
+        self._values = self._chunk['values']
+        self._n = 0  # number of rows in the current chunk
+        self._size = 0  # number of rows in the full chunks
+
+        self.rows = RecordedRows(self)
+        """ The recorded rows (see result()) """
+
+        self._filtered = interval is not None or decimation > 1 or deadband is not None
+        self._count = 0  # number of forced samples and samples that passed the interval
+        self._pending = None  # time of the last skipped sample
+
+        # (values, last, tolerances) for every type of the AccessPlan
+        self._deadband = None
+
+        if deadband is not None:
+
+            if isinstance(deadband, dict):
+                for name in deadband:
+                    if name not in self.plan.names:
+                        raise Exception(f'Variable "{name}" is not recorded.')
+                tolerances = [deadband.get(name, np.inf) for name in self.plan.names]
+            else:
+                tolerances = [deadband] * len(self.plan.names)
+
+            # the tolerances of the elements in the order of the fields
+            tolerances = np.concatenate([np.full(int(np.prod(self.plan.dtype[name].shape)), tolerance, dtype=np.float64)
+                                         for name, tolerance in zip(self.plan.names, tolerances)])
+
+            self._deadband = []
+
+            start = 0
+
+            for _, _, values, _, _, _ in self.plan._groups:
+                end = start + values.size
+                self._deadband.append((values, np.zeros(values.size), tolerances[start:end]))
+                start = end
+
+    def _grow(self, n=1):
+        """ Start a new chunk with at least n rows """
+
+        if self._file is not None:
+
+            # write the chunk to the file and reuse it
+            if self._n > 0:
+                self._lastTime = self._time[self._n - 1]
+                self._file.append(self._convert([self._chunk[:self._n]]))
+                self._size += self._n
+                self._n = 0
+
+            if self._chunk.size < n or self._chunk.size == 0:
+                self._chunk = np.empty(max(n, self._chunkSize), dtype=self.dtype)
+                self._time = self._chunk['time']
+                self._values = self._chunk['values']
+
+            return
+
+        if self._n > 0:
+            self._chunks.append(self._chunk[:self._n])
+            self._size += self._n
+
+        size = max(n, self.initialChunkSize, 2 * self._chunk.size)
+
+        self._chunk = np.empty(size, dtype=self.dtype)
+        self._time = self._chunk['time']
+        self._values = self._chunk['values']
+        self._n = 0
+
+    def _accept(self, time):
+        """ Check the interval, decimation and deadband for a sample that is not forced """
+
+        if self.interval is not None and self.size > 0:
+            next_time = self.lastSampleTime + self.interval
+            if time < next_time and not isclose(time, next_time):
+                return False
+
+        if self.decimation > 1:
+            count = self._count
+            self._count = count + 1
+            if count % self.decimation != 0:
+                return False
+
+        if self._deadband is not None:
+
+            self.plan.read()
+
+            if self.size > 0:
+                return any(np.any(np.abs(values - last) > tolerances) for values, last, tolerances in self._deadband)
+
+        return True
 
     def sample(self, time, force=False):
-        """ Record the variables """
+        """ Record the variables
+
+        Parameters:
+            time   the current time
+            force  record the sample regardless of the interval, decimation and deadband (e.g. at events)
+        """
 
-        row = [time]
+        if self._filtered:
 
-        for t in self.types:
-            names, vrs, shapes, nValues, getter = self.info[t]
-            if self.modelDescription.fmiVersion in ['1.0', '2.0']:
-                values = getter(vr=vrs)
-            else:
-                values = getter(vr=vrs, nValues=nValues)
-            self._append_reshaped(row, values, shapes)
+            if not force and not self._accept(time):
+                self._pending = time
+                return
+
+            self._pending = None
+
+            if force:
+                self._count += 1
+
+            # _accept() has already read the values
+            if force or self._deadband is None:
+                self.plan.read()
+
+            if self._deadband is not None:
+                for values, last, _ in self._deadband:
+                    last[:] = values
+
+        else:
+            self.plan.read()
+
+        if self._n == self._chunk.size:
+            self._grow()
+
+        n = self._n
+
+        self._time[n] = time
+        self._values[n] = self.plan.record
+
+        self._n = n + 1
+
+    def finish(self):
+        """ Record the last sample if it has been skipped """
+
+        if self._pending is not None:
+            self.sample(self._pending, force=True)
+
+    def reserve(self, n):
+        """ Reserve space for n rows
+
+        Parameters:
+            n  the number of rows
+
+        Returns:
+            a structured NumPy array of at least n rows (see dtype) to write the samples to
+        """
+
+        if self._chunk.size - self._n < n:
+            self._grow(n)
+
+        return self._chunk[self._n:]
+
+    def commit(self, n):
+        """ Add n rows that have been written to the array returned by reserve() """
+
+        self._n += n
+
+    @property
+    def size(self):
+        """ The number of recorded rows """
+
+        return self._size + self._n
+
+    def _convert(self, chunks):
+        """ Copy the chunks into one structured NumPy array with the columns """
+
+        arr = np.empty(sum(chunk.size for chunk in chunks), dtype=np.dtype(self.cols))
+
+        for name in arr.dtype.names:
+
+            start = 0
+
+            for chunk in chunks:
+                end = start + chunk.size
+                arr[name][start:end] = chunk['time'] if name == 'time' else chunk['values'][name]
+                start = end
+
+        return arr
+
+    def _rows(self):
+        """ Get the recorded rows as a structured NumPy array with the columns without closing the result file """
+
+        if self._file is not None:
+            return np.concatenate([self._file.read(), self._convert([self._chunk[:self._n]])])
+
+        return self._convert(self._chunks + [self._chunk[:self._n]])
+
+    def _row(self, index):
+        """ Get a recorded row without closing the result file """
+
+        size = self.size
+
+        if index < 0:
+            index += size
 
-        self.rows.append(tuple(row))
+        if not 0 <= index < size:
+            raise IndexError("row index out of range")
+
+        if self._file is not None:
+
+            if index < self._size:
+                return self._file.read()[index]
+
+            chunks = [self._chunk[:self._n]]
+            index -= self._size
+
+        else:
+            chunks = self._chunks + [self._chunk[:self._n]]
+
+        for chunk in chunks:
+            if index < chunk.size:
+                return self._convert([chunk[index:index + 1]])[0]
+            index -= chunk.size
 
     def result(self):
-        """ Return a structured NumPy array with the recorded results """
+        """ Return a structured NumPy array with the recorded results
 
-        arr = np.array(self.rows, dtype=np.dtype(self.cols))
+        If a result file is used, the remaining samples are written to the file, the file is closed and the
+        result is read from the file (a read-only memory-mapped array for .npy files). No samples can be
+        recorded after the result file has been closed.
+        """
+
+        if self._file is not None:
+            if self._n > 0:
+                self._file.append(self._convert([self._chunk[:self._n]]))
+                self._size += self._n
+                self._n = 0
+            return self._file.result(self.modelDescription)
+
+        arr = self._convert(self._chunks + [self._chunk[:self._n]])
 
         info_arr = arr.view(SimulationResult)
 
@@ -177,20 +730,33 @@ class Recorder(object):
     def lastSampleTime(self):
         """ Return the last sample time """
 
-        if len(self.rows) > 0:
-            return self.rows[-1][0]
+        if self._n > 0:
+            return self._time[self._n - 1]
+        elif self._chunks:
+            return self._chunks[-1]['time'][-1]
+        elif self._lastTime is not None:
+            return self._lastTime
         raise Exception("No samples available")
 
 
 class Input(object):
-    """ Helper class that sets the input to the FMU """
+    """ Helper class that sets the input to the FMU
+
+    Memory-mapped signals (e.g. from numpy.load(..., mmap_mode='r')) are read in windows of windowSize rows,
+    so only the rows around the current time are kept in memory. The chunks of a reader (e.g. from
+    read_csv(..., chunk_size=...)) are written to a temporary file that is memory-mapped.
+    """
+
+    windowSize = 65536
+    """ Number of rows of memory-mapped signals that are kept in memory """
 
     def __init__(self, fmu, modelDescription, signals, set_input_derivatives=False):
         """
         Parameters:
             fmu                    the FMU instance
             modelDescription       the model description instance
-            signals                a structured numpy array that contains the input
+            signals                a structured numpy array or an iterable of structured numpy arrays
+                                   that contains the input
             set_input_derivatives  calculate and set the input derivatives
 
         Example:
@@ -204,15 +770,31 @@ class Input(object):
 
         self.fmu = fmu
 
+        self.windowed = False
+
         if signals is None:
             self.t = None
             return
 
+        if not isinstance(signals, np.ndarray):
+            signals = Input._spool(signals)
+
+        self._signals = signals
+
         # get the time grid
-        self.t = signals[signals.dtype.names[0]]
+        self._time = signals[signals.dtype.names[0]]
+
+        # memory-mapped signals are read in windows
+        self.windowed = isinstance(signals, np.memmap) and signals.size > self.windowSize
 
         # find events
-        self.t_events = Input.findEvents(signals, modelDescription)
+        if self.windowed:
+            t_events = set()
+            for start in range(0, signals.size, self.windowSize):
+                t_events.update(Input.findEvents(signals[max(start - 1, 0):start + self.windowSize], modelDescription))
+            self.t_events = np.array(sorted(t_events))
+        else:
+            self.t_events = Input.findEvents(signals, modelDescription)
 
         self.set_input_derivatives = set_input_derivatives
 
@@ -221,30 +803,30 @@ class Input(object):
 
         setters = dict()
 
-        # get the setters
+        # get the names of the setters
         if is_fmi1:
-            setters['Real']        = (fmu.fmi1SetReal,    fmi1Real)
-            setters['Integer']     = (fmu.fmi1SetInteger, fmi1Integer)
-            setters['Boolean']     = (fmu.fmi1SetBoolean, c_int8)
-            setters['Enumeration'] = (fmu.fmi1SetInteger, fmi1Integer)
+            setters['Real']        = ('fmi1SetReal',    fmi1Real)
+            setters['Integer']     = ('fmi1SetInteger', fmi1Integer)
+            setters['Boolean']     = ('fmi1SetBoolean', c_int8)
+            setters['Enumeration'] = ('fmi1SetInteger', fmi1Integer)
         elif is_fmi2:
-            setters['Real']        = (fmu.fmi2SetReal,    fmi2Real)
-            setters['Integer']     = (fmu.fmi2SetInteger, fmi2Integer)
-            setters['Boolean']     = (fmu.fmi2SetBoolean, fmi2Boolean)
-            setters['Enumeration'] = (fmu.fmi2SetInteger, fmi2Integer)
+            setters['Real']        = ('fmi2SetReal',    fmi2Real)
+            setters['Integer']     = ('fmi2SetInteger', fmi2Integer)
+            setters['Boolean']     = ('fmi2SetBoolean', fmi2Boolean)
+            setters['Enumeration'] = ('fmi2SetInteger', fmi2Integer)
         else:
-            setters['Float32']     = (fmu.fmi3SetFloat32, fmi3.fmi3Float32)
-            setters['Float64']     = (fmu.fmi3SetFloat64, fmi3.fmi3Float64)
-            setters['Int8']        = (fmu.fmi3SetInt8,    fmi3.fmi3Int8)
-            setters['UInt8']       = (fmu.fmi3SetUInt8,   fmi3.fmi3UInt8)
-            setters['Int16']       = (fmu.fmi3SetInt16,   fmi3.fmi3Int16)
-            setters['UInt16']      = (fmu.fmi3SetUInt16,  fmi3.fmi3UInt16)
-            setters['Int32']       = (fmu.fmi3SetInt32,   fmi3.fmi3Int32)
-            setters['UInt32']      = (fmu.fmi3SetUInt32,  fmi3.fmi3UInt32)
-            setters['Int64']       = (fmu.fmi3SetInt64,   fmi3.fmi3Int64)
-            setters['UInt64']      = (fmu.fmi3SetUInt64,  fmi3.fmi3UInt64)
-            setters['Boolean']     = (fmu.fmi3SetBoolean, fmi3.fmi3Boolean)
-            setters['Enumeration'] = (fmu.fmi3SetInt64,   fmi3.fmi3Int64)
+            setters['Float32']     = ('fmi3SetFloat32', fmi3.fmi3Float32)
+            setters['Float64']     = ('fmi3SetFloat64', fmi3.fmi3Float64)
+            setters['Int8']        = ('fmi3SetInt8',    fmi3.fmi3Int8)
+            setters['UInt8']       = ('fmi3SetUInt8',   fmi3.fmi3UInt8)
+            setters['Int16']       = ('fmi3SetInt16',   fmi3.fmi3Int16)
+            setters['UInt16']      = ('fmi3SetUInt16',  fmi3.fmi3UInt16)
+            setters['Int32']       = ('fmi3SetInt32',   fmi3.fmi3Int32)
+            setters['UInt32']      = ('fmi3SetUInt32',  fmi3.fmi3UInt32)
+            setters['Int64']       = ('fmi3SetInt64',   fmi3.fmi3Int64)
+            setters['UInt64']      = ('fmi3SetUInt64',  fmi3.fmi3UInt64)
+            setters['Boolean']     = ('fmi3SetBoolean', fmi3.fmi3Boolean)
+            setters['Enumeration'] = ('fmi3SetInt64',   fmi3.fmi3Int64)
 
         from collections import defaultdict, namedtuple
 
@@ -253,17 +835,20 @@ class Input(object):
 
         ContinuousVariableInfo = namedtuple(
             typename='ContinuousVariableInfo',
-            field_names=('vrs', 'values', 'order', 'derivatives', 'table', 'setter')
+            field_names=('vrs', 'values', 'order', 'derivatives', 'table', 'setter', 'type')
         )
 
         DiscreteVariableInfo = namedtuple(
             typename='DiscreteVariableInfo',
-            field_names=('vrs', 'values', 'table', 'setter')
+            field_names=('vrs', 'values', 'table', 'setter', 'type')
         )
 
         self.continuous = []
         self.discrete = []
 
+        # (names, value type) of the tables
+        self._columns = []
+
         for variable in modelDescription.modelVariables:
 
             if variable.causality != 'input' and variable.variability != 'tunable':
@@ -283,28 +868,228 @@ class Input(object):
 
             names, vrs, sizes = zip(*((v.name, v.valueReference, signals[v.name][0].size) for v in variables))
             setter, value_type = setters[variable_type]
+            setter = fmu._getFunction(setter)
 
             self.continuous.append(ContinuousVariableInfo(
                 vrs=(c_uint32 * len(vrs))(*vrs),
                 values=(value_type * sum(sizes))(),
                 order=(c_int * len(vrs))(*([1] * len(vrs))),
-                derivatives=(value_type * 9)(),
-                table=np.asarray(np.stack(list(map(lambda n: signals[n], names))), dtype=value_type),
-                setter=setter)
+                derivatives=(value_type * sum(sizes))(),
+                table=None,
+                setter=setter,
+                type=variable_type)
             )
 
+            self._columns.append((names, value_type))
+
         for variable_type, variables in discrete_inputs.items():
 
             names, vrs, sizes = zip(*((v.name, v.valueReference, signals[v.name][0].size) for v in variables))
             setter, value_type = setters[variable_type]
+            setter = fmu._getFunction(setter)
 
             self.discrete.append(DiscreteVariableInfo(
                 vrs=(c_uint32 * len(vrs))(*vrs),
                 values=(value_type * sum(sizes))(),
-                table=np.asarray(np.stack(list(map(lambda n: signals[n], names))), dtype=value_type),
-                setter=setter)
+                table=None,
+                setter=setter,
+                type=variable_type)
             )
 
+            self._columns.append((names, value_type))
+
+        if set_input_derivatives:
+            self._setRealInputDerivatives = fmu._getFunction('fmi2SetRealInputDerivatives')
+
+        # the events as a list for bisect()
+        self._t_events = self.t_events.tolist()
+
+        # left insertion index of the last time in t (see _index())
+        self._cursor = 0
+
+        # interpolation weights of the continuous inputs
+        self._weights = np.zeros(2)
+
+        def bind(info):
+            """ Get the arguments of the setter (except the instance) and a NumPy view of the values """
+
+            if is_fmi1 and info.values._type_ == c_int8:
+                # special treatment for fmi1Boolean
+                args = (info.vrs, len(info.vrs), cast(info.values, POINTER(c_char)))
+            elif is_fmi1 or is_fmi2:
+                args = (info.vrs, len(info.vrs), info.values)
+            else:
+                args = (info.vrs, len(info.vrs), info.values, len(info.values))
+
+            return np.ctypeslib.as_array(info.values), args
+
+        self._continuousArgs = [bind(info) for info in self.continuous]
+        self._discreteArgs = [bind(info) for info in self.discrete]
+
+        if self.windowed:
+            self._loadWindow(0)
+        else:
+            self._load(0, signals.size)
+
+    @staticmethod
+    def _spool(chunks):
+        """ Write the chunks of a reader to a temporary file and map it into memory """
+
+        from tempfile import TemporaryFile
+
+        file = TemporaryFile()
+
+        dtype = None
+        size = 0
+
+        for chunk in chunks:
+            if dtype is None:
+                dtype = chunk.dtype
+            file.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+            size += chunk.size
+
+        if size == 0:
+            raise Exception("The input signals are empty.")
+
+        file.flush()
+
+        return np.memmap(file, dtype=dtype, mode='r', shape=(size,))
+
+    def _load(self, start, stop):
+        """ Load the rows start:stop of the signals into the tables """
+
+        self._start = start
+        self._stop = stop
+
+        self.t = np.ascontiguousarray(self._time[start:stop], dtype=np.float64)
+
+        tables = [np.asarray(np.stack([self._signals[name][start:stop] for name in names]), dtype=value_type)
+                  for names, value_type in self._columns]
+
+        self.continuous = [info._replace(table=table) for info, table in zip(self.continuous, tables)]
+        self.discrete = [info._replace(table=table) for info, table in zip(self.discrete, tables[len(self.continuous):])]
+
+        self._continuous = []
+
+        for info, (values, args) in zip(self.continuous, self._continuousArgs):
+
+            # the values with the shape of a column of the table
+            values = values.reshape(info.table.shape[:1] + info.table.shape[2:])
+
+            # slopes of the segments
+            if self.t.size > 1:
+                dt = np.diff(self.t).reshape((1, -1) + (1,) * (info.table.ndim - 2))
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    slopes = np.diff(info.table, axis=1) / dt
+            else:
+                slopes = None
+
+            derivatives = np.ctypeslib.as_array(info.derivatives).reshape(values.shape)
+
+            self._continuous.append((values, info.table, slopes, derivatives, info, info.setter, args))
+
+        self._discrete = []
+
+        for info, (values, args) in zip(self.discrete, self._discreteArgs):
+            values = values.reshape(info.table.shape[:1] + info.table.shape[2:])
+            self._discrete.append((values, info.table, info.setter, args))
+
+    def _loadWindow(self, i):
+        """ Load a window that contains the rows i - 1 to i + 1 of the signals and return the index of row i in
+        the window """
+
+        t = self._time
+        n = t.size
+
+        start = max(i - 2, 0)
+        stop = min(max(start + self.windowSize, i + 2), n)
+
+        # do not split events
+        while stop < n and isclose(t[stop - 1], t[stop]):
+            stop += 1
+
+        self._load(start, stop)
+
+        return i - start
+
+    def _index(self, time):
+        """ Get the left insertion index of time in t (see numpy.searchsorted()) starting at the last index """
+
+        t = self.t
+        n = t.size
+        i = self._cursor
+
+        # same or next segment
+        for i in (i, i + 1):
+            if i <= n and (i == 0 or t[i - 1] < time) and (i == n or time <= t[i]):
+                break
+        else:
+            i = int(t.searchsorted(time))
+
+        # the rows i - 1 and i + 1 must be in the window
+        if (i == 0 and self._start > 0) or (i + 1 >= n and self._stop < self._time.size):
+            i = self._loadWindow(bisect_left(self._time, time))
+
+        self._cursor = i
+
+        return i
+
+    def _continuous_weights(self, time, i0, after_event):
+        """ Get the indices and weights to interpolate the continuous inputs (see interpolate())
+
+        Returns:
+            (i, j, w0, w1, k) where the values are w0 * table[:, i] + w1 * table[:, j] (table[:, i] if j is None)
+            and the derivatives are slopes[:, k] (0 if k is None)
+        """
+
+        t = self.t
+        n = t.size
+
+        if n < 2 or i0 == 0:
+            return 0, None, 1.0, 0.0, None  # hold first value
+
+        if i0 == n:
+            return n - 1, None, 1.0, 0.0, None  # hold last value
+
+        # check for time event
+        if isclose(time, t[i0]) and i0 < n - 1 and isclose(t[i0], t[i0 + 1]):
+
+            if after_event:
+                # take the value after the event
+                while i0 < n - 1 and isclose(t[i0], t[i0 + 1]):
+                    i0 += 1
+                return i0, None, 1.0, 0.0, i0 if i0 < n - 1 else None
+            else:
+                return i0, None, 1.0, 0.0, i0 - 1
+
+        t0 = t[i0 - 1]
+        t1 = t[i0]
+
+        w0 = (t1 - time) / (t1 - t0)
+        w1 = 1 - w0
+
+        return i0 - 1, i0, w0, w1, i0 - 1
+
+    def _discrete_index(self, time, i0, after_event):
+        """ Get the index of the discrete inputs (see interpolate()) """
+
+        t = self.t
+        n = t.size
+
+        if n < 2 or i0 == 0:
+            return 0
+
+        if i0 == n:
+            return n - 1
+
+        i = i0 - 1
+
+        if after_event:
+            while i + 1 < n and (t[i + 1] < time or isclose(time, t[i + 1])):
+                i += 1
+
+        return i
+
     def apply(self, time, continuous=True, discrete=True, after_event=False):
         """ Apply the input
 
@@ -317,40 +1102,42 @@ class Input(object):
         if self.t is None:
             return
 
-        is_fmi1 = isinstance(self.fmu, _FMU1)
-        is_fmi3 = isinstance(self.fmu, fmi3._FMU3)
+        component = self.fmu.component
+
+        i0 = self._index(time)
 
         # continuous
-        if continuous:
-            for vrs, values, order, derivatives, table, setter in self.continuous:
+        if continuous and self._continuous:
+
+            i, j, w0, w1, k = self._continuous_weights(time, i0, after_event)
 
-                v, d = self.interpolate(time=time, t=self.t, table=table, discrete=False, after_event=after_event)
+            weights = self._weights
+            weights[0] = w0
+            weights[1] = w1
 
-                values[:] = v.flatten()
+            for values, table, slopes, derivatives, info, setter, args in self._continuous:
 
-                if is_fmi3:
-                    setter(self.fmu.component, vrs, len(vrs), values, len(values))
+                if j is None:
+                    values[...] = table[:, i]
+                elif values.dtype == np.float64 and table.ndim == 2:
+                    np.dot(table[:, i:j + 1], weights, out=values)
                 else:
-                    setter(self.fmu.component, vrs, len(vrs), values)
+                    values[...] = w0 * table[:, i] + w1 * table[:, j]
+
+                setter(component, *args)
 
                 if self.set_input_derivatives:
-                    derivatives[:] = d
-                    self.fmu.fmi2SetRealInputDerivatives(self.fmu.component, vrs, len(vrs), order, derivatives)
+                    derivatives[...] = 0 if k is None else slopes[:, k]
+                    self._setRealInputDerivatives(component, info.vrs, len(info.vrs), info.order, info.derivatives)
 
         # discrete
-        if discrete:
-            for vrs, values, table, setter in self.discrete:
+        if discrete and self._discrete:
 
-                values[:], der_values = self.interpolate(time=time, t=self.t, table=table, discrete=True, after_event=after_event)
+            i = self._discrete_index(time, i0, after_event)
 
-                if is_fmi1 and values._type_ == c_int8:
-                    # special treatment for fmi1Boolean
-                    setter(self.fmu.component, vrs, len(vrs), cast(values, POINTER(c_char)))
-                else:
-                    if is_fmi3:
-                        setter(self.fmu.component, vrs, len(vrs), values, len(values))
-                    else:
-                        setter(self.fmu.component, vrs, len(vrs), values)
+            for values, table, setter, args in self._discrete:
+                values[...] = table[:, i]
+                setter(component, *args)
 
     def nextEvent(self, time):
         """ Get the next input event """
@@ -358,12 +1145,15 @@ class Input(object):
         if self.t is None:
             return float('Inf')
 
+        t_events = self._t_events
+
         # find the next event
-        for i, t in enumerate(self.t_events):
-            if t > time and not isclose(t, time):
-                return self.t_events[i]
+        i = bisect_right(t_events, time)
 
-        return float('Inf')
+        while i < len(t_events) and isclose(t_events[i], time):
+            i += 1
+
+        return t_events[i] if i < len(t_events) else float('Inf')
 
     @staticmethod
     def findEvents(signals, model_description):
@@ -648,7 +1438,13 @@ def simulate_fmu(filename,
                  initialize: bool = True,
                  terminate: bool = True,
                  fmu_state: Union[bytes, c_void_p] = None,
-                 set_stop_time: bool = True) -> SimulationResult:
+                 set_stop_time: bool = True,
+                 solver_options: Union[SolverOptions, Dict[str, Any]] = None,
+                 use_native_loop: bool = False,
+                 step_finished_stride: int = 1,
+                 recorder_options: Union[RecorderOptions, Dict[str, Any]] = None,
+                 load_from_memory: bool = False,
+                 use_cache: bool = False) -> SimulationResult:
     """ Simulate an FMU
 
     Parameters:
@@ -683,8 +1479,15 @@ def simulate_fmu(filename,
         terminate              terminate the FMU
         fmu_state              the FMU state or serialized FMU state to initialize the FMU
         set_stop_time          communicate the stop time to the FMU instance
+        solver_options         options for the 'CVode' solver (see :class:`SolverOptions`)
+        use_native_loop        perform the communication steps in C (FMI 2.0 and 3.0 co-simulation only, experimental)
+        step_finished_stride   number of steps between the calls to step_finished in the native loop
+        recorder_options       options for the recording of the results (see :class:`RecorderOptions`)
+        load_from_memory       load the shared library from memory and extract only the resources (Linux only, experimental)
+        use_cache              read the model description from the persistent model description cache
     Returns:
         result                 a structured numpy array that contains the result
+                               (result.statistics['cold_start']: time to extract, load and instantiate the FMU)
     """
 
     from fmpy import supported_platforms
@@ -706,7 +1509,7 @@ def simulate_fmu(filename,
         remote_platform = None
 
     if model_description is None:
-        model_description = read_model_description(filename, validate=validate)
+        model_description = read_model_description(filename, validate=validate, use_cache=use_cache)
 
     if fmi_type is None:
         if fmu_instance is not None:
@@ -719,6 +1522,16 @@ def simulate_fmu(filename,
     if fmi_type not in ['ModelExchange', 'CoSimulation']:
         raise Exception('fmi_type must be one of "ModelExchange" or "CoSimulation"')
 
+    if solver_options is None:
+        solver_options = SolverOptions()
+    elif isinstance(solver_options, dict):
+        solver_options = SolverOptions(**solver_options)
+
+    if recorder_options is None:
+        recorder_options = RecorderOptions()
+    elif isinstance(recorder_options, dict):
+        recorder_options = RecorderOptions(**recorder_options)
+
     if initialize is False:
         if fmi_type != 'CoSimulation':
             raise Exception("If initialize is False, the interface type must be 'CoSimulation'.")
@@ -764,48 +1577,74 @@ def simulate_fmu(filename,
             while (stop_time - start_time) / output_interval > 1000:
                 output_interval *= 2
 
+    cachedir = None
+    tempdir = None
+    binary = None
+    library_path = None
+
+    cold_start = current_time()
+
     if os.path.isfile(os.path.join(filename, 'modelDescription.xml')):
         unzipdir = filename
-        tempdir = None
+    elif load_from_memory and not remote_platform:
+        from .memfd import MemoryBinary
+        implementation = model_description.coSimulation if fmi_type == 'CoSimulation' else model_description.modelExchange
+        binary = MemoryBinary(filename, implementation.modelIdentifier, model_description.fmiVersion)
+        unzipdir = binary.unzipDirectory
+        library_path = binary.libraryPath
+    elif remote_platform:
+        # the remoting binaries are added to the extracted files
+        tempdir = extract(filename)
+        unzipdir = tempdir
     else:
-        required_paths = ['resources', 'binaries/']
+        implementation = model_description.coSimulation if fmi_type == 'CoSimulation' else model_description.modelExchange
+        exclusive = implementation is not None and implementation.canBeInstantiatedOnlyOncePerProcess
+        cachedir = extraction_cache.acquire(filename, exclusive=exclusive, include=('resources', 'binaries/'))
+        unzipdir = cachedir
+
+    try:
         if remote_platform:
-            required_paths.append(os.path.join('binaries', remote_platform))
-        tempdir = extract(filename, include=None if remote_platform else lambda n: n.startswith(tuple(required_paths)))
-        unzipdir = tempdir
+            add_remoting(unzipdir, host_platform=platform, remote_platform=remote_platform)
 
-    if remote_platform:
-        add_remoting(unzipdir, host_platform=platform, remote_platform=remote_platform)
+        if fmu_instance is None:
+            fmu = instantiate_fmu(unzipdir, model_description, fmi_type, visible, debug_logging, logger, fmi_call_logger, library_path, early_return_allowed, use_event_mode, None, validate)
+        else:
+            fmu = fmu_instance
 
-    if fmu_instance is None:
-        fmu = instantiate_fmu(unzipdir, model_description, fmi_type, visible, debug_logging, logger, fmi_call_logger, None, early_return_allowed, use_event_mode, None, validate)
-    else:
-        fmu = fmu_instance
-
-    if fmu_state is not None:
-        if model_description.fmiVersion == '2.0' or model_description.fmiVersion.startswith('3.0'):
-            if isinstance(fmu_state, bytes):
-                fmu_state = fmu.deserializeFMUState(fmu_state)
-                fmu.setFMUState(fmu_state)
-                fmu.freeFMUState(fmu_state)
+        cold_start = current_time() - cold_start
+
+        if fmu_state is not None:
+            if model_description.fmiVersion == '2.0' or model_description.fmiVersion.startswith('3.0'):
+                if isinstance(fmu_state, bytes):
+                    fmu_state = fmu.deserializeFMUState(fmu_state)
+                    fmu.setFMUState(fmu_state)
+                    fmu.freeFMUState(fmu_state)
+                else:
+                    fmu.setFMUState(fmu_state)
             else:
-                fmu.setFMUState(fmu_state)
-        else:
-            raise Exception(f"Setting the FMU state is not supported for FMI version {model_description.fmiVersion}.")
-        initialize = False
+                raise Exception(f"Setting the FMU state is not supported for FMI version {model_description.fmiVersion}.")
+            initialize = False
 
-    # simulate_fmu the FMU
-    if fmi_type == 'ModelExchange':
-        result = simulateME(model_description, fmu, start_time, stop_time, solver, step_size, relative_tolerance, start_values, apply_default_start_values, input, output, output_interval, record_events, timeout, step_finished, validate, set_stop_time)
-    elif fmi_type == 'CoSimulation':
-        result = simulateCS(model_description, fmu, start_time, stop_time, relative_tolerance, start_values, apply_default_start_values, input, output, output_interval, timeout, step_finished, set_input_derivatives, use_event_mode, early_return_allowed, validate, initialize, terminate, set_stop_time)
+        # simulate_fmu the FMU
+        if fmi_type == 'ModelExchange':
+            result = simulateME(model_description, fmu, start_time, stop_time, solver, step_size, relative_tolerance, start_values, apply_default_start_values, input, output, output_interval, record_events, timeout, step_finished, validate, set_stop_time, solver_options, recorder_options)
+        elif fmi_type == 'CoSimulation':
+            result = simulateCS(model_description, fmu, start_time, stop_time, relative_tolerance, start_values, apply_default_start_values, input, output, output_interval, timeout, step_finished, set_input_derivatives, use_event_mode, early_return_allowed, validate, initialize, terminate, set_stop_time, use_native_loop, step_finished_stride, recorder_options)
 
-    if fmu_instance is None:
-        fmu.freeInstance()
+        if fmu_instance is None:
+            fmu.freeInstance()
+    finally:
+        # clean up
+        if tempdir is not None:
+            shutil.rmtree(tempdir, ignore_errors=True)
+
+        if cachedir is not None:
+            extraction_cache.release(cachedir)
 
-    # clean up
-    if tempdir is not None:
-        shutil.rmtree(tempdir, ignore_errors=True)
+        if binary is not None:
+            binary.close()
+
+    result.statistics = dict(result.statistics or {}, cold_start=cold_start)
 
     return result
 
@@ -925,7 +1764,92 @@ def settable_in_initialization_mode(variable):
            or (variable.variability != 'constant' and variable.initial == 'exact')
 
 
-def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_size, relative_tolerance, start_values, apply_default_start_values, input_signals, output, output_interval, record_events, timeout, step_finished, validate, set_stop_time):
+def _get_state_bandwidth(model_description):
+    """ Get the upper and lower bandwidth of the Jacobian of the derivatives w.r.t. the continuous states
+    from the dependencies in the ModelStructure """
+
+    nx = model_description.numberOfContinuousStates
+
+    derivatives = [unknown.variable for unknown in model_description.derivatives]
+
+    if not derivatives or len(derivatives) != nx or any(variable.shape for variable in derivatives):
+        return nx - 1, nx - 1
+
+    from .jacobian import get_sparsity_pattern
+
+    pattern = get_sparsity_pattern(model_description,
+                                   unknowns=[variable.name for variable in derivatives],
+                                   knowns=[variable.derivative.name for variable in derivatives])
+
+    i, j = np.nonzero(pattern)
+
+    if i.size == 0:
+        return 0, 0
+
+    return max(0, int((j - i).max())), max(0, int((i - j).max()))
+
+
+def _get_state_jacobian_vector_product(fmu, model_description):
+    """ Create a callback that computes the product of the Jacobian of the derivatives w.r.t. the continuous
+    states with a vector from one directional derivative or None if the FMU does not provide them """
+
+    if model_description.fmiVersion == '1.0' or not model_description.modelExchange.providesDirectionalDerivative:
+        return None
+
+    derivatives = [unknown.variable for unknown in model_description.derivatives]
+
+    if not derivatives or any(variable.shape for variable in derivatives):
+        return None
+
+    nx = len(derivatives)
+
+    vUnknown_ref = (c_uint * nx)(*[variable.valueReference for variable in derivatives])
+    vKnown_ref = (c_uint * nx)(*[variable.derivative.valueReference for variable in derivatives])
+
+    if model_description.fmiVersion == '2.0':
+        getDirectionalDerivative = fmu._getFunction('fmi2GetDirectionalDerivative')
+
+        def get_jv(v, jv, n):
+            getDirectionalDerivative(fmu.component, vUnknown_ref, nx, vKnown_ref, nx, v, jv)
+    else:
+        getDirectionalDerivative = fmu._getFunction('fmi3GetDirectionalDerivative')
+
+        def get_jv(v, jv, n):
+            getDirectionalDerivative(fmu.component, vUnknown_ref, nx, vKnown_ref, nx, v, nx, jv, nx)
+
+    return get_jv
+
+
+def _get_state_jacobian(fmu, model_description):
+    """ Create a callback that computes the Jacobian of the derivatives w.r.t. the continuous states
+    from the directional derivatives or None if the FMU does not provide them """
+
+    if model_description.fmiVersion == '1.0' or not model_description.modelExchange.providesDirectionalDerivative:
+        return None
+
+    derivatives = [unknown.variable for unknown in model_description.derivatives]
+
+    if not derivatives or any(variable.shape for variable in derivatives):
+        return None
+
+    from .jacobian import Jacobian
+
+    jacobian = Jacobian(fmu=fmu,
+                        model_description=model_description,
+                        unknowns=[variable.name for variable in derivatives],
+                        knowns=[variable.derivative.name for variable in derivatives],
+                        use_directional_derivatives=True)
+
+    return jacobian.evaluate
+
+
+def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_size, relative_tolerance, start_values, apply_default_start_values, input_signals, output, output_interval, record_events, timeout, step_finished, validate, set_stop_time, solver_options=None, recorder_options=None):
+
+    if solver_options is None:
+        solver_options = SolverOptions()
+
+    if recorder_options is None:
+        recorder_options = RecorderOptions()
 
     if relative_tolerance is None:
         relative_tolerance = 1e-5
@@ -1052,17 +1976,56 @@ def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_
         fixed_step = True
     elif solver_name is None or solver_name == 'CVode':
         from .sundials import CVodeSolver
+
+        upper_bandwidth = solver_options.upperBandwidth
+        lower_bandwidth = solver_options.lowerBandwidth
+
+        if solver_options.linearSolver == 'band' and (upper_bandwidth is None or lower_bandwidth is None):
+            mu, ml = _get_state_bandwidth(model_description)
+            if upper_bandwidth is None:
+                upper_bandwidth = mu
+            if lower_bandwidth is None:
+                lower_bandwidth = ml
+
+        if solver_options.linearSolver == 'spgmr':
+            get_jac = None
+            get_jv = _get_state_jacobian_vector_product(fmu, model_description)
+        else:
+            get_jac = _get_state_jacobian(fmu, model_description)
+            get_jv = None
+
+        if solver_options.nativeCallbacks and fmu.fmiCallLogger is None:
+            from .cvode_callbacks import create_callback_data
+            callback_data = create_callback_data(fmu)
+        else:
+            callback_data = None
+
         solver = CVodeSolver(get_nominals=fmu.getNominalContinuousStates if is_fmi1 else fmu.getNominalsOfContinuousStates,
                              set_time=fmu.setTime,
                              startTime=start_time,
-                             maxStep=(stop_time - start_time) / 50.,
+                             maxStep=(stop_time - start_time) / 50. if solver_options.maxStep is None else solver_options.maxStep,
+                             maxNumSteps=solver_options.maxNumSteps,
+                             method=solver_options.method,
+                             maxOrder=solver_options.maxOrder,
+                             initialStep=solver_options.initialStep,
+                             minStep=solver_options.minStep,
+                             callbackData=callback_data,
                              relativeTolerance=relative_tolerance,
+                             get_jac=get_jac,
+                             linearSolver=solver_options.linearSolver,
+                             upperBandwidth=upper_bandwidth,
+                             lowerBandwidth=lower_bandwidth,
+                             maxKrylovDimension=solver_options.maxKrylovDimension,
+                             get_jv=get_jv,
+                             denseOutput=solver_options.denseOutput,
                              **solver_args)
         step_size = output_interval
         fixed_step = False
     else:
         raise Exception("Unknown solver: %s. Must be one of 'Euler' or 'CVode'." % solver_name)
 
+    dense_output = solver_options.denseOutput and not fixed_step
+
     # check step size
     if fixed_step and not np.isclose(round(output_interval / step_size) * step_size, output_interval):
         raise Exception("output_interval must be a multiple of step_size for fixed step solvers")
@@ -1070,7 +2033,11 @@ def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_
     recorder = Recorder(fmu=fmu,
                         modelDescription=model_description,
                         variableNames=output,
-                        interval=output_interval)
+                        interval=recorder_options.interval,
+                        decimation=recorder_options.decimation,
+                        deadband=recorder_options.deadband,
+                        resultFile=recorder_options.resultFile,
+                        chunkSize=recorder_options.chunkSize)
 
     n_steps = 0
 
@@ -1078,11 +2045,13 @@ def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_
 
     next_regular_point = time
 
+    event = False
+
     # simulation loop
     while True:
 
-        if record_events or isclose(time, next_regular_point):
-            recorder.sample(time)
+        if (record_events and (event or not dense_output)) or isclose(time, next_regular_point):
+            recorder.sample(time, force=event)
 
         if timeout is not None and (current_time() - sim_start) > timeout:
             break
@@ -1092,7 +2061,8 @@ def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_
 
         next_regular_point = start_time + (n_steps + 1) * output_interval
 
-        next_communication_point = next_regular_point
+        # with dense output the solver only has to stop at events
+        next_communication_point = stop_time if dense_output else next_regular_point
 
         next_input_event_time = input.nextEvent(time)
 
@@ -1111,6 +2081,23 @@ def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_
 
         state_event, roots_found, time = solver.step(time, next_communication_point)
 
+        if dense_output:
+
+            interpolated = False
+
+            # record the output points within the last step
+            while next_regular_point < time and not isclose(next_regular_point, time):
+                solver.interpolate(next_regular_point)
+                fmu.setTime(next_regular_point)
+                input.apply(next_regular_point, discrete=False)
+                recorder.sample(next_regular_point)
+                interpolated = True
+                n_steps += 1
+                next_regular_point = start_time + (n_steps + 1) * output_interval
+
+            if interpolated:
+                solver.restore()
+
         fmu.setTime(time)
 
         input.apply(time, discrete=False)
@@ -1133,7 +2120,9 @@ def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_
         else:
             step_event = False
 
-        if input_event or time_event or state_event or step_event:
+        event = input_event or time_event or state_event or step_event
+
+        if event:
 
             if record_events:
                 recorder.sample(time, force=True)
@@ -1206,14 +2195,21 @@ def simulateME(model_description, fmu, start_time, stop_time, solver_name, step_
         if step_finished is not None and not step_finished(time, recorder):
             break
 
+    recorder.finish()
+
     fmu.terminate()
 
+    result = recorder.result()
+
+    if hasattr(solver, 'statistics'):
+        result.statistics = solver.statistics()
+
     del solver
 
-    return recorder.result()
+    return result
 
 
-def simulateCS(model_description, fmu, start_time, stop_time, relative_tolerance, start_values, apply_default_start_values, input_signals, output, output_interval, timeout, step_finished, set_input_derivatives, use_event_mode, early_return_allowed, validate, initialize, terminate, set_stop_time):
+def simulateCS(model_description, fmu, start_time, stop_time, relative_tolerance, start_values, apply_default_start_values, input_signals, output, output_interval, timeout, step_finished, set_input_derivatives, use_event_mode, early_return_allowed, validate, initialize, terminate, set_stop_time, use_native_loop=False, step_finished_stride=1, recorder_options=None):
 
     if set_input_derivatives and not model_description.coSimulation.canInterpolateInputs:
         raise Exception("Parameter set_input_derivatives is True but the FMU cannot interpolate inputs.")
@@ -1269,10 +2265,32 @@ def simulateCS(model_description, fmu, start_time, stop_time, relative_tolerance
         raise Exception("The start values for the following variables could not be set: " +
                         ', '.join(start_values.keys()))
 
-    recorder = Recorder(fmu=fmu, modelDescription=model_description, variableNames=output, interval=output_interval)
+    if recorder_options is None:
+        recorder_options = RecorderOptions()
+
+    recorder = Recorder(fmu=fmu,
+                        modelDescription=model_description,
+                        variableNames=output,
+                        interval=recorder_options.interval,
+                        decimation=recorder_options.decimation,
+                        deadband=recorder_options.deadband,
+                        resultFile=recorder_options.resultFile,
+                        chunkSize=recorder_options.chunkSize)
 
     recorder.sample(time, force=True)
 
+    if use_native_loop:
+
+        if use_event_mode or early_return_allowed or set_input_derivatives:
+            raise Exception("The native loop does not support event mode, early return and input derivatives.")
+
+        _simulate_cs_native(model_description, fmu, start_time, stop_time, input, recorder, output_interval, time, sim_start, timeout, step_finished, step_finished_stride)
+
+        if terminate:
+            fmu.terminate()
+
+        return recorder.result()
+
     n_steps = 0
 
     input_applied = False
@@ -1379,7 +2397,7 @@ def simulateCS(model_description, fmu, start_time, stop_time, relative_tolerance
 
                 fmu.enterStepMode()
 
-                recorder.sample(time)
+                recorder.sample(time, force=True)
 
                 input_applied = True
             else:
@@ -1391,7 +2409,57 @@ def simulateCS(model_description, fmu, start_time, stop_time, relative_tolerance
         if step_finished is not None and not step_finished(time, recorder):
             break
 
+    recorder.finish()
+
     if terminate:
         fmu.terminate()
 
     return recorder.result()
+
+
+def _simulate_cs_native(model_description, fmu, start_time, stop_time, input, recorder, output_interval, time, sim_start, timeout, step_finished, step_finished_stride):
+    """ Perform the communication steps of simulateCS() in C (see fmpy.cs_loop) """
+
+    from .cs_loop import CoSimulationLoop, LOOP_FINISHED, LOOP_MAX_STEPS, LOOP_DISCARD, LOOP_ERROR, LOOP_TERMINATE
+
+    loop = CoSimulationLoop(fmu=fmu,
+                            model_description=model_description,
+                            input=input,
+                            recorder=recorder,
+                            start_time=start_time,
+                            stop_time=stop_time,
+                            output_interval=output_interval,
+                            time=time)
+
+    # check the timeout every 1000 steps if there is no callback
+    max_steps = 1000 if step_finished is None else max(1, step_finished_stride)
+
+    while True:
+
+        if timeout is not None and (current_time() - sim_start) > timeout:
+            break
+
+        result = loop.run(max_steps)
+
+        if result == LOOP_FINISHED or result == LOOP_TERMINATE:
+            break
+
+        elif result == LOOP_DISCARD:
+
+            terminate_simulation = fmu.getBooleanStatus(fmi2Terminated)
+
+            if terminate_simulation:
+                time = fmu.getRealStatus(fmi2LastSuccessfulTime)
+                recorder.sample(time, force=True)
+                break
+
+            recorder.sample(loop.time)
+
+        elif result == LOOP_ERROR:
+            raise FMICallException(function='the native co-simulation loop', status=loop.status)
+
+        elif result != LOOP_MAX_STEPS:
+            raise Exception("FMU returned early from doStep() but Early Return is not allowed.")
+
+        if step_finished is not None and not step_finished(loop.time, recorder):
+            break
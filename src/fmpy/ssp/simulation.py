@@ -3,8 +3,10 @@ import shutil
 import numpy as np
 
 from fmpy import read_model_description, extract
+from fmpy.extraction_cache import extraction_cache
 from fmpy.fmi1 import FMU1Slave
 from fmpy.fmi2 import FMU2Slave
+from fmpy.simulation import AccessPlan
 from fmpy.ssp.ssd import System, read_ssd, get_connections, find_connectors, find_components
 
 
@@ -69,75 +71,99 @@ def set_parameters(component, parameter_set):
             set_value(component, variable_name, parameter.value)
 
 
-def instantiate_fmu(component, ssp_unzipdir, start_time, stop_time=None, parameter_set=None):
+def instantiate_fmu(component, ssp_unzipdir, start_time, stop_time=None, parameter_set=None, use_cache=False):
     """ Instantiate an FMU """
 
     fmu_filename = os.path.join(ssp_unzipdir, component.source)
 
-    component.unzipdir = extract(fmu_filename)
-
     # read the model description
-    model_description = read_model_description(fmu_filename, validate=False)
+    model_description = read_model_description(fmu_filename, validate=False, use_cache=use_cache)
 
     if model_description.coSimulation is None:
         raise Exception("%s does not support co-simulation." % component.source)
 
-    # collect the value references
-    component.variables = {}
-    for variable in model_description.modelVariables:
-        # component.vrs[variable.name] = variable.valueReference
-        component.variables[variable.name] = variable
-
-    fmu_kwargs = {'guid': model_description.guid,
-                  'unzipDirectory': component.unzipdir,
-                  'modelIdentifier': model_description.coSimulation.modelIdentifier,
-                  'instanceName': component.name}
-
-    if model_description.fmiVersion == '1.0':
-        component.fmu = FMU1Slave(**fmu_kwargs)
-        component.fmu.instantiate()
-        if parameter_set is not None:
-            set_parameters(component, parameter_set)
-        component.fmu.initialize(stopTime=stop_time)
-    else:
-        component.fmu = FMU2Slave(**fmu_kwargs)
-        component.fmu.instantiate()
-        component.fmu.setupExperiment(startTime=start_time)
-        if parameter_set is not None:
-            set_parameters(component, parameter_set)
-        component.fmu.enterInitializationMode()
-        component.fmu.exitInitializationMode()
+    component.unzipdir = extraction_cache.acquire(fmu_filename,
+                                                  exclusive=model_description.coSimulation.canBeInstantiatedOnlyOncePerProcess,
+                                                  include=('resources', 'binaries/'))
+
+    try:
+        # collect the value references
+        component.variables = {}
+        for variable in model_description.modelVariables:
+            # component.vrs[variable.name] = variable.valueReference
+            component.variables[variable.name] = variable
+
+        fmu_kwargs = {'guid': model_description.guid,
+                      'unzipDirectory': component.unzipdir,
+                      'modelIdentifier': model_description.coSimulation.modelIdentifier,
+                      'instanceName': component.name}
+
+        if model_description.fmiVersion == '1.0':
+            component.fmu = FMU1Slave(**fmu_kwargs)
+            component.fmu.instantiate()
+            if parameter_set is not None:
+                set_parameters(component, parameter_set)
+            component.fmu.initialize(stopTime=stop_time)
+        else:
+            component.fmu = FMU2Slave(**fmu_kwargs)
+            component.fmu.instantiate()
+            component.fmu.setupExperiment(startTime=start_time)
+            if parameter_set is not None:
+                set_parameters(component, parameter_set)
+            component.fmu.enterInitializationMode()
+            component.fmu.exitInitializationMode()
+
+        # create the plans to set the inputs and get the outputs
+        input_names = [c.name for c in component.connectors if c.kind == 'input']
+        output_names = [c.name for c in component.connectors if c.kind == 'output']
+
+        component.input_plan = AccessPlan(component.fmu, model_description, input_names)
+        component.output_plan = AccessPlan(component.fmu, model_description, output_names)
+    except Exception:
+        extraction_cache.release(component.unzipdir)
+        raise
 
 
 def free_fmu(component):
-    """ Free an FMU and remove its unzip dir """
+    """ Free an FMU and release its unzip dir """
 
-    component.fmu.terminate()
-    component.fmu.freeInstance()
     try:
-        shutil.rmtree(component.unzipdir)
-    except Exception as e:
-        print("Failed to remove unzip directory. " + str(e))
+        component.fmu.terminate()
+        component.fmu.freeInstance()
+    finally:
+        extraction_cache.release(component.unzipdir)
 
 
 def do_step(component, time, step_size):
     """ Perform one simulation step """
 
     # set inputs
+    inputs = component.input_plan.record
+
     for connector in component.connectors:
         if connector.kind == 'input':
-            set_value(component, connector.name, connector.value)
+            if component.variables[connector.name].type == 'Boolean':
+                inputs[connector.name] = connector.value != 0.0
+            else:
+                inputs[connector.name] = connector.value
+
+    component.input_plan.write()
 
     # do step
     component.fmu.doStep(currentCommunicationPoint=time, communicationStepSize=step_size)
 
     # get outputs
+    outputs = component.output_plan.read()
+
     for connector in component.connectors:
         if connector.kind == 'output':
-            connector.value = get_value(component, connector.name)
+            value = outputs[connector.name].item()
+            if component.variables[connector.name].type == 'Boolean':
+                value = value != 0
+            connector.value = value
 
 
-def simulate_ssp(ssp_filename, start_time=0.0, stop_time=None, step_size=None, parameter_set=None, input={}):
+def simulate_ssp(ssp_filename, start_time=0.0, stop_time=None, step_size=None, parameter_set=None, input={}, use_cache=False):
     """ Simulate a system of FMUs """
 
     if stop_time is None:
@@ -179,48 +205,52 @@ def simulate_ssp(ssp_filename, start_time=0.0, stop_time=None, step_size=None, p
     for connector in connectors:
         connector.value = 0.0
 
-    # instantiate the FMUs
-    for component in components:
-        instantiate_fmu(component, ssp_unzipdir, start_time, stop_time, parameter_set)
+    instantiated = []
 
-    time = start_time
+    try:
+        # instantiate the FMUs
+        for component in components:
+            instantiate_fmu(component, ssp_unzipdir, start_time, stop_time, parameter_set, use_cache)
+            instantiated.append(component)
 
-    rows = []  # list to record the results
+        time = start_time
 
-    # simulation loop
-    while time < stop_time:
+        rows = []  # list to record the results
 
-        # apply input
-        for connector in ssd.system.connectors:
-            if connector.kind == 'input' and connector.name in input:
-                connector.value = input[connector.name](time)
+        # simulation loop
+        while time < stop_time:
 
-        # perform one step
-        for component in components:
-            do_step(component, time, step_size)
+            # apply input
+            for connector in ssd.system.connectors:
+                if connector.kind == 'input' and connector.name in input:
+                    connector.value = input[connector.name](time)
 
-        # apply connections
-        for start_connector, end_connector in connections:
-            end_connector.value = start_connector.value
+            # perform one step
+            for component in components:
+                do_step(component, time, step_size)
 
-        # get the results
-        row = [time]
+            # apply connections
+            for start_connector, end_connector in connections:
+                end_connector.value = start_connector.value
 
-        for connector in connectors:
-            row.append(connector.value)
+            # get the results
+            row = [time]
 
-        # append the results
-        rows.append(tuple(row))
+            for connector in connectors:
+                row.append(connector.value)
 
-        # advance the time
-        time += step_size
+            # append the results
+            rows.append(tuple(row))
 
-    # free the FMUs
-    for component in components:
-        free_fmu(component)
+            # advance the time
+            time += step_size
+    finally:
+        # free the FMUs
+        for component in instantiated:
+            free_fmu(component)
 
-    # clean up
-    shutil.rmtree(ssp_unzipdir)
+        # clean up
+        shutil.rmtree(ssp_unzipdir)
 
     dtype = [('time', np.float64)]
 
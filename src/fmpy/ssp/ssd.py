@@ -337,15 +337,14 @@ class Parameter(BaseElement):
 
 def validate_tree(root, schema_file):
 
+    from fmpy.validation import validate_xml
+
     module_dir, _ = os.path.split(__file__)
 
-    schema = etree.XMLSchema(file=os.path.join(module_dir, 'schema', schema_file))
+    problems = validate_xml(root, os.path.join(module_dir, 'schema', schema_file))
 
-    if not schema.validate(root):
-        message = "Failed to validate SystemStructure.ssd:"
-        for entry in schema.error_log:
-            message += "\n%s (line %d, column %d): %s" % (entry.level_name, entry.line, entry.column, entry.message)
-        raise Exception(message)
+    if problems:
+        raise Exception("Failed to validate SystemStructure.ssd:" + ''.join("\n" + problem for problem in problems))
 
 
 def read_ssv(filename, resource=None, validate=True):
@@ -1,10 +1,12 @@
 """ Interface to the SUNDIALS libraries """
 
 import numpy as np
-from ctypes import create_string_buffer, byref
-from .cvode import CV_SUCCESS, CVodeCreate, CVodeSetMaxStep, CV_BDF, CVodeInit, CVodeSVtolerances, CVodeRootInit, \
-    CVodeSetMaxNumSteps, CVodeSetNoInactiveRootWarn, CVRhsFn, CVRootFn, CVode, CV_NORMAL, CV_ROOT_RETURN, \
-    CVodeGetRootInfo, CVodeReInit, CVodeFree
+from ctypes import create_string_buffer, byref, c_long, cast, addressof
+from .cvode import CV_SUCCESS, CVodeCreate, CVodeSetMaxStep, CV_ADAMS, CV_BDF, CVodeInit, CVodeSVtolerances, CVodeRootInit, \
+    CVodeSetMaxNumSteps, CVodeSetNoInactiveRootWarn, CVRhsFn, CVRootFn, CVode, CV_NORMAL, CV_ONE_STEP, \
+    CV_ROOT_RETURN, CVodeGetRootInfo, CVodeReInit, CVodeFree, CVodeGetNumSteps, CVodeGetNumRhsEvals, CVodeSetStopTime, \
+    CVodeGetDky, CVodeSetInitStep, CVodeSetMaxOrd, CVodeSetMinStep, CVodeGetNumLinSolvSetups, CVodeGetNumErrTestFails, \
+    CVodeGetNumGEvals, CVodeGetNumNonlinSolvIters, CVodeGetNumNonlinSolvConvFails, CVodeSetUserData
 from .cvode_ls import *
 from .nvector_serial import *
 from .sundials_context import SUNContext_Create, SUNContext_PushErrHandler
@@ -13,7 +15,10 @@ from .sundials_matrix import *
 from .sundials_nvector import *
 from .sundials_types import *
 from .sundials_version import *
+from .sunlinsol_band import *
 from .sunlinsol_dense import *
+from .sunlinsol_spgmr import *
+from .sunmatrix_band import *
 from .sunmatrix_dense import *
 
 
@@ -36,6 +41,29 @@ def _assert_version():
 _assert_version()
 
 
+class _BandMatrixView(object):
+    """ Assign the elements of a band matrix by row and column indices """
+
+    def __init__(self, data, storedUpperBandwidth, upperBandwidth, lowerBandwidth):
+        self.data = data
+        self.smu = storedUpperBandwidth
+        self.mu = upperBandwidth
+        self.ml = lowerBandwidth
+
+    def __setitem__(self, key, value):
+
+        if key is Ellipsis:
+            self.data[...] = value
+            return
+
+        i, j = key
+
+        # skip the elements outside the band
+        inside = (j - i <= self.mu) & (i - j <= self.ml)
+
+        self.data[self.smu + i[inside] - j[inside], j[inside]] = value[inside]
+
+
 class CVodeSolver(object):
     """ Interface to the CVode solver """
 
@@ -47,7 +75,19 @@ class CVodeSolver(object):
                  startTime,
                  maxStep=float('inf'),
                  relativeTolerance=1e-5,
-                 maxNumSteps=500):
+                 maxNumSteps=500,
+                 get_jac=None,
+                 linearSolver='dense',
+                 upperBandwidth=None,
+                 lowerBandwidth=None,
+                 maxKrylovDimension=None,
+                 get_jv=None,
+                 denseOutput=False,
+                 method='BDF',
+                 maxOrder=None,
+                 initialStep=None,
+                 minStep=None,
+                 callbackData=None):
         """
         Parameters:
             nx                  number of continuous states
@@ -61,6 +101,22 @@ class CVodeSolver(object):
             maxStep             maximum absolute value of step size allowed
             relativeTolerance   relative tolerance
             maxNumSteps         maximum number of internal steps to be taken by the solver in its attempt to reach tout
+            get_jac             callback function to compute the Jacobian df/dx into a NumPy array (None: difference quotients)
+            linearSolver        linear solver to use ('dense', 'band' or 'spgmr')
+            upperBandwidth      upper bandwidth of the Jacobian for the 'band' solver (None: nx - 1)
+            lowerBandwidth      lower bandwidth of the Jacobian for the 'band' solver (None: nx - 1)
+            maxKrylovDimension  maximum dimension of the Krylov subspace for the 'spgmr' solver (None: 5)
+            get_jv              callback function to compute the Jacobian-vector product for the 'spgmr' solver
+                                (None: difference quotients)
+            denseOutput         return after every internal step (see step()) and apply the continuous inputs
+                                in the right-hand-side function so the output points can be interpolated
+                                (see interpolate())
+            method              linear multistep method ('BDF' or 'Adams')
+            maxOrder            maximum order of the linear multistep method (None: 5 for 'BDF', 12 for 'Adams')
+            initialStep         initial step size (None: estimated by the solver)
+            minStep             minimum absolute value of step size allowed (None: 0)
+            callbackData        CallbackData to evaluate the right-hand-side and root functions natively
+                                (see fmpy.cvode_callbacks.create_callback_data(), None: use the Python callbacks)
         """
 
         self.get_x = get_x
@@ -69,6 +125,11 @@ class CVodeSolver(object):
         self.get_z = get_z
         self.get_nominals = get_nominals
         self.set_time = set_time
+        self.get_jac = get_jac
+        self.get_jv = get_jv
+        self.linearSolver = linearSolver
+        self.denseOutput = denseOutput
+        self.callbackData = callbackData
         self.input = input
         self.error_info = None
         self.reltol = relativeTolerance
@@ -89,8 +150,11 @@ class CVodeSolver(object):
         self.x      = N_VNew_Serial(self.nx, self.sunctx)
         self.abstol = N_VNew_Serial(self.nx, self.sunctx)
 
+        self.dky    = N_VNew_Serial(self.nx, self.sunctx)
+
         self.px       = NV_DATA_S(self.x)
         self.pabstol  = NV_DATA_S(self.abstol)
+        self.pdky     = NV_DATA_S(self.dky)
         self.npabstol = np.ctypeslib.as_array(self.pabstol, (self.nx,))
 
         # initialize
@@ -104,29 +168,89 @@ class CVodeSolver(object):
 
         self.npabstol *= self.reltol
 
-        self.cvode_mem = CVodeCreate(CV_BDF, self.sunctx)
+        if method == 'BDF':
+            lmm = CV_BDF
+        elif method == 'Adams':
+            lmm = CV_ADAMS
+        else:
+            raise Exception(f"Unknown method: {method}. Must be one of 'BDF' or 'Adams'.")
+
+        self.cvode_mem = CVodeCreate(lmm, self.sunctx)
+
+        # counters of the previous integrations (before CVodeReInit())
+        self._statistics = None
 
         # add function pointers as members to save them from GC
-        self.f_ = CVRhsFn(self.f)
-        self.g_ = CVRootFn(self.g)
+        if callbackData is None:
+            self.f_ = CVRhsFn(self.f)
+            self.g_ = CVRootFn(self.g)
+        else:
+            from ..cvode_callbacks import ApplyInputType, rhs, root
+
+            callbackData.getArrayPointer = cast(N_VGetArrayPointer_Serial, c_void_p).value
+            callbackData.nx = self.nx
+            callbackData.nz = self.nz
+            callbackData.discrete = self.discrete
+
+            # only call back into Python if there are inputs to apply
+            if getattr(input, 't', None) is not None:
+                self.applyInputRoot_ = ApplyInputType(lambda t: input.apply(t))
+                callbackData.applyInputRoot = self.applyInputRoot_
+                if denseOutput:
+                    self.applyInputRhs_ = ApplyInputType(lambda t: input.apply(t, discrete=False))
+                    callbackData.applyInputRhs = self.applyInputRhs_
+
+            self.f_ = cast(rhs, CVRhsFn)
+            self.g_ = cast(root, CVRootFn)
         self.ehfun_ = SUNErrHandlerFn(self.ehfun)
 
         _assert_cv_success(CVodeInit(self.cvode_mem, self.f_, startTime, self.x))
 
+        if callbackData is not None:
+            _assert_cv_success(CVodeSetUserData(self.cvode_mem, addressof(callbackData)))
+
         _assert_cv_success(CVodeSVtolerances(self.cvode_mem, relativeTolerance, self.abstol))
 
         _assert_cv_success(CVodeRootInit(self.cvode_mem, self.nz, self.g_))
 
-        self.A = SUNDenseMatrix(self.nx, self.nx, self.sunctx)
-
-        self.LS = SUNLinSol_Dense(self.x, self.A, self.sunctx)
+        if linearSolver == 'dense':
+            self.A = SUNDenseMatrix(self.nx, self.nx, self.sunctx)
+            self.LS = SUNLinSol_Dense(self.x, self.A, self.sunctx)
+        elif linearSolver == 'band':
+            self.mu = min(self.nx - 1, self.nx - 1 if upperBandwidth is None else upperBandwidth)
+            self.ml = min(self.nx - 1, self.nx - 1 if lowerBandwidth is None else lowerBandwidth)
+            self.A = SUNBandMatrix(self.nx, self.mu, self.ml, self.sunctx)
+            self.LS = SUNLinSol_Band(self.x, self.A, self.sunctx)
+        elif linearSolver == 'spgmr':
+            self.A = None
+            maxl = SUNSPGMR_MAXL_DEFAULT if maxKrylovDimension is None else maxKrylovDimension
+            self.LS = SUNLinSol_SPGMR(self.x, SUN_PREC_NONE, maxl, self.sunctx)
+        else:
+            raise Exception(f"Unknown linear solver: {linearSolver}. Must be one of 'dense', 'band' or 'spgmr'.")
 
         _assert_cv_success(CVodeSetLinearSolver(self.cvode_mem, self.LS, self.A))
 
+        if self.get_jac is not None and linearSolver != 'spgmr' and not self.discrete:
+            self.jac_ = CVLsJacFn(self.jac)
+            _assert_cv_success(CVodeSetJacFn(self.cvode_mem, self.jac_))
+
+        if self.get_jv is not None and linearSolver == 'spgmr' and not self.discrete:
+            self.jtimes_ = CVLsJacTimesVecFn(self.jtimes)
+            _assert_cv_success(CVodeSetJacTimes(self.cvode_mem, CVLsJacTimesSetupFn(), self.jtimes_))
+
         _assert_cv_success(CVodeSetMaxStep(self.cvode_mem, maxStep))
 
         _assert_cv_success(CVodeSetMaxNumSteps(self.cvode_mem, maxNumSteps))
 
+        if maxOrder is not None:
+            _assert_cv_success(CVodeSetMaxOrd(self.cvode_mem, maxOrder))
+
+        if initialStep is not None:
+            _assert_cv_success(CVodeSetInitStep(self.cvode_mem, initialStep))
+
+        if minStep is not None:
+            _assert_cv_success(CVodeSetMinStep(self.cvode_mem, minStep))
+
         _assert_cv_success(CVodeSetNoInactiveRootWarn(self.cvode_mem))
 
         _assert_cv_success(SUNContext_PushErrHandler(self.sunctx, self.ehfun_, None))
@@ -140,6 +264,9 @@ class CVodeSolver(object):
 
         self.set_time(t)
 
+        if self.denseOutput:
+            self.input.apply(t, discrete=False)
+
         if self.discrete:
             dx = np.ctypeslib.as_array(NV_DATA_S(ydot), (self.nx,))
             dx[:] = 0.0
@@ -148,6 +275,34 @@ class CVodeSolver(object):
             self.get_dx(NV_DATA_S(ydot), self.nx)
         return 0
 
+    def jac(self, t, y, fy, J, user_data, tmp1, tmp2, tmp3):
+        """ Jacobian function """
+
+        self.set_time(t)
+        self.set_x(NV_DATA_S(y), self.nx)
+
+        if self.linearSolver == 'band':
+            # column j holds the elements from row j - smu to j + ml
+            ldim = SUNBandMatrix_LDim(J)
+            data = np.ctypeslib.as_array(SUNBandMatrix_Data(J), (ldim * self.nx,)).reshape((ldim, self.nx), order='F')
+            A = _BandMatrixView(data, SUNBandMatrix_StoredUpperBandwidth(J), self.mu, self.ml)
+        else:
+            # the dense matrix is stored column-major
+            A = np.ctypeslib.as_array(SUNDenseMatrix_Data(J), (self.nx * self.nx,)).reshape((self.nx, self.nx), order='F')
+
+        self.get_jac(A)
+
+        return 0
+
+    def jtimes(self, v, Jv, t, y, fy, user_data, tmp):
+        """ Jacobian-vector product function """
+
+        self.set_time(t)
+        self.set_x(NV_DATA_S(y), self.nx)
+        self.get_jv(NV_DATA_S(v), NV_DATA_S(Jv), self.nx)
+
+        return 0
+
     def g(self, t, y, gout, user_data):
         """ Root function """
 
@@ -162,6 +317,8 @@ class CVodeSolver(object):
         return 0
 
     def step(self, t, tNext):
+        """ Integrate from t to tNext or, if denseOutput is True, perform one internal step that ends at or
+        before tNext """
 
         if not self.discrete:
             # get the states
@@ -169,8 +326,12 @@ class CVodeSolver(object):
 
         tret = realtype(0.0)
 
-        # perform one step
-        flag = CVode(self.cvode_mem, tNext, self.x, byref(tret), CV_NORMAL)
+        if self.denseOutput:
+            # don't step past tNext as the model cannot be evaluated beyond events
+            _assert_cv_success(CVodeSetStopTime(self.cvode_mem, tNext))
+            flag = CVode(self.cvode_mem, tNext, self.x, byref(tret), CV_ONE_STEP)
+        else:
+            flag = CVode(self.cvode_mem, tNext, self.x, byref(tret), CV_NORMAL)
 
         if not self.discrete:
             # set the states
@@ -182,9 +343,62 @@ class CVodeSolver(object):
             p_roots_found = np.ctypeslib.as_ctypes(roots_found)
             _assert_cv_success(CVodeGetRootInfo(self.cvode_mem, p_roots_found))
         elif flag < 0:
+            if self.callbackData is not None and self.callbackData.status > 2:
+                raise RuntimeError(f"An FMI function returned status {self.callbackData.status} in the native callbacks.")
             raise RuntimeError("CVode error (code %s) in module %s, function %s: %s" % self.error_info)
 
-        return flag > 0, roots_found, tret.value
+        return flag == CV_ROOT_RETURN, roots_found, tret.value
+
+    def interpolate(self, t):
+        """ Set the states interpolated at time t within the last internal step """
+
+        if self.discrete:
+            return
+
+        _assert_cv_success(CVodeGetDky(self.cvode_mem, t, 0, self.dky))
+
+        self.set_x(self.pdky, self.nx)
+
+    def restore(self):
+        """ Set the states at the end of the last step (after interpolate()) """
+
+        if not self.discrete:
+            self.set_x(self.px, self.nx)
+
+    def statistics(self):
+        """ Get the solver statistics since the creation of the solver
+
+        Returns:
+            a dictionary with the counters of the solver
+        """
+
+        value = c_long()
+
+        statistics = {}
+
+        for name, getter in [('steps', CVodeGetNumSteps),
+                             ('rhs_evals', CVodeGetNumRhsEvals),
+                             ('root_evals', CVodeGetNumGEvals),
+                             ('err_test_fails', CVodeGetNumErrTestFails),
+                             ('nonlin_iters', CVodeGetNumNonlinSolvIters),
+                             ('nonlin_conv_fails', CVodeGetNumNonlinSolvConvFails),
+                             ('lin_setups', CVodeGetNumLinSolvSetups),
+                             ('jac_evals', CVodeGetNumJacEvals),
+                             ('lin_rhs_evals', CVodeGetNumLinRhsEvals),
+                             ('lin_iters', CVodeGetNumLinIters),
+                             ('jtimes_evals', CVodeGetNumJtimesEvals)]:
+            _assert_cv_success(getter(self.cvode_mem, byref(value)))
+            statistics[name] = value.value
+
+        # CVodeReInit() resets the counters
+        if self._statistics is not None:
+            for name, value in self._statistics.items():
+                if name in statistics:
+                    statistics[name] += value
+
+        statistics['resets'] = 0 if self._statistics is None else self._statistics['resets']
+
+        return statistics
 
     def reset(self, time):
 
@@ -193,6 +407,9 @@ class CVodeSolver(object):
             self.get_nominals(self.pabstol, self.nx)
             self.npabstol *= self.reltol
 
+        self._statistics = self.statistics()
+        self._statistics['resets'] += 1
+
         # reset the solver
         flag = CVodeReInit(self.cvode_mem, time, self.x)
 
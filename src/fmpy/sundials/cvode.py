@@ -49,12 +49,14 @@ CV_BDF = 2
 # #define CV_NORMAL   1
 CV_NORMAL = 1
 # #define CV_ONE_STEP 2
+CV_ONE_STEP = 2
 #
 # /* return values */
 #
 # #define CV_SUCCESS      0
 CV_SUCCESS = 0
 # #define CV_TSTOP_RETURN 1
+CV_TSTOP_RETURN = 1
 # #define CV_ROOT_RETURN  2
 CV_ROOT_RETURN = 2
 #
@@ -153,6 +155,9 @@ CVodeSVtolerances.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetDeltaGammaMaxLSetup(void* cvode_mem,
 #                                                 sunrealtype dgmax_lsetup);
 # SUNDIALS_EXPORT int CVodeSetInitStep(void* cvode_mem, sunrealtype hin);
+CVodeSetInitStep = getattr(sundials_cvode, 'CVodeSetInitStep')
+CVodeSetInitStep.argtypes = [c_void_p, sunrealtype]
+CVodeSetInitStep.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetLSetupFrequency(void* cvode_mem, long int msbp);
 # SUNDIALS_EXPORT int CVodeSetMaxConvFails(void* cvode_mem, int maxncf);
 # SUNDIALS_EXPORT int CVodeSetMaxErrTestFails(void* cvode_mem, int maxnef);
@@ -163,11 +168,17 @@ CVodeSetMaxNumSteps = getattr(sundials_cvode, 'CVodeSetMaxNumSteps')
 CVodeSetMaxNumSteps.argtypes = [c_void_p, c_long]
 CVodeSetMaxNumSteps.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetMaxOrd(void* cvode_mem, int maxord);
+CVodeSetMaxOrd = getattr(sundials_cvode, 'CVodeSetMaxOrd')
+CVodeSetMaxOrd.argtypes = [c_void_p, c_int]
+CVodeSetMaxOrd.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetMaxStep(void* cvode_mem, sunrealtype hmax);
 CVodeSetMaxStep = getattr(sundials_cvode, 'CVodeSetMaxStep')
 CVodeSetMaxStep.argtypes = [c_void_p, sunrealtype]
 CVodeSetMaxStep.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetMinStep(void* cvode_mem, sunrealtype hmin);
+CVodeSetMinStep = getattr(sundials_cvode, 'CVodeSetMinStep')
+CVodeSetMinStep.argtypes = [c_void_p, sunrealtype]
+CVodeSetMinStep.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetMonitorFn(void* cvode_mem, CVMonitorFn fn);
 # SUNDIALS_EXPORT int CVodeSetMonitorFrequency(void* cvode_mem, long int nst);
 # SUNDIALS_EXPORT int CVodeSetNlsRhsFn(void* cvode_mem, CVRhsFn f);
@@ -176,12 +187,18 @@ CVodeSetMaxStep.restype = c_int
 #                                             SUNNonlinearSolver NLS);
 # SUNDIALS_EXPORT int CVodeSetStabLimDet(void* cvode_mem, sunbooleantype stldet);
 # SUNDIALS_EXPORT int CVodeSetStopTime(void* cvode_mem, sunrealtype tstop);
+CVodeSetStopTime = getattr(sundials_cvode, 'CVodeSetStopTime')
+CVodeSetStopTime.argtypes = [c_void_p, sunrealtype]
+CVodeSetStopTime.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetInterpolateStopTime(void* cvode_mem,
 #                                                 sunbooleantype interp);
 # SUNDIALS_EXPORT int CVodeClearStopTime(void* cvode_mem);
 # SUNDIALS_EXPORT int CVodeSetUseIntegratorFusedKernels(void* cvode_mem,
 #                                                       sunbooleantype onoff);
 # SUNDIALS_EXPORT int CVodeSetUserData(void* cvode_mem, void* user_data);
+CVodeSetUserData = getattr(sundials_cvode, 'CVodeSetUserData')
+CVodeSetUserData.argtypes = [c_void_p, c_void_p]
+CVodeSetUserData.restype = c_int
 #
 # /* Optional step adaptivity input functions */
 # SUNDIALS_EXPORT
@@ -232,16 +249,31 @@ CVode.restype = c_int
 # /* Dense output function */
 # SUNDIALS_EXPORT int CVodeGetDky(void* cvode_mem, sunrealtype t, int k,
 #                                 N_Vector dky);
+CVodeGetDky = getattr(sundials_cvode, 'CVodeGetDky')
+CVodeGetDky.argtypes = [c_void_p, sunrealtype, c_int, N_Vector]
+CVodeGetDky.restype = c_int
 #
 # /* Optional output functions */
 # SUNDIALS_DEPRECATED_EXPORT_MSG(
 #   "Work space functions will be removed in version 8.0.0")
 # int CVodeGetWorkSpace(void* cvode_mem, long int* lenrw, long int* leniw);
 # SUNDIALS_EXPORT int CVodeGetNumSteps(void* cvode_mem, long int* nsteps);
+CVodeGetNumSteps = getattr(sundials_cvode, 'CVodeGetNumSteps')
+CVodeGetNumSteps.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumSteps.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetNumRhsEvals(void* cvode_mem, long int* nfevals);
+CVodeGetNumRhsEvals = getattr(sundials_cvode, 'CVodeGetNumRhsEvals')
+CVodeGetNumRhsEvals.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumRhsEvals.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetNumLinSolvSetups(void* cvode_mem,
 #                                              long int* nlinsetups);
+CVodeGetNumLinSolvSetups = getattr(sundials_cvode, 'CVodeGetNumLinSolvSetups')
+CVodeGetNumLinSolvSetups.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumLinSolvSetups.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetNumErrTestFails(void* cvode_mem, long int* netfails);
+CVodeGetNumErrTestFails = getattr(sundials_cvode, 'CVodeGetNumErrTestFails')
+CVodeGetNumErrTestFails.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumErrTestFails.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetLastOrder(void* cvode_mem, int* qlast);
 # SUNDIALS_EXPORT int CVodeGetCurrentOrder(void* cvode_mem, int* qcur);
 # SUNDIALS_EXPORT int CVodeGetCurrentGamma(void* cvode_mem, sunrealtype* gamma);
@@ -256,6 +288,9 @@ CVode.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetErrWeights(void* cvode_mem, N_Vector eweight);
 # SUNDIALS_EXPORT int CVodeGetEstLocalErrors(void* cvode_mem, N_Vector ele);
 # SUNDIALS_EXPORT int CVodeGetNumGEvals(void* cvode_mem, long int* ngevals);
+CVodeGetNumGEvals = getattr(sundials_cvode, 'CVodeGetNumGEvals')
+CVodeGetNumGEvals.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumGEvals.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetRootInfo(void* cvode_mem, int* rootsfound);
 CVodeGetRootInfo = getattr(sundials_cvode, 'CVodeGetRootInfo')
 CVodeGetRootInfo.argtypes = [c_void_p, POINTER(c_int)]
@@ -272,8 +307,14 @@ CVodeGetRootInfo.restype = c_int
 #                                                 void** user_data);
 # SUNDIALS_EXPORT int CVodeGetNumNonlinSolvIters(void* cvode_mem,
 #                                                long int* nniters);
+CVodeGetNumNonlinSolvIters = getattr(sundials_cvode, 'CVodeGetNumNonlinSolvIters')
+CVodeGetNumNonlinSolvIters.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumNonlinSolvIters.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetNumNonlinSolvConvFails(void* cvode_mem,
 #                                                    long int* nnfails);
+CVodeGetNumNonlinSolvConvFails = getattr(sundials_cvode, 'CVodeGetNumNonlinSolvConvFails')
+CVodeGetNumNonlinSolvConvFails.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumNonlinSolvConvFails.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetNonlinSolvStats(void* cvode_mem, long int* nniters,
 #                                             long int* nnfails);
 # SUNDIALS_EXPORT int CVodeGetNumStepSolveFails(void* cvode_mem,
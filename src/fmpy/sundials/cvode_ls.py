@@ -1,7 +1,9 @@
-from ctypes import c_void_p, c_int
+from ctypes import CFUNCTYPE, c_void_p, c_int, c_long, POINTER
 from .libraries import sundials_cvode
 from .sundials_matrix import SUNMatrix
 from .sundials_linearsolver import SUNLinearSolver
+from .sundials_nvector import N_Vector
+from .sundials_types import sunrealtype
 
 # /* ----------------------------------------------------------------
 #  * Programmer(s): Daniel R. Reynolds @ UMBC
@@ -59,6 +61,7 @@ from .sundials_linearsolver import SUNLinearSolver
 # typedef int (*CVLsJacFn)(sunrealtype t, N_Vector y, N_Vector fy, SUNMatrix Jac,
 #                          void* user_data, N_Vector tmp1, N_Vector tmp2,
 #                          N_Vector tmp3);
+CVLsJacFn = CFUNCTYPE(c_int, sunrealtype, N_Vector, N_Vector, SUNMatrix, c_void_p, N_Vector, N_Vector, N_Vector)
 #
 # typedef int (*CVLsPrecSetupFn)(sunrealtype t, N_Vector y, N_Vector fy,
 #                                sunbooleantype jok, sunbooleantype* jcurPtr,
@@ -70,10 +73,12 @@ from .sundials_linearsolver import SUNLinearSolver
 #
 # typedef int (*CVLsJacTimesSetupFn)(sunrealtype t, N_Vector y, N_Vector fy,
 #                                    void* user_data);
+CVLsJacTimesSetupFn = CFUNCTYPE(c_int, sunrealtype, N_Vector, N_Vector, c_void_p)
 #
 # typedef int (*CVLsJacTimesVecFn)(N_Vector v, N_Vector Jv, sunrealtype t,
 #                                  N_Vector y, N_Vector fy, void* user_data,
 #                                  N_Vector tmp);
+CVLsJacTimesVecFn = CFUNCTYPE(c_int, N_Vector, N_Vector, sunrealtype, N_Vector, N_Vector, c_void_p, N_Vector)
 #
 # typedef int (*CVLsLinSysFn)(sunrealtype t, N_Vector y, N_Vector fy, SUNMatrix A,
 #                             sunbooleantype jok, sunbooleantype* jcur,
@@ -95,6 +100,9 @@ CVodeSetLinearSolver.restype = c_int
 #   -----------------------------------------------------------------*/
 #
 # SUNDIALS_EXPORT int CVodeSetJacFn(void* cvode_mem, CVLsJacFn jac);
+CVodeSetJacFn = getattr(sundials_cvode, 'CVodeSetJacFn')
+CVodeSetJacFn.argtypes = [c_void_p, CVLsJacFn]
+CVodeSetJacFn.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetJacEvalFrequency(void* cvode_mem, long int msbj);
 # SUNDIALS_EXPORT int CVodeSetLinearSolutionScaling(void* cvode_mem,
 #                                                   sunbooleantype onoff);
@@ -106,6 +114,9 @@ CVodeSetLinearSolver.restype = c_int
 #                                            CVLsPrecSolveFn psolve);
 # SUNDIALS_EXPORT int CVodeSetJacTimes(void* cvode_mem, CVLsJacTimesSetupFn jtsetup,
 #                                      CVLsJacTimesVecFn jtimes);
+CVodeSetJacTimes = getattr(sundials_cvode, 'CVodeSetJacTimes')
+CVodeSetJacTimes.argtypes = [c_void_p, CVLsJacTimesSetupFn, CVLsJacTimesVecFn]
+CVodeSetJacTimes.restype = c_int
 # SUNDIALS_EXPORT int CVodeSetLinSysFn(void* cvode_mem, CVLsLinSysFn linsys);
 #
 # /*-----------------------------------------------------------------
@@ -119,13 +130,25 @@ CVodeSetLinearSolver.restype = c_int
 #   "Work space functions will be removed in version 8.0.0")
 # int CVodeGetLinWorkSpace(void* cvode_mem, long int* lenrwLS, long int* leniwLS);
 # SUNDIALS_EXPORT int CVodeGetNumJacEvals(void* cvode_mem, long int* njevals);
+CVodeGetNumJacEvals = getattr(sundials_cvode, 'CVodeGetNumJacEvals')
+CVodeGetNumJacEvals.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumJacEvals.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetNumPrecEvals(void* cvode_mem, long int* npevals);
 # SUNDIALS_EXPORT int CVodeGetNumPrecSolves(void* cvode_mem, long int* npsolves);
 # SUNDIALS_EXPORT int CVodeGetNumLinIters(void* cvode_mem, long int* nliters);
+CVodeGetNumLinIters = getattr(sundials_cvode, 'CVodeGetNumLinIters')
+CVodeGetNumLinIters.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumLinIters.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetNumLinConvFails(void* cvode_mem, long int* nlcfails);
 # SUNDIALS_EXPORT int CVodeGetNumJTSetupEvals(void* cvode_mem, long int* njtsetups);
 # SUNDIALS_EXPORT int CVodeGetNumJtimesEvals(void* cvode_mem, long int* njvevals);
+CVodeGetNumJtimesEvals = getattr(sundials_cvode, 'CVodeGetNumJtimesEvals')
+CVodeGetNumJtimesEvals.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumJtimesEvals.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetNumLinRhsEvals(void* cvode_mem, long int* nfevalsLS);
+CVodeGetNumLinRhsEvals = getattr(sundials_cvode, 'CVodeGetNumLinRhsEvals')
+CVodeGetNumLinRhsEvals.argtypes = [c_void_p, POINTER(c_long)]
+CVodeGetNumLinRhsEvals.restype = c_int
 # SUNDIALS_EXPORT int CVodeGetLinSolveStats(void* cvode_mem, long int* njevals,
 #                                           long int* nfevalsLS,
 #                                           long int* nliters, long int* nlcfails,
@@ -144,6 +144,9 @@ N_VDestroy_Serial.restype = None
 #
 # SUNDIALS_EXPORT
 # sunrealtype* N_VGetArrayPointer_Serial(N_Vector v);
+N_VGetArrayPointer_Serial = getattr(sundials_nvecserial, 'N_VGetArrayPointer_Serial')
+N_VGetArrayPointer_Serial.argtypes = [N_Vector]
+N_VGetArrayPointer_Serial.restype = POINTER(sunrealtype)
 #
 # SUNDIALS_EXPORT
 # void N_VSetArrayPointer_Serial(sunrealtype* v_data, N_Vector v);
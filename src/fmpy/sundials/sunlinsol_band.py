@@ -0,0 +1,39 @@
+from .libraries import sundials_cvode
+from .sundials_types import SUNContext
+from .sundials_linearsolver import SUNLinearSolver
+from .sundials_matrix import SUNMatrix
+from .sundials_nvector import N_Vector
+
+# /*
+#  * -----------------------------------------------------------------
+#  * This is the header file for the band implementation of the
+#  * SUNLINSOL module, SUNLINSOL_BAND.
+#  *
+#  * Notes:
+#  *   - The band linear solver functions are exported by the CVODE library.
+#  * -----------------------------------------------------------------
+#  */
+#
+# #ifndef _SUNLINSOL_BAND_H
+# #define _SUNLINSOL_BAND_H
+#
+# #include <sundials/sundials_band.h>
+# #include <sundials/sundials_linearsolver.h>
+# #include <sundials/sundials_matrix.h>
+# #include <sundials/sundials_nvector.h>
+# #include <sunmatrix/sunmatrix_band.h>
+#
+# /* ---------------------------------------
+#  * Exported Functions for SUNLINSOL_BAND
+#  * --------------------------------------- */
+#
+# SUNDIALS_EXPORT
+# SUNLinearSolver SUNLinSol_Band(N_Vector y, SUNMatrix A, SUNContext sunctx);
+SUNLinSol_Band = getattr(sundials_cvode, 'SUNLinSol_Band')
+SUNLinSol_Band.argtypes = [N_Vector, SUNMatrix, SUNContext]
+SUNLinSol_Band.restype = SUNLinearSolver
+#
+# SUNDIALS_EXPORT
+# SUNErrCode SUNLinSolFree_Band(SUNLinearSolver S);
+#
+# #endif
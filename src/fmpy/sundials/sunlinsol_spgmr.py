@@ -0,0 +1,65 @@
+from ctypes import c_int
+from .libraries import sundials_cvode
+from .sundials_types import SUNContext
+from .sundials_linearsolver import SUNLinearSolver
+from .sundials_nvector import N_Vector
+
+# /*
+#  * -----------------------------------------------------------------
+#  * This is the header file for the SPGMR implementation of the
+#  * SUNLINSOL module, SUNLINSOL_SPGMR. The SPGMR algorithm is based
+#  * on the Scaled Preconditioned GMRES (Generalized Minimal Residual)
+#  * method.
+#  *
+#  * Notes:
+#  *   - The SPGMR functions are exported by the CVODE library.
+#  * -----------------------------------------------------------------
+#  */
+#
+# #ifndef _SUNLINSOL_SPGMR_H
+# #define _SUNLINSOL_SPGMR_H
+#
+# #include <sundials/sundials_linearsolver.h>
+# #include <sundials/sundials_matrix.h>
+# #include <sundials/sundials_nvector.h>
+#
+# /* Default SPGMR solver parameters */
+# #define SUNSPGMR_MAXL_DEFAULT    5
+SUNSPGMR_MAXL_DEFAULT = 5
+# #define SUNSPGMR_MAXRS_DEFAULT   0
+# #define SUNSPGMR_GSTYPE_DEFAULT SUN_MODIFIED_GS
+#
+# /* from sundials_iterative.h */
+# enum
+# {
+#   SUN_PREC_NONE,
+#   SUN_PREC_LEFT,
+#   SUN_PREC_RIGHT,
+#   SUN_PREC_BOTH
+# };
+SUN_PREC_NONE = 0
+SUN_PREC_LEFT = 1
+SUN_PREC_RIGHT = 2
+SUN_PREC_BOTH = 3
+#
+# /* ---------------------------------------
+#  * Exported Functions for SUNLINSOL_SPGMR
+#  * --------------------------------------- */
+#
+# SUNDIALS_EXPORT
+# SUNLinearSolver SUNLinSol_SPGMR(N_Vector y, int pretype, int maxl,
+#                                 SUNContext sunctx);
+SUNLinSol_SPGMR = getattr(sundials_cvode, 'SUNLinSol_SPGMR')
+SUNLinSol_SPGMR.argtypes = [N_Vector, c_int, c_int, SUNContext]
+SUNLinSol_SPGMR.restype = SUNLinearSolver
+#
+# SUNDIALS_EXPORT
+# SUNErrCode SUNLinSol_SPGMRSetPrecType(SUNLinearSolver S, int pretype);
+#
+# SUNDIALS_EXPORT
+# SUNErrCode SUNLinSol_SPGMRSetMaxRestarts(SUNLinearSolver S, int maxrs);
+#
+# SUNDIALS_EXPORT
+# SUNErrCode SUNLinSolFree_SPGMR(SUNLinearSolver S);
+#
+# #endif
@@ -0,0 +1,86 @@
+from ctypes import POINTER
+from .libraries import sundials_cvode
+from .sundials_types import sunindextype, sunrealtype, SUNContext
+from .sundials_matrix import SUNMatrix
+
+# /*
+#  * -----------------------------------------------------------------
+#  * This is the header file for the band implementation of the
+#  * SUNMATRIX module, SUNMATRIX_BAND.
+#  *
+#  * Notes:
+#  *   - The band matrix functions are exported by the CVODE library.
+#  * -----------------------------------------------------------------
+#  */
+#
+# #ifndef _SUNMATRIX_BAND_H
+# #define _SUNMATRIX_BAND_H
+#
+# #include <stdio.h>
+# #include <sundials/sundials_matrix.h>
+#
+# /* ---------------------------------
+#  * Band implementation of SUNMatrix
+#  * --------------------------------- */
+#
+# struct _SUNMatrixContent_Band
+# {
+#   sunindextype M;
+#   sunindextype N;
+#   sunindextype ldim;
+#   sunindextype mu;
+#   sunindextype ml;
+#   sunindextype s_mu;
+#   sunrealtype* data;
+#   sunindextype ldata;
+#   sunrealtype** cols;
+# };
+#
+# /* ------------------------------------
+#  * Macros for access to SUNMATRIX_BAND
+#  * ------------------------------------ */
+#
+# #define SM_COLUMN_B(A, j) (((SM_CONTENT_B(A)->cols)[j]) + SM_SUBAND_B(A))
+#
+# #define SM_COLUMN_ELEMENT_B(col_j, i, j) (col_j[(i) - (j)])
+#
+# /* --------------------------------------
+#  * Exported Functions for SUNMATRIX_BAND
+#  * -------------------------------------- */
+#
+# SUNDIALS_EXPORT SUNMatrix SUNBandMatrix(sunindextype N, sunindextype mu,
+#                                         sunindextype ml, SUNContext sunctx);
+SUNBandMatrix = getattr(sundials_cvode, 'SUNBandMatrix')
+SUNBandMatrix.argtypes = [sunindextype, sunindextype, sunindextype, SUNContext]
+SUNBandMatrix.restype = SUNMatrix
+#
+# SUNDIALS_EXPORT sunindextype SUNBandMatrix_Rows(SUNMatrix A);
+# SUNDIALS_EXPORT sunindextype SUNBandMatrix_Columns(SUNMatrix A);
+# SUNDIALS_EXPORT sunindextype SUNBandMatrix_LowerBandwidth(SUNMatrix A);
+# SUNDIALS_EXPORT sunindextype SUNBandMatrix_UpperBandwidth(SUNMatrix A);
+# SUNDIALS_EXPORT sunindextype SUNBandMatrix_StoredUpperBandwidth(SUNMatrix A);
+SUNBandMatrix_StoredUpperBandwidth = getattr(sundials_cvode, 'SUNBandMatrix_StoredUpperBandwidth')
+SUNBandMatrix_StoredUpperBandwidth.argtypes = [SUNMatrix]
+SUNBandMatrix_StoredUpperBandwidth.restype = sunindextype
+# SUNDIALS_EXPORT sunindextype SUNBandMatrix_LDim(SUNMatrix A);
+SUNBandMatrix_LDim = getattr(sundials_cvode, 'SUNBandMatrix_LDim')
+SUNBandMatrix_LDim.argtypes = [SUNMatrix]
+SUNBandMatrix_LDim.restype = sunindextype
+# SUNDIALS_EXPORT sunindextype SUNBandMatrix_LData(SUNMatrix A);
+# SUNDIALS_EXPORT sunrealtype* SUNBandMatrix_Data(SUNMatrix A);
+SUNBandMatrix_Data = getattr(sundials_cvode, 'SUNBandMatrix_Data')
+SUNBandMatrix_Data.argtypes = [SUNMatrix]
+SUNBandMatrix_Data.restype = POINTER(sunrealtype)
+# SUNDIALS_EXPORT sunrealtype** SUNBandMatrix_Cols(SUNMatrix A);
+# SUNDIALS_EXPORT sunrealtype* SUNBandMatrix_Column(SUNMatrix A, sunindextype j);
+#
+# SUNDIALS_EXPORT SUNMatrix_ID SUNMatGetID_Band(SUNMatrix A);
+# SUNDIALS_EXPORT SUNMatrix SUNMatClone_Band(SUNMatrix A);
+# SUNDIALS_EXPORT void SUNMatDestroy_Band(SUNMatrix A);
+# SUNDIALS_EXPORT SUNErrCode SUNMatZero_Band(SUNMatrix A);
+# SUNDIALS_EXPORT SUNErrCode SUNMatCopy_Band(SUNMatrix A, SUNMatrix B);
+# SUNDIALS_EXPORT SUNErrCode SUNMatScaleAdd_Band(sunrealtype c, SUNMatrix A, SUNMatrix B);
+# SUNDIALS_EXPORT SUNErrCode SUNMatScaleAddI_Band(sunrealtype c, SUNMatrix A);
+# SUNDIALS_EXPORT SUNErrCode SUNMatMatvec_Band(SUNMatrix A, N_Vector x, N_Vector y);
+#
+# #endif
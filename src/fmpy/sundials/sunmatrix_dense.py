@@ -1,5 +1,6 @@
+from ctypes import POINTER
 from .libraries import sundials_sunmatrixdense
-from .sundials_types import sunindextype, SUNContext
+from .sundials_types import sunindextype, sunrealtype, SUNContext
 from .sundials_matrix import SUNMatrix
 
 # /*
@@ -96,6 +97,9 @@ SUNDenseMatrix.restype = SUNMatrix
 # SUNDIALS_EXPORT sunindextype SUNDenseMatrix_Columns(SUNMatrix A);
 # SUNDIALS_EXPORT sunindextype SUNDenseMatrix_LData(SUNMatrix A);
 # SUNDIALS_EXPORT sunrealtype* SUNDenseMatrix_Data(SUNMatrix A);
+SUNDenseMatrix_Data = getattr(sundials_sunmatrixdense, 'SUNDenseMatrix_Data')
+SUNDenseMatrix_Data.argtypes = [SUNMatrix]
+SUNDenseMatrix_Data.restype = POINTER(sunrealtype)
 # SUNDIALS_EXPORT sunrealtype** SUNDenseMatrix_Cols(SUNMatrix A);
 # SUNDIALS_EXPORT sunrealtype* SUNDenseMatrix_Column(SUNMatrix A, sunindextype j);
 #
@@ -5,6 +5,7 @@ import shutil
 from pathlib import Path
 
 from collections.abc import Iterable
+from itertools import chain, islice
 
 import os
 from os import PathLike
@@ -15,74 +16,683 @@ import fmpy
 import numpy as np
 
 
-def read_csv(filename: str | PathLike, variable_names: [str] = None) -> np.typing.NDArray:
+def read_csv(filename: str | PathLike, variable_names: [str] = None, chunk_size: int = None) -> np.typing.NDArray:
     """ Read a CSV file that conforms to the FMI cross-check rules
 
+    Parameters:
+        filename        name of the CSV file to read
+        variable_names  list of variables to read (None: read all)
+        chunk_size      number of rows per chunk (None: read all rows at once)
+
     Returns:
-        traj             the trajectories read from the CSV file
+        traj             the trajectories read from the CSV file or an iterator over chunks of
+                         at most chunk_size rows if chunk_size is not None
     """
 
+    if chunk_size is not None:
+        return _read_csv_chunks(filename, variable_names, chunk_size)
+
+    chunks = list(_read_csv_chunks(filename, variable_names, 65536))
+
+    if len(chunks) == 1:
+        return chunks[0]
+
+    return np.concatenate(chunks)
+
+
+def _read_csv_chunks(filename, variable_names, chunk_size):
+    """ Read a CSV file in chunks (see read_csv()) """
+
     with open(filename, 'r') as csv:
-        lines = csv.readlines()
 
-    cols = []
+        names = [name.strip('"') for name in csv.readline().rstrip().split(',')]
 
-    names = lines[0].rstrip().split(',')
-    first = lines[1].rstrip().split(',')
+        dtype = None
 
-    for name, literal in zip(names, first):
-        n = len(literal.split(' '))
-        cols.append((name.strip('"'), np.float64, (n,) if n > 1 else None))
+        while True:
 
-    rows = []
+            lines = list(islice(csv, chunk_size))
 
-    for line in lines[1:]:
+            if dtype is None:
 
-        row = []
+                # get the sizes of the columns from the first row
+                if lines:
+                    sizes = [len(literal.split(' ')) for literal in lines[0].rstrip().split(',')]
+                else:
+                    sizes = [1] * len(names)
 
-        for literal in line.rstrip().split(','):
-            values = literal.split(' ')
-            if len(values) > 1:
-                row.append(tuple(map(float, values)))
-            else:
-                row.append(float(literal))
-        rows.append(tuple(row))
+                dtype = np.dtype([(name, np.float64, (n,)) if n > 1 else (name, np.float64) for name, n in zip(names, sizes)])
+
+            elif not lines:
+                break
 
-    traj = np.array(rows, dtype=np.dtype(cols))
+            if lines:
+                # parse the values of all columns as one block
+                values = np.loadtxt([line.replace(',', ' ') for line in lines], dtype=np.float64, comments=None, ndmin=2)
+                traj = np.ascontiguousarray(values).view(dtype)[:, 0]
+            else:
+                traj = np.empty((0,), dtype=dtype)
 
-    if variable_names is not None:
-        traj = traj[['time'] + variable_names]
+            yield traj if variable_names is None else traj[['time'] + variable_names]
 
-    return traj
+            if len(lines) < chunk_size:
+                break
 
 
-def write_csv(filename: str | PathLike, result: np.typing.NDArray, columns: [str] = None) -> None:
+def write_csv(filename: str | PathLike, result: np.typing.NDArray | Iterable[np.typing.NDArray], columns: [str] = None,
+              chunk_size: int = 65536) -> None:
     """ Save a simulation result as a CSV file
 
     Parameters:
-        filename   name of the CSV file to write
-        result     structured NumPy array that holds the result
-        columns    list of column names to save (None: save all)
+        filename    name of the CSV file to write
+        result      structured NumPy array that holds the result or an iterable of structured NumPy arrays
+        columns     list of column names to save (None: save all)
+        chunk_size  number of rows that are formatted at once
     """
 
+    if isinstance(result, np.ndarray):
+        chunks = (result[start:start + chunk_size] for start in range(0, len(result), chunk_size))
+        names = result.dtype.names
+    else:
+        chunks = iter(result)
+        first = next(chunks, None)
+        if first is None:
+            raise Exception("result must not be empty")
+        names = first.dtype.names
+        chunks = chain([first], chunks)
+
     if columns is not None:
-        result = result[['time'] + columns]
+        names = ['time'] + columns
 
     with open(filename, 'w') as csv:
 
-        csv.write(','.join(map(lambda n: f'"{n}"', result.dtype.names)) + '\n')
+        csv.write(','.join(map(lambda n: f'"{n}"', names)) + '\n')
+
+        for chunk in chunks:
+
+            literals = []
 
-        for i in range(len(result)):
-            for j, name in enumerate(result.dtype.names):
-                value = result[i][name]
-                if isinstance(value, Iterable):
-                    literal = ' '.join(map(lambda v: f'{v:.16g}', value.flatten()))
+            for name in names:
+
+                values = chunk[name]
+
+                if values.ndim > 1:
+                    # space separated array values
+                    values = values.reshape(len(values), -1)
+                    fmt = ' '.join(['%.16g'] * values.shape[1])
+                    literals.append([fmt % tuple(row) for row in values.tolist()])
+                elif values.dtype == np.float64 or values.dtype.kind in 'biu':
+                    # the Python scalars have the same string representation
+                    literals.append(list(map(str, values.tolist())))
                 else:
-                    literal = str(value)
-                if j > 0:
-                    csv.write(',')
-                csv.write(literal)
-            csv.write('\n')
+                    literals.append(values.astype(str).tolist())
+
+            csv.writelines(','.join(row) + '\n' for row in zip(*literals))
+
+
+_result_formats = {
+    '.csv': 'csv',
+    '.npz': 'npz',
+    '.arrow': 'feather',
+    '.feather': 'feather',
+    '.parquet': 'parquet',
+    '.mat': 'mat',
+}
+
+
+def _result_format(filename, format):
+    """ Get the format of a result file from its extension (default: 'csv') """
+
+    if format is not None:
+        if format not in _result_formats.values():
+            raise Exception(f'Unknown result format "{format}". Format must be one of {sorted(set(_result_formats.values()))}.')
+        return format
+
+    _, extension = os.path.splitext(filename)
+
+    return _result_formats.get(extension.lower(), 'csv')
+
+
+def _result_columns(names, columns):
+    """ Get the names of the columns to write or read """
+
+    if columns is None:
+        return list(names)
+
+    return ['time'] + [name for name in columns if name != 'time']
+
+
+def write_result(filename: str | PathLike, result: np.typing.NDArray, columns: [str] = None, format: str = None) -> None:
+    """ Save a simulation result as CSV, NPZ, Arrow IPC (Feather), Parquet or Dymola result (MAT v4) file
+
+    The Arrow IPC and Parquet formats require pyarrow.
+
+    Parameters:
+        filename  name of the file to write
+        result    structured NumPy array that holds the result
+        columns   list of column names to save (None: save all)
+        format    'csv', 'npz', 'feather', 'parquet' or 'mat' (None: determine from the file extension)
+    """
+
+    format = _result_format(filename, format)
+
+    if format == 'csv':
+        write_csv(filename, result, columns=columns)
+        return
+
+    names = _result_columns(result.dtype.names, columns)
+
+    if format == 'mat':
+        model_description = getattr(result, 'modelDescription', None)
+        if model_description is None:
+            write_mat(filename, result[names])
+        else:
+            variables = {v.name: v for v in model_description.modelVariables if v.name in names}
+            parameters = [name for name, v in variables.items() if v.variability in {'constant', 'fixed', 'parameter'}]
+            descriptions = {name: v.description for name, v in variables.items()}
+            write_mat(filename, result[names], parameters=parameters, descriptions=descriptions)
+    elif format == 'npz':
+        # uncompressed, one .npy file per column
+        with open(filename, 'wb') as f:
+            np.savez(f, **{name: result[name] for name in names})
+    else:
+        table = _arrow_table(result, names)
+
+        if format == 'feather':
+            import pyarrow.feather as feather
+            feather.write_feather(table, filename, compression='uncompressed')
+        else:
+            import pyarrow.parquet as parquet
+            parquet.write_table(table, filename)
+
+
+def read_result(filename: str | PathLike, columns: [str] = None, format: str = None) -> np.typing.NDArray:
+    """ Read a simulation result from a CSV, NPZ, Arrow IPC (Feather), Parquet or Dymola result (MAT v4) file
+
+    Parameters:
+        filename  name of the file to read
+        columns   list of column names to read (None: read all)
+        format    'csv', 'npz', 'feather', 'parquet' or 'mat' (None: determine from the file extension)
+
+    Returns:
+        the result as structured NumPy array
+    """
+
+    format = _result_format(filename, format)
+
+    if columns is not None:
+        columns = _result_columns(None, columns)
+
+    if format == 'csv':
+        return read_csv(filename, variable_names=None if columns is None else columns[1:])
+
+    if format == 'mat':
+        return read_mat(filename, variable_names=None if columns is None else columns[1:])
+
+    if format == 'npz':
+
+        with np.load(filename) as npz:
+
+            names = npz.files if columns is None else columns
+
+            # only the requested columns are read from the archive
+            arrays = [npz[name] for name in names]
+
+    else:
+
+        if format == 'feather':
+            import pyarrow.feather as feather
+            table = feather.read_table(filename, columns=columns, memory_map=True)
+        else:
+            import pyarrow.parquet as parquet
+            table = parquet.read_table(filename, columns=columns, memory_map=True)
+
+        names = table.column_names
+
+        arrays = [_numpy_array(table.schema.field(name), table.column(name)) for name in names]
+
+    result = np.empty(len(arrays[0]), dtype=[(name, array.dtype, array.shape[1:]) for name, array in zip(names, arrays)])
+
+    for name, array in zip(names, arrays):
+        result[name] = array
+
+    return result
+
+
+def _arrow_table(result, names):
+    """ Convert the columns of a structured array to an Arrow table """
+
+    import json
+    import pyarrow as pa
+
+    arrays = []
+    fields = []
+
+    for name in names:
+
+        values = result[name]
+
+        if values.ndim > 1:
+            # array variables are stored as fixed size lists of the flattened values
+            shape = values.shape[1:]
+            flat = pa.array(np.ascontiguousarray(values).reshape(-1))
+            array = pa.FixedSizeListArray.from_arrays(flat, int(np.prod(shape)))
+            metadata = {'shape': json.dumps(shape)}
+        else:
+            array = pa.array(np.ascontiguousarray(values))
+            metadata = None
+
+        arrays.append(array)
+        fields.append(pa.field(name, array.type, nullable=False, metadata=metadata))
+
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def _numpy_array(field, column):
+    """ Convert a column of an Arrow table to a NumPy array """
+
+    import json
+    import pyarrow as pa
+
+    column = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+
+    if pa.types.is_fixed_size_list(column.type):
+        shape = tuple(json.loads(field.metadata[b'shape'])) if field.metadata and b'shape' in field.metadata else (column.type.list_size,)
+        values = column.flatten().to_numpy(zero_copy_only=False)
+        return values.reshape((len(column),) + shape)
+
+    return column.to_numpy(zero_copy_only=False)
+
+
+# MAT v4 data types (P digit of the matrix type) -> NumPy type
+_mat_types = {0: 'f8', 1: 'f4', 2: 'i4', 3: 'i2', 4: 'u2', 5: 'u1'}
+
+
+def _mat_header(type, mrows, ncols, name):
+    """ Create the header of a little endian MAT v4 matrix """
+
+    from struct import pack
+
+    return pack('<5i', type, mrows, ncols, 0, len(name) + 1) + name.encode('ascii') + b'\0'
+
+
+def _mat_text(name, strings, transposed):
+    """ Create a MAT v4 text matrix with one string per row (or per column if transposed) """
+
+    length = max([len(s) for s in strings] + [1])
+
+    text = np.array([list(s.ljust(length)) for s in strings], dtype='S1').reshape(len(strings), length)
+
+    # the data is stored column-wise
+    if transposed:
+        return _mat_header(51, length, len(strings), name) + text.tobytes()
+    else:
+        return _mat_header(51, len(strings), length, name) + text.T.tobytes()
+
+
+def _flat_names(dtype):
+    """ Get the names of the scalar elements of a structured dtype (e.g. "x[1,2]" for array fields) """
+
+    names = []
+
+    for name in dtype.names:
+
+        shape = dtype[name].shape
+
+        if shape:
+            names += [f'{name}[{",".join(str(i + 1) for i in index)}]' for index in np.ndindex(shape)]
+        else:
+            names.append(name)
+
+    return names
+
+
+class MatFile(object):
+    """ Dymola result file (MAT v4) that can be written incrementally
+
+    The values of the parameters are taken from the first row and stored once in data_1. The other
+    variables are stored as float64 in data_2, that is appended to and finalized by close().
+    """
+
+    def __init__(self, filename, dtype, descriptions=None, parameters=()):
+        """
+        Parameters:
+            filename      the filename of the .mat file
+            dtype         the structured dtype of the rows (the first field must be "time")
+            descriptions  dictionary of variable name -> description
+            parameters    names of the fields to store in data_1
+        """
+
+        self.filename = filename
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+
+        if descriptions is None:
+            descriptions = {}
+
+        names = self.dtype.names[1:]
+
+        self._parameters = [name for name in names if name in parameters]
+        self._trajectories = [name for name in names if name not in parameters]
+
+        parameter_names = _flat_names(self.dtype[self._parameters]) if self._parameters else []
+        trajectory_names = _flat_names(self.dtype[self._trajectories]) if self._trajectories else []
+
+        data_info = [(0, 1, 0, -1)]
+        data_info += [(1, i + 2, 0, 0) for i in range(len(parameter_names))]
+        data_info += [(2, i + 2, 0, -1) for i in range(len(trajectory_names))]
+
+        all_names = ['time'] + parameter_names + trajectory_names
+        all_descriptions = ['Simulation time [s]'] + [descriptions.get(name.split('[')[0], '') or '' for name in all_names[1:]]
+
+        self._n1 = len(parameter_names) + 1
+        self._n2 = len(trajectory_names) + 1
+
+        self._file = open(filename, 'wb')
+
+        self._file.write(_mat_text('Aclass', ['Atrajectory', '1.1', '', 'binTrans'], transposed=False))
+        self._file.write(_mat_text('name', all_names, transposed=True))
+        self._file.write(_mat_text('description', all_descriptions, transposed=True))
+
+        self._file.write(_mat_header(20, 4, len(data_info), 'dataInfo'))
+        self._file.write(np.array(data_info, dtype='<i4').tobytes())
+
+        self._data_1 = None  # offset of data_1
+        self._data_2 = None  # offset of data_2
+
+    def _write_data(self, row):
+        """ Write data_1 with the parameters of the first row and the header of data_2 """
+
+        self._data_1 = self._file.tell()
+
+        values = np.zeros(self._n1)
+
+        if row is not None:
+            values[0] = row['time']
+            values[1:] = self._values(row, self._parameters)
+
+        self._file.write(_mat_header(0, self._n1, 2, 'data_1'))
+        self._file.write(np.concatenate([values, values]).astype('<f8').tobytes())
+
+        self._parameterValues = values[1:]
+
+        self._data_2 = self._file.tell()
+
+        self._file.write(_mat_header(0, self._n2, 0, 'data_2'))
+
+    def _values(self, rows, names):
+        """ Convert the fields of a structured array to a 2-d float64 array """
+
+        rows = np.atleast_1d(rows)
+
+        values = np.empty((rows.size, sum(int(np.prod(self.dtype[name].shape)) for name in names)))
+
+        start = 0
+
+        for name in names:
+            column = rows[name].reshape(rows.size, -1)
+            values[:, start:start + column.shape[1]] = column
+            start += column.shape[1]
+
+        return values
+
+    def append(self, rows):
+        """ Append rows to data_2
+
+        Parameters:
+            rows  structured NumPy array with the rows to append (see dtype)
+        """
+
+        if rows.size == 0:
+            return
+
+        if self._data_2 is None:
+            self._write_data(rows[0])
+
+        values = np.empty((rows.size, self._n2), dtype='<f8')
+        values[:, 0] = rows['time']
+        values[:, 1:] = self._values(rows, self._trajectories)
+
+        self._file.write(values.tobytes())
+        self.size += rows.size
+        self._lastTime = rows['time'][-1]
+
+    def read(self):
+        """ Read the rows that have been appended so far without closing the file
+
+        Returns:
+            a structured NumPy array with the rows (see dtype)
+        """
+
+        arr = np.empty(self.size, dtype=self.dtype)
+
+        if self.size == 0:
+            return arr
+
+        if not self._file.closed:
+            self._file.flush()
+
+        offset = self._data_2 + 20 + len('data_2') + 1
+
+        data = np.memmap(self.filename, dtype='<f8', mode='r', offset=offset, shape=(self.size, self._n2))
+
+        arr['time'] = data[:, 0]
+
+        for names, values in [(self._parameters, np.broadcast_to(self._parameterValues, (self.size, self._n1 - 1))),
+                              (self._trajectories, data[:, 1:])]:
+
+            start = 0
+
+            for name in names:
+                shape = self.dtype[name].shape
+                n = int(np.prod(shape))
+                arr[name] = values[:, start:start + n].reshape((self.size,) + shape)
+                start += n
+
+        return arr
+
+    def close(self):
+        """ Write the stop time and the number of rows and close the file """
+
+        from struct import pack
+
+        if self._file.closed:
+            return
+
+        if self._data_2 is None:
+            self._write_data(None)
+        else:
+            # stop time in data_1
+            self._file.seek(self._data_1 + 20 + len('data_1') + 1 + self._n1 * 8)
+            self._file.write(pack('<d', self._lastTime))
+
+            # number of columns of data_2
+            self._file.seek(self._data_2 + 8)
+            self._file.write(pack('<i', self.size))
+
+        self._file.close()
+
+    def result(self, modelDescription=None):
+        """ Close the file and return the result read from the file """
+
+        from .simulation import SimulationResult
+
+        self.close()
+
+        traj = read_mat(self.filename)
+
+        arr = np.empty(traj.size, dtype=self.dtype)
+
+        for name in self.dtype.names:
+            shape = self.dtype[name].shape
+            if shape:
+                arr[name] = np.column_stack([traj[n] for n in _flat_names(self.dtype[[name]])]).reshape((traj.size,) + shape)
+            else:
+                arr[name] = traj[name]
+
+        info_arr = arr.view(SimulationResult)
+
+        info_arr.modelDescription = modelDescription
+
+        return info_arr
+
+
+def _read_mat_matrices(filename):
+    """ Read the headers of the matrices in a MAT v4 file
+
+    Returns:
+        a dictionary name -> (dtype, mrows, ncols, offset of the data)
+    """
+
+    from struct import unpack
+
+    matrices = {}
+
+    size = os.path.getsize(filename)
+
+    with open(filename, 'rb') as f:
+
+        while f.tell() < size:
+
+            header = f.read(20)
+
+            type, mrows, ncols, imagf, namlen = unpack('<5i', header)
+
+            if type < 0 or type > 9999:
+                type, mrows, ncols, imagf, namlen = unpack('>5i', header)
+
+            M, O, P, T = type // 1000, type // 100 % 10, type // 10 % 10, type % 10
+
+            if M not in {0, 1} or O != 0 or P not in _mat_types or imagf:
+                raise Exception(f'Unsupported matrix type {type} in "{filename}".')
+
+            name = f.read(namlen).rstrip(b'\0').decode('ascii')
+
+            dtype = np.dtype(('<' if M == 0 else '>') + _mat_types[P])
+
+            matrices[name] = (dtype, T == 1, mrows, ncols, f.tell())
+
+            f.seek(mrows * ncols * dtype.itemsize, os.SEEK_CUR)
+
+    return matrices
+
+
+def _read_mat_matrix(filename, matrix):
+    """ Memory-map a matrix (see _read_mat_matrices()) as array with shape (ncols, mrows) """
+
+    dtype, _, mrows, ncols, offset = matrix
+
+    if mrows * ncols == 0:
+        return np.empty((ncols, mrows), dtype=dtype)
+
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(ncols, mrows))
+
+
+def _read_mat_strings(filename, matrix, transposed):
+    """ Read the strings of a text matrix """
+
+    text = _read_mat_matrix(filename, matrix)
+
+    if not transposed:
+        text = text.T
+
+    return [bytes(row).decode('latin1').rstrip(' \0') for row in np.asarray(text, dtype=np.uint8)]
+
+
+def read_mat(filename: str | PathLike, variable_names: [str] = None) -> np.typing.NDArray:
+    """ Read a Dymola result file (MAT v4)
+
+    The data matrices are memory-mapped and only the requested variables are read.
+
+    Parameters:
+        filename        name of the .mat file to read
+        variable_names  list of variables to read (None: read all)
+
+    Returns:
+        traj             structured NumPy array with the time and the trajectories (float64)
+    """
+
+    matrices = _read_mat_matrices(filename)
+
+    for name in ['Aclass', 'name', 'dataInfo', 'data_2']:
+        if name not in matrices:
+            raise Exception(f'"{filename}" is not a Dymola result file. Matrix "{name}" is missing.')
+
+    aclass = _read_mat_strings(filename, matrices['Aclass'], transposed=False)
+
+    transposed = len(aclass) > 3 and aclass[3] == 'binTrans'
+
+    names = _read_mat_strings(filename, matrices['name'], transposed)
+
+    data_info = np.asarray(_read_mat_matrix(filename, matrices['dataInfo']))
+
+    if not transposed:
+        data_info = data_info.T
+
+    if 'description' in matrices:
+        descriptions = _read_mat_strings(filename, matrices['description'], transposed)
+    else:
+        descriptions = [''] * len(names)
+
+    data = {}
+
+    for i in (1, 2):
+        if f'data_{i}' in matrices:
+            matrix = _read_mat_matrix(filename, matrices[f'data_{i}'])
+            data[i] = matrix if transposed else matrix.T
+
+    # variable name -> (matrix, column, description)
+    variables = {}
+
+    for name, (matrix, column, _, _), description in zip(names, data_info[:, :4], descriptions):
+        if matrix == 0:
+            matrix, column = 2, 1  # abscissa
+        variables[name] = (int(matrix), int(column), description)
+
+    time = data[2][:, 0]
+
+    if variable_names is None:
+        variable_names = [name for name in names if name not in {'time', 'Time'}]
+
+    traj = np.empty(time.size, dtype=[('time', np.float64)] + [(name, np.float64) for name in variable_names])
+
+    traj['time'] = time
+
+    for name in variable_names:
+
+        if name not in variables:
+            raise Exception(f'Variable "{name}" not found in "{filename}".')
+
+        matrix, column, _ = variables[name]
+
+        values = data[matrix][:, abs(column) - 1]
+
+        if matrix == 1:
+            # parameters are constant
+            values = values[0]
+
+        traj[name] = -values if column < 0 else values
+
+    return traj
+
+
+def write_mat(filename: str | PathLike, result: np.typing.NDArray, parameters: [str] = (), descriptions: dict = None) -> None:
+    """ Save a simulation result as Dymola result file (MAT v4)
+
+    Parameters:
+        filename      name of the .mat file to write
+        result        structured NumPy array that holds the result
+        parameters    names of the columns to store only once in data_1
+        descriptions  dictionary of variable name -> description
+    """
+
+    mat = MatFile(filename, result.dtype, descriptions=descriptions, parameters=parameters)
+
+    try:
+        for start in range(0, len(result), 65536):
+            mat.append(result[start:start + 65536])
+    finally:
+        mat.close()
 
 
 def read_ref_opt_file(filename):
@@ -743,12 +1353,9 @@ def get_start_values(filename):
     """
 
     from .model_description import read_model_description
-    from . import extract
+    from .extraction_cache import extraction_cache
     from .fmi1 import FMU1Slave, FMU1Model
     from .fmi2 import FMU2Slave, FMU2Model
-    from shutil import rmtree
-
-    unzipdir = extract(filename)
 
     model_description = read_model_description(filename, validate=False)
 
@@ -757,56 +1364,59 @@ def get_start_values(filename):
     else:
         implementation = model_description.modelExchange
 
-    # instantiate and initialize the FMU
-    fmu_kwargs = {
-        'guid': model_description.guid,
-        'modelIdentifier': implementation.modelIdentifier,
-        'unzipDirectory': unzipdir,
-    }
+    unzipdir = extraction_cache.acquire(filename, exclusive=implementation.canBeInstantiatedOnlyOncePerProcess,
+                                        include=('resources', 'binaries/'))
 
-    if model_description.fmiVersion == '1.0':
-        if model_description.coSimulation is not None:
-            fmu = FMU1Slave(**fmu_kwargs)
-        else:
-            fmu = FMU1Model(**fmu_kwargs)
-        fmu.instantiate()
-        fmu.initialize()
-    else:
-        if model_description.coSimulation is not None:
-            fmu = FMU2Slave(**fmu_kwargs)
+    try:
+        # instantiate and initialize the FMU
+        fmu_kwargs = {
+            'guid': model_description.guid,
+            'modelIdentifier': implementation.modelIdentifier,
+            'unzipDirectory': unzipdir,
+        }
+
+        if model_description.fmiVersion == '1.0':
+            if model_description.coSimulation is not None:
+                fmu = FMU1Slave(**fmu_kwargs)
+            else:
+                fmu = FMU1Model(**fmu_kwargs)
+            fmu.instantiate()
+            fmu.initialize()
         else:
-            fmu = FMU2Model(**fmu_kwargs)
-        fmu.instantiate()
-        fmu.enterInitializationMode()
-        fmu.exitInitializationMode()
-
-    # read the start values
-    start_values = {}
-
-    for variable in model_description.modelVariables:
-        try:
-            vr = [variable.valueReference]
-
-            if variable.type == 'Real':
-                value = fmu.getReal(vr=vr)
-                start_values[variable.name] = str(value[0])
-            elif variable.type in ['Integer', 'Enumeration']:
-                value = fmu.getInteger(vr=vr)
-                start_values[variable.name] = str(value[0])
-            elif variable.type == 'Boolean':
-                value = fmu.getBoolean(vr=vr)
-                start_values[variable.name] = 'true' if value[0] != 0 else 'false'
-            elif variable.type == 'String':
-                value = fmu.getString(vr=vr)
-                start_values[variable.name] = value[0]
-        except Exception as e:
-            print(e)  # do nothing
-
-    fmu.terminate()
-    fmu.freeInstance()
-
-    # clean up
-    rmtree(unzipdir, ignore_errors=True)
+            if model_description.coSimulation is not None:
+                fmu = FMU2Slave(**fmu_kwargs)
+            else:
+                fmu = FMU2Model(**fmu_kwargs)
+            fmu.instantiate()
+            fmu.enterInitializationMode()
+            fmu.exitInitializationMode()
+
+        # read the start values
+        start_values = {}
+
+        for variable in model_description.modelVariables:
+            try:
+                vr = [variable.valueReference]
+
+                if variable.type == 'Real':
+                    value = fmu.getReal(vr=vr)
+                    start_values[variable.name] = str(value[0])
+                elif variable.type in ['Integer', 'Enumeration']:
+                    value = fmu.getInteger(vr=vr)
+                    start_values[variable.name] = str(value[0])
+                elif variable.type == 'Boolean':
+                    value = fmu.getBoolean(vr=vr)
+                    start_values[variable.name] = 'true' if value[0] != 0 else 'false'
+                elif variable.type == 'String':
+                    value = fmu.getString(vr=vr)
+                    start_values[variable.name] = value[0]
+            except Exception as e:
+                print(e)  # do nothing
+
+        fmu.terminate()
+        fmu.freeInstance()
+    finally:
+        extraction_cache.release(unzipdir)
 
     return start_values
 
@@ -1,10 +1,76 @@
 """ Validation of the modelDescription.xml """
 
+import threading
+from os import PathLike
 from typing import List
 
 from fmpy.model_description import ModelDescription
 
 
+_schemas = {}
+""" The compiled XML schemas (schema file -> (XMLSchema, lock)) """
+
+_schemas_lock = threading.Lock()
+
+
+def xml_schema(schema_file: str | PathLike):
+    """ Get a compiled XML schema
+
+    The schemas are compiled on first use and shared by all threads of the process.
+
+    Parameters:
+        schema_file  path to the XSD file
+
+    Returns:
+        the XMLSchema
+    """
+
+    return _schema_entry(schema_file)[0]
+
+
+def _schema_entry(schema_file):
+    """ Get the compiled schema and the lock for its validations """
+
+    import os
+    from lxml import etree
+
+    schema_file = os.path.abspath(schema_file)
+
+    with _schemas_lock:
+
+        entry = _schemas.get(schema_file)
+
+        if entry is None:
+            entry = (etree.XMLSchema(file=schema_file), threading.Lock())
+            _schemas[schema_file] = entry
+
+    return entry
+
+
+def validate_xml(root, schema_file: str | PathLike) -> List[str]:
+    """ Validate an XML tree against an XML schema
+
+    The schemas are compiled on first use and shared by all threads of the process. As an XMLSchema keeps
+    the errors of the last validation, the validations against the same schema are serialized.
+
+    Parameters:
+        root         the root element of the XML tree
+        schema_file  path to the XSD file
+
+    Returns:
+        a list of the problems found
+    """
+
+    schema, lock = _schema_entry(schema_file)
+
+    with lock:
+
+        if schema.validate(root):
+            return []
+
+        return ["%s (line %d, column %d): %s" % (e.level_name, e.line, e.column, e.message) for e in schema.error_log]
+
+
 def validate_fmu(filename: str) -> List[str]:
     """ Validate the following aspects of an FMU
 
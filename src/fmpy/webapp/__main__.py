@@ -4,7 +4,8 @@ from dash import dcc, html, Dash
 from dash.dependencies import Input, Output, State
 import dash_bootstrap_components as dbc
 import fmpy
-from fmpy import read_model_description, simulate_fmu, extract
+from fmpy import read_model_description, simulate_fmu
+from fmpy.extraction_cache import extraction_cache
 from fmpy.util import create_plotly_figure
 import argparse
 
@@ -19,7 +20,8 @@ parser.add_argument('--debug', action='store_true', help="Set Flask debug mode a
 
 args = parser.parse_args()
 
-unzipdir = extract(args.fmu_filename)
+# the extracted files are shared with simulate_fmu()
+unzipdir = extraction_cache.acquire(args.fmu_filename)
 
 print('Extracting FMU to %s' % unzipdir)
 
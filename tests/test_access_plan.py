@@ -0,0 +1,67 @@
+import pytest
+import shutil
+
+from fmpy import read_model_description, extract, instantiate_fmu, platform_tuple
+from fmpy.simulation import AccessPlan
+
+
+@pytest.mark.parametrize('fmi_version', ['1.0', '2.0', '3.0'])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_access_plan(fmi_version, reference_fmus_dist_dir):
+
+    if fmi_version == '1.0':
+        filename = reference_fmus_dist_dir / fmi_version / 'cs' / 'Feedthrough.fmu'
+    else:
+        filename = reference_fmus_dist_dir / fmi_version / 'Feedthrough.fmu'
+
+    model_description = read_model_description(filename)
+
+    unzipdir = extract(filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'CoSimulation')
+
+    if fmi_version == '1.0':
+        fmu.initialize()
+    elif fmi_version == '2.0':
+        fmu.setupExperiment()
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+    else:
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+
+    if fmi_version == '3.0':
+        inputs = ['Float64_continuous_input', 'Int32_input', 'Boolean_input', 'UInt8_input']
+    else:
+        inputs = ['Float64_continuous_input', 'Int32_input', 'Boolean_input']
+
+    plan = AccessPlan(fmu, model_description, inputs)
+
+    plan.record['Float64_continuous_input'] = 3.5
+    plan.record['Int32_input'] = -4
+    plan.record['Boolean_input'] = True
+
+    if fmi_version == '3.0':
+        plan.record['UInt8_input'] = 7
+
+    plan.write()
+
+    # reset the record and read the values back
+    plan.record[...] = 0
+
+    record = plan.read()
+
+    assert record['Float64_continuous_input'] == 3.5
+    assert record['Int32_input'] == -4
+    assert record['Boolean_input']
+
+    if fmi_version == '3.0':
+        assert record['UInt8_input'] == 7
+
+    # unknown variable
+    with pytest.raises(Exception):
+        AccessPlan(fmu, model_description, ['unknown'])
+
+    fmu.terminate()
+    fmu.freeInstance()
+    shutil.rmtree(unzipdir, ignore_errors=True)
@@ -0,0 +1,83 @@
+import pytest
+import shutil
+import numpy as np
+
+from fmpy import read_model_description, extract, instantiate_fmu, platform_tuple
+
+
+@pytest.mark.parametrize('fmi_version', ['1.0', '2.0', '3.0'])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_array_getters_setters(fmi_version, reference_fmus_dist_dir):
+
+    if fmi_version == '1.0':
+        filename = reference_fmus_dist_dir / fmi_version / 'cs' / 'Feedthrough.fmu'
+    else:
+        filename = reference_fmus_dist_dir / fmi_version / 'Feedthrough.fmu'
+
+    model_description = read_model_description(filename)
+
+    unzipdir = extract(filename)
+
+    variables = dict((v.name, v) for v in model_description.modelVariables)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'CoSimulation')
+
+    if fmi_version == '1.0':
+        fmu.initialize()
+        types = [('Real', 'Float64_continuous_input', np.float64),
+                 ('Integer', 'Int32_input', np.int32),
+                 ('Boolean', 'Boolean_input', np.bool_)]
+    elif fmi_version == '2.0':
+        fmu.setupExperiment()
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+        types = [('Real', 'Float64_continuous_input', np.float64),
+                 ('Integer', 'Int32_input', np.int32),
+                 ('Boolean', 'Boolean_input', np.int32)]
+    else:
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+        types = [('Float32', 'Float32_continuous_input', np.float32),
+                 ('Float64', 'Float64_continuous_input', np.float64),
+                 ('Int8', 'Int8_input', np.int8),
+                 ('UInt8', 'UInt8_input', np.uint8),
+                 ('Int16', 'Int16_input', np.int16),
+                 ('UInt16', 'UInt16_input', np.uint16),
+                 ('Int32', 'Int32_input', np.int32),
+                 ('UInt32', 'UInt32_input', np.uint32),
+                 ('Int64', 'Int64_input', np.int64),
+                 ('UInt64', 'UInt64_input', np.uint64),
+                 ('Boolean', 'Boolean_input', np.bool_)]
+
+    for type_name, variable_name, dtype in types:
+
+        vr = np.array([variables[variable_name].valueReference], dtype=np.uint32)
+
+        getter = getattr(fmu, f'get{type_name}Array')
+        setter = getattr(fmu, f'set{type_name}Array')
+
+        setter(vr, np.array([1], dtype=dtype))
+
+        # write into a preallocated array
+        values = np.zeros(1, dtype=dtype)
+        result = getter(vr, values)
+        assert result is values
+        assert values[0] == 1
+
+        # allocate the array
+        assert getter(vr)[0] == 1
+
+        # wrong type
+        with pytest.raises(Exception):
+            getter(vr, np.zeros(1, dtype=np.complex128))
+
+        # too few values
+        with pytest.raises(Exception):
+            getter(np.concatenate([vr, vr]), values)
+
+        with pytest.raises(Exception):
+            setter(np.concatenate([vr, vr]), np.array([1], dtype=dtype))
+
+    fmu.terminate()
+    fmu.freeInstance()
+    shutil.rmtree(unzipdir, ignore_errors=True)
@@ -115,3 +115,234 @@ def test_bouncing_ball():
     #
     # plt.plot(time, value, '.-')
     # plt.show()
+
+
+def test_jacobian_function():
+    """ Test CVodeSolver with a Jacobian function for a stiff linear system """
+
+    from fmpy.sundials import CVodeSolver
+
+    nx = 20
+
+    # tridiagonal system matrix with widely spread eigenvalues
+    A = np.diag(-np.logspace(0, 4, nx)) + np.eye(nx, k=1) + np.eye(nx, k=-1)
+
+    x = np.ones(nx)
+
+    class Input:
+        def apply(self, time):
+            pass
+
+    def get_x(px, nx):
+        np.ctypeslib.as_array(px, (nx,))[:] = x
+
+    def set_x(px, nx):
+        x[:] = np.ctypeslib.as_array(px, (nx,))
+
+    def get_dx(pdx, nx):
+        np.ctypeslib.as_array(pdx, (nx,))[:] = A @ x
+
+    def get_nominals(pnominals, nx):
+        np.ctypeslib.as_array(pnominals, (nx,))[:] = 1.0
+
+    def get_jac(J):
+        J[:] = A
+
+    statistics = []
+    results = []
+
+    for jac in [None, get_jac]:
+
+        x[:] = 1.0
+
+        solver = CVodeSolver(nx=nx, nz=0, get_x=get_x, set_x=set_x, get_dx=get_dx, get_z=None,
+                             get_nominals=get_nominals, set_time=lambda t: None, input=Input(),
+                             startTime=0.0, maxStep=1.0, relativeTolerance=1e-6, maxNumSteps=5000,
+                             get_jac=jac)
+
+        solver.step(0.0, 1.0)
+
+        statistics.append(solver.statistics())
+        results.append(x.copy())
+
+    without_jac, with_jac = statistics
+
+    # difference quotients require nx RHS evaluations per Jacobian
+    assert without_jac['lin_rhs_evals'] == nx * without_jac['jac_evals']
+
+    # no RHS evaluations for the Jacobian
+    assert with_jac['jac_evals'] > 0
+    assert with_jac['lin_rhs_evals'] == 0
+    assert with_jac['rhs_evals'] < without_jac['rhs_evals'] + without_jac['lin_rhs_evals']
+
+    assert np.allclose(results[0], results[1], atol=1e-5)
+
+
+def test_linear_solvers():
+    """ Test the band and SPGMR linear solvers of CVodeSolver against the dense solver """
+
+    from fmpy.sundials import CVodeSolver
+
+    nx = 20
+
+    # tridiagonal system matrix with widely spread eigenvalues
+    A = np.diag(-np.logspace(0, 4, nx)) + np.eye(nx, k=1) + np.eye(nx, k=-1)
+
+    rows, columns = np.nonzero(A)
+
+    x = np.ones(nx)
+
+    class Input:
+        def apply(self, time):
+            pass
+
+    def get_x(px, nx):
+        np.ctypeslib.as_array(px, (nx,))[:] = x
+
+    def set_x(px, nx):
+        x[:] = np.ctypeslib.as_array(px, (nx,))
+
+    def get_dx(pdx, nx):
+        np.ctypeslib.as_array(pdx, (nx,))[:] = A @ x
+
+    def get_nominals(pnominals, nx):
+        np.ctypeslib.as_array(pnominals, (nx,))[:] = 1.0
+
+    def get_jac(J):
+        J[...] = 0.0
+        J[rows, columns] = A[rows, columns]
+
+    def get_jv(pv, pjv, nx):
+        np.ctypeslib.as_array(pjv, (nx,))[:] = A @ np.ctypeslib.as_array(pv, (nx,))
+
+    statistics = {}
+    results = {}
+
+    for linear_solver, options in [('dense', dict(get_jac=get_jac)),
+                                   ('band', dict(get_jac=get_jac, upperBandwidth=1, lowerBandwidth=1)),
+                                   ('spgmr', dict(get_jv=get_jv, maxKrylovDimension=nx))]:
+
+        x[:] = 1.0
+
+        solver = CVodeSolver(nx=nx, nz=0, get_x=get_x, set_x=set_x, get_dx=get_dx, get_z=None,
+                             get_nominals=get_nominals, set_time=lambda t: None, input=Input(),
+                             startTime=0.0, maxStep=1.0, relativeTolerance=1e-6, maxNumSteps=5000,
+                             linearSolver=linear_solver, **options)
+
+        solver.step(0.0, 1.0)
+
+        statistics[linear_solver] = solver.statistics()
+        results[linear_solver] = x.copy()
+
+    assert statistics['band']['jac_evals'] > 0
+    assert statistics['band']['lin_rhs_evals'] == 0
+
+    # matrix-free Jacobian-vector products
+    assert statistics['spgmr']['jac_evals'] == 0
+    assert statistics['spgmr']['jtimes_evals'] > 0
+    assert statistics['spgmr']['lin_rhs_evals'] == 0
+
+    assert np.allclose(results['dense'], results['band'], atol=1e-5)
+    assert np.allclose(results['dense'], results['spgmr'], atol=1e-5)
+
+
+def test_dense_output():
+    """ Test the interpolation of the states with CVodeSolver(denseOutput=True) """
+
+    from fmpy.sundials import CVodeSolver
+
+    x = np.ones(1)
+
+    class Input:
+        def apply(self, time, discrete=True):
+            pass
+
+    def get_x(px, nx):
+        np.ctypeslib.as_array(px, (nx,))[:] = x
+
+    def set_x(px, nx):
+        x[:] = np.ctypeslib.as_array(px, (nx,))
+
+    def get_dx(pdx, nx):
+        np.ctypeslib.as_array(pdx, (nx,))[:] = -x
+
+    def get_nominals(pnominals, nx):
+        np.ctypeslib.as_array(pnominals, (nx,))[:] = 1.0
+
+    solver = CVodeSolver(nx=1, nz=0, get_x=get_x, set_x=set_x, get_dx=get_dx, get_z=None,
+                         get_nominals=get_nominals, set_time=lambda t: None, input=Input(),
+                         startTime=0.0, maxStep=1.0, relativeTolerance=1e-8, denseOutput=True)
+
+    time = 0.0
+    output_points = np.linspace(0.01, 1, 100)
+    values = []
+
+    while time < 1.0:
+
+        previous_time = time
+
+        _, _, time = solver.step(time, 1.0)
+
+        # the solver returns after every internal step
+        assert previous_time < time <= 1.0
+
+        for t in output_points[(output_points > previous_time) & (output_points <= time)]:
+            solver.interpolate(t)
+            values.append(x[0])
+
+        solver.restore()
+
+        assert np.isclose(x[0], np.exp(-time), rtol=1e-5)
+
+    # fewer steps than output points
+    assert solver.statistics()['steps'] < output_points.size
+
+    assert np.allclose(values, np.exp(-output_points), rtol=1e-5)
+
+
+def test_statistics():
+    """ Test that the statistics of CVodeSolver are accumulated across resets """
+
+    from fmpy.sundials import CVodeSolver
+
+    x = np.ones(1)
+
+    class Input:
+        def apply(self, time, discrete=True):
+            pass
+
+    def get_x(px, nx):
+        np.ctypeslib.as_array(px, (nx,))[:] = x
+
+    def set_x(px, nx):
+        x[:] = np.ctypeslib.as_array(px, (nx,))
+
+    def get_dx(pdx, nx):
+        np.ctypeslib.as_array(pdx, (nx,))[:] = -x
+
+    def get_nominals(pnominals, nx):
+        np.ctypeslib.as_array(pnominals, (nx,))[:] = 1.0
+
+    solver = CVodeSolver(nx=1, nz=0, get_x=get_x, set_x=set_x, get_dx=get_dx, get_z=None,
+                         get_nominals=get_nominals, set_time=lambda t: None, input=Input(),
+                         startTime=0.0, method='Adams', maxOrder=3, initialStep=1e-3, minStep=1e-6)
+
+    solver.step(0.0, 1.0)
+
+    before_reset = solver.statistics()
+
+    assert before_reset['resets'] == 0
+    assert before_reset['steps'] > 0
+
+    solver.reset(1.0)
+
+    solver.step(1.0, 2.0)
+
+    after_reset = solver.statistics()
+
+    assert after_reset['resets'] == 1
+
+    for name in ['steps', 'rhs_evals', 'nonlin_iters']:
+        assert after_reset[name] > before_reset[name]
+
+    assert np.isclose(x[0], np.exp(-2.0), rtol=1e-3)
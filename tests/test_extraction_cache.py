@@ -0,0 +1,97 @@
+import os
+import pytest
+from fmpy import simulate_fmu, platform_tuple
+from fmpy.extraction_cache import ExtractionCache, extraction_cache
+
+
+def test_extraction_cache(reference_fmus_dist_dir, tmp_path):
+
+    filename = reference_fmus_dist_dir / '2.0' / 'BouncingBall.fmu'
+
+    cache = ExtractionCache(directory=tmp_path / 'cache')
+
+    unzipdir1 = cache.acquire(filename)
+    unzipdir2 = cache.acquire(filename)
+
+    # the directory is shared
+    assert unzipdir1 == unzipdir2
+    assert os.path.isfile(os.path.join(unzipdir1, 'modelDescription.xml'))
+
+    # an exclusive user gets a separate directory
+    unzipdir3 = cache.acquire(filename, exclusive=True)
+
+    assert unzipdir3 != unzipdir1
+
+    for unzipdir in [unzipdir1, unzipdir2, unzipdir3]:
+        cache.release(unzipdir)
+
+    with pytest.raises(Exception):
+        cache.release(unzipdir1)
+
+    # the least recently used directory that is not in use is removed
+    cache.maxSize = cache.size // 2
+
+    unzipdir4 = cache.acquire(filename)
+
+    assert unzipdir4 == unzipdir1
+    assert not os.path.isdir(unzipdir3)
+
+    cache.release(unzipdir4)
+
+    assert os.path.isdir(unzipdir4)
+
+    cache.clear()
+
+    assert cache.size == 0
+    assert not os.path.isdir(unzipdir4)
+
+
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_simulate_with_extraction_cache(reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / '3.0' / 'BouncingBall.fmu'
+
+    simulate_fmu(filename)
+
+    size = extraction_cache.size
+
+    # the extracted files are reused
+    simulate_fmu(filename)
+
+    assert extraction_cache.size == size
+    assert all(entry.users == 0 for entry in extraction_cache._entries.values())
+
+
+def test_extraction_cache_include(reference_fmus_dist_dir, tmp_path):
+
+    filename = reference_fmus_dist_dir / '2.0' / 'BouncingBall.fmu'
+
+    cache = ExtractionCache(directory=tmp_path / 'cache')
+
+    unzipdir1 = cache.acquire(filename, include=('resources', 'binaries/'))
+
+    assert os.path.isdir(os.path.join(unzipdir1, 'binaries'))
+    assert not os.path.isfile(os.path.join(unzipdir1, 'modelDescription.xml'))
+
+    # a directory with all files is not shared with a filtered one
+    unzipdir2 = cache.acquire(filename)
+
+    assert unzipdir2 != unzipdir1
+    assert os.path.isfile(os.path.join(unzipdir2, 'modelDescription.xml'))
+
+    cache.release(unzipdir1)
+    cache.release(unzipdir2)
+
+
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_release_after_exception(reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / '3.0' / 'BouncingBall.fmu'
+
+    def step_finished(time, recorder):
+        raise Exception('Failed to complete the step.')
+
+    with pytest.raises(Exception):
+        simulate_fmu(filename, step_finished=step_finished)
+
+    assert all(entry.users == 0 for entry in extraction_cache._entries.values())
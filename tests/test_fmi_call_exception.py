@@ -0,0 +1,35 @@
+import pytest
+import shutil
+
+from fmpy import read_model_description, extract, instantiate_fmu, platform_tuple
+from fmpy.fmi1 import FMICallException
+
+
+@pytest.mark.parametrize('fmi_call_logger', [None, print])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_fmi_call_exception(fmi_call_logger, reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / '2.0' / 'Feedthrough.fmu'
+
+    model_description = read_model_description(filename)
+
+    unzipdir = extract(filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'CoSimulation', fmi_call_logger=fmi_call_logger)
+
+    fmu.setupExperiment()
+    fmu.enterInitializationMode()
+    fmu.exitInitializationMode()
+
+    fmu.doStep(currentCommunicationPoint=0, communicationStepSize=0.1)
+
+    # unknown value reference
+    with pytest.raises(FMICallException) as exception_info:
+        fmu.getReal([1000])
+
+    assert exception_info.value.function == 'fmi2GetReal'
+    assert exception_info.value.status == 3
+
+    fmu.terminate()
+    fmu.freeInstance()
+    shutil.rmtree(unzipdir, ignore_errors=True)
@@ -68,3 +68,35 @@ def test_dump(reference_fmus_dist_dir):
 
     # dump the FMU info
     dump(filename)
+
+
+def test_fmi_info(reference_fmus_dist_dir):
+
+    from fmpy import fmi_info
+
+    assert fmi_info(reference_fmus_dist_dir / '1.0' / 'me' / 'BouncingBall.fmu') == ('1.0', ['ModelExchange'])
+    assert fmi_info(reference_fmus_dist_dir / '1.0' / 'cs' / 'BouncingBall.fmu') == ('1.0', ['CoSimulation'])
+    assert fmi_info(reference_fmus_dist_dir / '2.0' / 'BouncingBall.fmu') == ('2.0', ['ModelExchange', 'CoSimulation'])
+
+
+@pytest.mark.parametrize('fmi_version', ['2.0', '3.0'])
+def test_read_model_description_lazy(reference_fmus_dist_dir, fmi_version):
+
+    from fmpy import read_model_description
+
+    filename = reference_fmus_dist_dir / fmi_version / 'BouncingBall.fmu'
+
+    expected = read_model_description(filename, use_cache=False)
+
+    model_description = read_model_description(filename, use_cache=False, lazy=True)
+
+    # the header is read eagerly
+    assert model_description.modelName == expected.modelName
+    assert model_description.guid == expected.guid
+    assert repr(model_description.defaultExperiment) == repr(expected.defaultExperiment)
+    assert repr(model_description.coSimulation) == repr(expected.coSimulation)
+
+    # the other attributes are read on first access
+    assert [repr(v) for v in model_description.modelVariables] == [repr(v) for v in expected.modelVariables]
+    assert [u.variable.name for u in model_description.derivatives] == [u.variable.name for u in expected.derivatives]
+    assert model_description.numberOfContinuousStates == expected.numberOfContinuousStates
@@ -179,3 +179,104 @@ def test_discrete_change_in_continuous_input(reference_fmus_dist_dir, fmi_versio
     assert np.all(result['time'] == [0, 0.25, 0.5, 0.5, 0.75, 1])
     assert np.all(result['Float64_continuous_input'] == [1, 1, 1, 2, 2, 2])
 
+
+
+@pytest.mark.parametrize('fmi_version', ['2.0', '3.0'])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_apply_input(fmi_version, reference_fmus_dist_dir):
+    """ Compare the values set by Input.apply() to Input.interpolate() for arbitrary times """
+
+    from fmpy import read_model_description, extract, instantiate_fmu
+    import shutil
+
+    filename = reference_fmus_dist_dir / fmi_version / 'Feedthrough.fmu'
+
+    model_description = read_model_description(filename)
+
+    unzipdir = extract(filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'CoSimulation')
+
+    if fmi_version == '2.0':
+        fmu.setupExperiment()
+
+    fmu.enterInitializationMode()
+    fmu.exitInitializationMode()
+
+    variables = dict((v.name, v) for v in model_description.modelVariables)
+
+    t = np.array([0, 0.5, 1, 1, 1, 2, 3, 3, 4])
+
+    signals = np.zeros(t.size, dtype=[('time', np.float64), ('Float64_continuous_input', np.float64), ('Int32_input', np.int32)])
+    signals['time'] = t
+    signals['Float64_continuous_input'] = [0, 1, 2, 5, 6, 3, 1, 0, 2]
+    signals['Int32_input'] = [0, 0, 1, 2, 2, 2, 3, 4, 4]
+
+    input = Input(fmu, model_description, signals)
+
+    if fmi_version == '2.0':
+        get_continuous, get_discrete = fmu.getReal, fmu.getInteger
+    else:
+        get_continuous, get_discrete = fmu.getFloat64, fmu.getInt32
+
+    vr_continuous = variables['Float64_continuous_input'].valueReference
+    vr_discrete = variables['Int32_input'].valueReference
+
+    continuous_table = signals['Float64_continuous_input'].reshape(1, -1)
+    discrete_table = signals['Int32_input'].reshape(1, -1)
+
+    # forward, backward and random times
+    times = np.concatenate([t, np.linspace(-1, 5, 61), np.linspace(5, -1, 61), np.random.default_rng(1).uniform(-1, 5, 100)])
+
+    for time in times:
+
+        for after_event in [False, True]:
+
+            input.apply(time, after_event=after_event)
+
+            value, _ = Input.interpolate(time, t, continuous_table, after_event=after_event)
+            assert np.isclose(get_continuous([vr_continuous])[0], value[0], rtol=1e-12, atol=0)
+
+            value, _ = Input.interpolate(time, t, discrete_table, discrete=True, after_event=after_event)
+            assert get_discrete([vr_discrete])[0] == value[0]
+
+        next_events = [t_event for t_event in input.t_events if t_event > time and not np.isclose(t_event, time, rtol=1e-9, atol=0)]
+        assert input.nextEvent(time) == next_events[0]
+
+    fmu.terminate()
+    fmu.freeInstance()
+    shutil.rmtree(unzipdir, ignore_errors=True)
+
+
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_memory_mapped_input(reference_fmus_dist_dir, tmp_path, monkeypatch):
+    """ Simulate with memory-mapped and chunked input signals that are read in windows """
+
+    filename = reference_fmus_dist_dir / '3.0' / 'Feedthrough.fmu'
+
+    t = np.linspace(0, 1, 1001)
+
+    # time events every 100 rows
+    t[100::100] = t[99:-1:100]
+
+    signals = np.zeros(t.size, dtype=[('time', np.float64), ('Float64_continuous_input', np.float64), ('Int32_input', np.int32)])
+    signals['time'] = t
+    signals['Float64_continuous_input'] = np.sin(10 * t)
+    signals['Int32_input'] = np.arange(t.size) // 100
+
+    np.save(tmp_path / 'input.npy', signals)
+
+    monkeypatch.setattr(Input, 'windowSize', 50)
+
+    kwargs = dict(filename=filename, fmi_type='CoSimulation', stop_time=1, output_interval=0.005,
+                  output=['Float64_continuous_output', 'Int32_output'])
+
+    reference = simulate_fmu(input=signals, **kwargs)
+
+    result = simulate_fmu(input=np.load(tmp_path / 'input.npy', mmap_mode='r'), **kwargs)
+
+    assert np.array_equal(result, reference)
+
+    result = simulate_fmu(input=(signals[i:i + 128] for i in range(0, signals.size, 128)), **kwargs)
+
+    assert np.array_equal(result, reference)
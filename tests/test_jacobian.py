@@ -0,0 +1,103 @@
+import pytest
+import shutil
+import numpy as np
+
+from fmpy import read_model_description, extract, instantiate_fmu, platform_tuple
+from fmpy.jacobian import Jacobian, compute_jacobian, get_sparsity_pattern, color_columns
+
+
+def test_color_columns():
+
+    # tridiagonal pattern
+    pattern = np.eye(10, dtype=bool) | np.eye(10, k=1, dtype=bool) | np.eye(10, k=-1, dtype=bool)
+
+    colors = color_columns(pattern)
+
+    assert colors.max() + 1 == 3
+
+    # columns with the same color must not share rows
+    for color in range(3):
+        assert np.all(pattern[:, colors == color].sum(axis=1) <= 1)
+
+
+@pytest.mark.parametrize('fmi_version', ['2.0', '3.0'])
+@pytest.mark.parametrize('use_directional_derivatives', [True, False])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_compute_jacobian(fmi_version, use_directional_derivatives, reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / fmi_version / 'VanDerPol.fmu'
+
+    model_description = read_model_description(filename)
+
+    unzipdir = extract(filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'ModelExchange')
+
+    if fmi_version == '2.0':
+        fmu.setupExperiment()
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+        fmu.newDiscreteStates()
+    else:
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+        fmu.updateDiscreteStates()
+
+    fmu.enterContinuousTimeMode()
+
+    unknowns = [u.variable.name for u in model_description.derivatives]
+    knowns = [u.variable.derivative.name for u in model_description.derivatives]
+
+    assert get_sparsity_pattern(model_description, unknowns, knowns).shape == (2, 2)
+
+    J = compute_jacobian(fmu, model_description, unknowns, knowns,
+                         use_directional_derivatives=use_directional_derivatives)
+
+    # x0 = 2, x1 = 0, mu = 1
+    assert J.toarray() == pytest.approx(np.array([[0, 1], [-1, -3]]), abs=1e-6)
+
+    fmu.terminate()
+    fmu.freeInstance()
+    shutil.rmtree(unzipdir, ignore_errors=True)
+
+
+@pytest.mark.parametrize('fmi_version', ['2.0', '3.0'])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_directional_derivatives_of_interface_type(fmi_version, reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / fmi_version / 'VanDerPol.fmu'
+
+    model_description = read_model_description(filename)
+
+    # only the co-simulation interface provides directional derivatives
+    model_description.modelExchange.providesDirectionalDerivative = False
+    model_description.coSimulation.providesDirectionalDerivative = True
+
+    unzipdir = extract(filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'ModelExchange')
+
+    if fmi_version == '2.0':
+        fmu.setupExperiment()
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+        fmu.newDiscreteStates()
+    else:
+        fmu.enterInitializationMode()
+        fmu.exitInitializationMode()
+        fmu.updateDiscreteStates()
+
+    fmu.enterContinuousTimeMode()
+
+    unknowns = [u.variable.name for u in model_description.derivatives]
+    knowns = [u.variable.derivative.name for u in model_description.derivatives]
+
+    jacobian = Jacobian(fmu, model_description, unknowns, knowns)
+
+    # the finite differences are used for the model exchange instance
+    assert not jacobian.use_directional_derivatives
+    assert jacobian.evaluate().toarray() == pytest.approx(np.array([[0, 1], [-1, -3]]), abs=1e-6)
+
+    fmu.terminate()
+    fmu.freeInstance()
+    shutil.rmtree(unzipdir, ignore_errors=True)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from fmpy import simulate_fmu
+from fmpy.memfd import can_load_from_memory
+
+
+@pytest.mark.parametrize('fmi_version', ['2.0', '3.0'])
+@pytest.mark.skipif(not can_load_from_memory(), reason="Loading from memory is only supported on Linux")
+def test_load_from_memory(fmi_version, reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / fmi_version / 'BouncingBall.fmu'
+
+    reference = simulate_fmu(filename)
+
+    result = simulate_fmu(filename, load_from_memory=True)
+
+    assert np.array_equal(result, reference)
+
+    assert result.statistics['cold_start'] > 0
+
+
+
+@pytest.mark.parametrize('function', ['copyfileobj', 'extract'])
+@pytest.mark.skipif(not can_load_from_memory(), reason="Loading from memory is only supported on Linux")
+def test_clean_up_after_exception(function, reference_fmus_dist_dir, tmp_path, monkeypatch):
+
+    import os
+    import shutil
+    import tempfile
+    import zipfile
+    import fmpy
+    from fmpy.memfd import MemoryBinary
+
+    # add a resource to extract
+    filename = tmp_path / 'BouncingBall.fmu'
+
+    shutil.copyfile(reference_fmus_dist_dir / '2.0' / 'BouncingBall.fmu', filename)
+
+    with zipfile.ZipFile(filename, 'a') as zf:
+        zf.writestr('resources/data.txt', 'data')
+
+    def fail(*args, **kwargs):
+        raise Exception(f'{function}() failed.')
+
+    monkeypatch.setattr(shutil if function == 'copyfileobj' else fmpy, function, fail)
+
+    tempdir = tmp_path / 'temp'
+    tempdir.mkdir()
+
+    monkeypatch.setattr(tempfile, 'tempdir', str(tempdir))
+
+    fds = set(os.listdir('/proc/self/fd'))
+
+    with pytest.raises(Exception):
+        MemoryBinary(filename, 'BouncingBall')
+
+    # the anonymous file is closed and the temporary directory is removed
+    assert set(os.listdir('/proc/self/fd')) == fds
+    assert os.listdir(tempdir) == []
@@ -0,0 +1,103 @@
+import os
+from fmpy import read_model_description
+from fmpy.model_description_cache import ModelDescriptionCache
+
+
+def test_model_description_cache(reference_fmus_dist_dir, tmp_path):
+
+    filename = reference_fmus_dist_dir / '3.0' / 'BouncingBall.fmu'
+
+    cache = ModelDescriptionCache(directory=tmp_path / 'cache')
+
+    model_description = cache.read(filename, validate=True)
+
+    assert len(os.listdir(cache.directory)) == 1
+
+    # read the model description from the cache
+    cached = cache.read(filename, validate=True)
+
+    expected = read_model_description(filename, use_cache=False)
+
+    for model_description in [model_description, cached]:
+        assert model_description.guid == expected.guid
+        assert [repr(v) for v in model_description.modelVariables] == [repr(v) for v in expected.modelVariables]
+        assert [u.variable.name for u in model_description.outputs] == [u.variable.name for u in expected.outputs]
+
+    # other options are cached separately
+    cache.read(filename, validate=False)
+
+    assert len(os.listdir(cache.directory)) == 2
+
+    # the least recently used entries are removed
+    cache.maxSize = 1
+
+    cache.read(filename, validate_variable_names=True)
+
+    assert len(os.listdir(cache.directory)) == 0
+
+    cache.maxSize = 1024 ** 2
+
+    cache.read(filename)
+    cache.clear()
+
+    assert len(os.listdir(cache.directory)) == 0
+
+
+def test_model_description_cache_opt_in(reference_fmus_dist_dir, tmp_path, monkeypatch):
+
+    from fmpy.model_description_cache import model_description_cache
+
+    filename = reference_fmus_dist_dir / '3.0' / 'BouncingBall.fmu'
+
+    monkeypatch.setattr(model_description_cache, 'directory', str(tmp_path / 'cache'))
+
+    # the cache is not used by default
+    read_model_description(filename)
+
+    assert not os.path.isdir(model_description_cache.directory)
+
+    read_model_description(filename, use_cache=True)
+
+    assert len(os.listdir(model_description_cache.directory)) == 1
+
+
+def test_gc_disabled():
+
+    import gc
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Barrier
+    from fmpy.model_description import _gc_disabled
+
+    assert gc.isenabled()
+
+    # nested calls
+    with _gc_disabled():
+        with _gc_disabled():
+            assert not gc.isenabled()
+        assert not gc.isenabled()
+
+    assert gc.isenabled()
+
+    # concurrent calls that finish in a different order than they started
+    barrier = Barrier(4)
+
+    def disable(i):
+        with _gc_disabled():
+            barrier.wait()
+            assert not gc.isenabled()
+        return gc.isenabled()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(disable, range(4)))
+
+    assert gc.isenabled()
+
+    # the collector stays disabled if it was disabled before
+    gc.disable()
+
+    try:
+        with _gc_disabled():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
@@ -0,0 +1,35 @@
+import pytest
+import numpy as np
+from fmpy import simulate_fmu
+
+
+@pytest.mark.parametrize('fmi_version', ['2.0', '3.0'])
+@pytest.mark.parametrize('model_name', ['BouncingBall', 'Dahlquist', 'Feedthrough', 'VanDerPol'])
+def test_native_loop(fmi_version, model_name, reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / fmi_version / f'{model_name}.fmu'
+
+    kwargs = dict(filename=filename, fmi_type='CoSimulation', output_interval=0.01)
+
+    if model_name == 'Feedthrough':
+        input = np.array([(0.0, 0.0, 0), (0.5, 0.0, 0), (0.5, 1.0, 1), (1.0, 2.0, 2)],
+                         dtype=[('time', np.float64), ('Float64_continuous_input', np.float64), ('Int32_input', np.int32)])
+        kwargs.update(input=input, stop_time=1.0)
+
+    reference = simulate_fmu(**kwargs)
+
+    steps = []
+
+    def step_finished(time, recorder):
+        steps.append(time)
+        return True
+
+    result = simulate_fmu(use_native_loop=True, step_finished=step_finished, step_finished_stride=10, **kwargs)
+
+    assert result.dtype == reference.dtype
+
+    for name in reference.dtype.names:
+        assert np.array_equal(result[name], reference[name])
+
+    # step_finished() is called every 10 steps
+    assert 0 < len(steps) <= len(result) // 10
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 from fmpy.util import write_csv, read_csv
 
 
@@ -26,3 +27,49 @@ def test_write_and_read_csv(work_dir):
     result = read_csv(filename)
 
     assert np.all(result == expected)
+
+
+def test_read_csv_chunks(work_dir):
+
+    expected = np.zeros(10, dtype=[('time', np.float64), ('y', np.float64)])
+    expected['time'] = np.linspace(0, 1, 10)
+    expected['y'] = np.arange(10)
+
+    filename = work_dir / 'chunks.csv'
+
+    write_csv(filename, expected)
+
+    chunks = list(read_csv(filename, chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+
+    assert np.all(np.concatenate(chunks) == expected)
+
+
+def test_write_csv_chunks(work_dir):
+
+    result = np.zeros(10, dtype=[('time', np.float64), ('y1', np.int32), ('y2', np.float64, (2,))])
+    result['time'] = np.linspace(0, 1, 10)
+    result['y1'] = np.arange(10)
+    result['y2'] = np.random.default_rng(0).standard_normal((10, 2))
+
+    filename1 = work_dir / 'result1.csv'
+    filename2 = work_dir / 'result2.csv'
+
+    # write the array in chunks and an iterable of chunks
+    write_csv(filename1, result, chunk_size=3)
+    write_csv(filename2, (result[i:i + 4] for i in range(0, 10, 4)))
+
+    with open(filename1) as f1, open(filename2) as f2:
+        assert f1.read() == f2.read()
+
+    traj = read_csv(filename1)
+
+    assert np.all(traj['y1'] == result['y1'])
+    assert np.allclose(traj['y2'], result['y2'], rtol=1e-15)
+
+
+def test_write_csv_empty_iterable(work_dir):
+
+    with pytest.raises(Exception, match='result must not be empty'):
+        write_csv(work_dir / 'result.csv', iter([]))
@@ -0,0 +1,177 @@
+import pytest
+import shutil
+import numpy as np
+
+from fmpy import read_model_description, extract, instantiate_fmu, simulate_fmu, platform_tuple
+from fmpy.simulation import AccessPlan, Recorder
+
+
+@pytest.mark.parametrize('fmi_version', ['2.0', '3.0'])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_recorder(fmi_version, reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / fmi_version / 'Feedthrough.fmu'
+
+    model_description = read_model_description(filename)
+
+    unzipdir = extract(filename)
+
+    fmu = instantiate_fmu(unzipdir, model_description, 'CoSimulation')
+
+    if fmi_version == '2.0':
+        fmu.setupExperiment()
+
+    fmu.enterInitializationMode()
+    fmu.exitInitializationMode()
+
+    plan = AccessPlan(fmu, model_description, ['Float64_continuous_input', 'Int32_input', 'Boolean_input'])
+
+    recorder = Recorder(fmu, model_description, ['Float64_continuous_output', 'Int32_output', 'Boolean_output'])
+
+    # start with a small chunk to test the growth
+    recorder.initialChunkSize = 4
+
+    n_samples = 100
+
+    for i in range(n_samples):
+        plan.record['Float64_continuous_input'] = i / 2
+        plan.record['Int32_input'] = -i
+        plan.record['Boolean_input'] = i % 3 == 0
+        plan.write()
+        recorder.sample(i * 0.1)
+
+    assert recorder.size == n_samples
+    assert len(recorder.rows) == n_samples
+    assert recorder.lastSampleTime == (n_samples - 1) * 0.1
+
+    result = recorder.result()
+
+    assert result.dtype == np.dtype(recorder.cols)
+    assert result.dtype['Boolean_output'] == np.bool_
+
+    i = np.arange(n_samples)
+
+    assert np.all(result['time'] == i * 0.1)
+    assert np.all(result['Float64_continuous_output'] == i / 2)
+    assert np.all(result['Int32_output'] == -i)
+    assert np.all(result['Boolean_output'] == (i % 3 == 0))
+
+    # the rows can still be converted to an array
+    assert np.array_equal(np.array(recorder.rows, dtype=np.dtype(recorder.cols)), result)
+    assert recorder.rows[-1] == result[-1].item()
+
+    fmu.terminate()
+    fmu.freeInstance()
+    shutil.rmtree(unzipdir, ignore_errors=True)
+
+
+@pytest.mark.parametrize('fmi_type', ['ModelExchange', 'CoSimulation'])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_recorder_options(fmi_type, reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / '3.0' / 'Dahlquist.fmu'
+
+    kwargs = dict(filename=filename, fmi_type=fmi_type, stop_time=1, output_interval=0.01)
+
+    reference = simulate_fmu(**kwargs)
+
+    result = simulate_fmu(recorder_options=dict(interval=0.1), **kwargs)
+    assert np.allclose(result['time'], reference['time'][::10])
+
+    result = simulate_fmu(recorder_options=dict(decimation=5), **kwargs)
+    assert np.allclose(result['time'], reference['time'][::5])
+
+    result = simulate_fmu(recorder_options=dict(deadband=0.05), **kwargs)
+    assert result['time'][0] == 0 and np.isclose(result['time'][-1], 1)
+    assert len(result) < len(reference)
+    assert np.all(np.abs(np.diff(result['x'][:-1])) > 0.05)
+
+    # the native loop does not support the recorder options
+    if fmi_type == 'CoSimulation':
+        with pytest.raises(Exception):
+            simulate_fmu(recorder_options=dict(decimation=5), use_native_loop=True, **kwargs)
+
+
+@pytest.mark.parametrize('fmi_type', ['ModelExchange', 'CoSimulation'])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_result_file(fmi_type, reference_fmus_dist_dir, tmp_path):
+
+    filename = reference_fmus_dist_dir / '3.0' / 'BouncingBall.fmu'
+
+    kwargs = dict(filename=filename, fmi_type=fmi_type, stop_time=3, output_interval=0.01)
+
+    reference = simulate_fmu(**kwargs)
+
+    result_file = tmp_path / 'result.npy'
+
+    result = simulate_fmu(recorder_options=dict(resultFile=result_file, chunkSize=16), **kwargs)
+
+    # the result is mapped from the file
+    assert isinstance(result.base, np.memmap)
+    assert result.modelDescription is not None
+
+    assert result.dtype == reference.dtype
+    assert np.array_equal(result, reference)
+
+    assert np.array_equal(np.load(result_file), reference)
+
+
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_mat_result_file(reference_fmus_dist_dir, tmp_path):
+
+    from fmpy.util import read_mat
+
+    filename = reference_fmus_dist_dir / '2.0' / 'BouncingBall.fmu'
+
+    output = ['h', 'v', 'g', 'e']
+
+    kwargs = dict(filename=filename, stop_time=3, output=output)
+
+    reference = simulate_fmu(**kwargs)
+
+    result_file = tmp_path / 'dsres.mat'
+
+    result = simulate_fmu(recorder_options=dict(resultFile=result_file, chunkSize=16), **kwargs)
+
+    assert result.dtype == reference.dtype
+    assert np.array_equal(result, reference)
+
+    traj = read_mat(result_file, variable_names=['g', 'h'])
+
+    assert traj.dtype.names == ('time', 'g', 'h')
+    assert np.array_equal(traj['h'], reference['h'])
+    assert np.all(traj['g'] == reference['g'][0])
+
+
+@pytest.mark.parametrize('suffix', ['.npy', '.mat'])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_read_rows_from_result_file(suffix, reference_fmus_dist_dir, tmp_path):
+
+    filename = reference_fmus_dist_dir / '2.0' / 'BouncingBall.fmu'
+
+    kwargs = dict(filename=filename, fmi_type='CoSimulation', stop_time=3, output_interval=0.01, output=['h', 'v'])
+
+    reference = simulate_fmu(**kwargs)
+
+    recorded = []
+    recorders = []
+
+    def step_finished(time, recorder):
+        recorders.append(recorder)
+        # reading the rows must not close the result file
+        rows = np.asarray(recorder.rows)
+        assert len(rows) == len(recorder.rows)
+        assert recorder.rows[-1] == rows[-1].item()
+        recorded.append(rows)
+        return True
+
+    result = simulate_fmu(recorder_options=dict(resultFile=tmp_path / ('result' + suffix), chunkSize=16),
+                          step_finished=step_finished, **kwargs)
+
+    assert np.array_equal(result, reference)
+
+    for rows in recorded:
+        assert np.array_equal(rows, reference[:len(rows)])
+
+    # result() can be called again
+    assert np.array_equal(recorders[-1].result(), reference)
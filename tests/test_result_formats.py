@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from fmpy.util import write_result, read_result, write_mat, read_mat
+
+
+@pytest.mark.parametrize('format', ['csv', 'npz', 'feather', 'parquet'])
+def test_write_and_read_result(work_dir, format):
+
+    if format in {'feather', 'parquet'}:
+        pytest.importorskip('pyarrow')
+
+    result = np.zeros(10, dtype=[('time', np.float64), ('y1', np.float64), ('y2', np.float64, (3,))])
+    result['time'] = np.linspace(0, 1, 10)
+    result['y1'] = np.arange(10)
+    result['y2'] = np.arange(30).reshape(10, 3)
+
+    filename = work_dir / f'result.{format}'
+
+    write_result(filename, result)
+
+    assert np.all(read_result(filename) == result)
+
+    # read a subset of the columns
+    traj = read_result(filename, columns=['y2'])
+
+    assert traj.dtype.names == ('time', 'y2')
+    assert np.all(traj['y2'] == result['y2'])
+
+
+def test_write_and_read_mat(work_dir):
+
+    result = np.zeros(10, dtype=[('time', np.float64), ('p', np.float64), ('y1', np.int32), ('y2', np.float64, (2,))])
+    result['time'] = np.linspace(0, 1, 10)
+    result['p'] = 2
+    result['y1'] = np.arange(10)
+    result['y2'] = np.arange(20).reshape(10, 2)
+
+    filename = work_dir / 'dsres.mat'
+
+    write_mat(filename, result, parameters=['p'])
+
+    traj = read_result(filename)
+
+    # the arrays are flattened
+    assert traj.dtype.names == ('time', 'p', 'y1', 'y2[1]', 'y2[2]')
+
+    assert np.all(traj['time'] == result['time'])
+    assert np.all(traj['p'] == 2)
+    assert np.all(traj['y1'] == result['y1'])
+    assert np.all(traj['y2[2]'] == result['y2'][:, 1])
+
+    # read a subset of the variables
+    traj = read_mat(filename, variable_names=['y2[1]'])
+
+    assert traj.dtype.names == ('time', 'y2[1]')
@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+from fmpy import simulate_fmu, platform_tuple
+from fmpy.simulation import SolverOptions
+
+
+@pytest.mark.parametrize('fmi_version', ['2.0', '3.0'])
+@pytest.mark.parametrize('solver_options', [
+    dict(linearSolver='band'),
+    dict(linearSolver='spgmr'),
+    dict(denseOutput=True),
+    dict(method='Adams', maxOrder=4, initialStep=1e-4, maxStep=0.1, maxNumSteps=1000),
+    dict(nativeCallbacks=True),
+    dict(nativeCallbacks=True, denseOutput=True),
+])
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_solver_options(fmi_version, solver_options, reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / fmi_version / 'VanDerPol.fmu'
+
+    kwargs = dict(filename=filename, fmi_type='ModelExchange', stop_time=10, relative_tolerance=1e-6)
+
+    reference = simulate_fmu(**kwargs)
+
+    result = simulate_fmu(solver_options=solver_options, **kwargs)
+
+    assert np.allclose(result['time'], reference['time'])
+
+    for name in ['x0', 'x1']:
+        assert np.allclose(result[name], reference[name], atol=1e-3)
+
+    assert result.statistics['steps'] > 0
+    assert result.statistics['rhs_evals'] > 0
+
+
+@pytest.mark.skipif(platform_tuple == "aarch64-darwin", reason="Not supported on aarch64-darwin")
+def test_solver_statistics(reference_fmus_dist_dir):
+
+    filename = reference_fmus_dist_dir / '3.0' / 'BouncingBall.fmu'
+
+    result = simulate_fmu(filename, fmi_type='ModelExchange', solver_options=SolverOptions(maxStep=0.01))
+
+    statistics = result.statistics
+
+    # the solver is reset after every bounce
+    assert statistics['resets'] > 0
+    assert statistics['root_evals'] > 0
+    assert statistics['steps'] >= 300
+
+    # no statistics for co-simulation
+    result = simulate_fmu(filename, fmi_type='CoSimulation')
+
+    assert result.statistics is None
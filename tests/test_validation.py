@@ -39,3 +39,51 @@ def test_validate_start_values():
         simulate_fmu(filename, start_values={'clutch1.sa': 0.0})
 
     assert 'The start values for the following variables could not be set: clutch1.sa' == str(exception_info.value)
+
+
+def test_validate_xml_concurrently():
+
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+    from lxml import etree
+    import fmpy
+    from fmpy.validation import validate_xml
+
+    schema_file = os.path.join(os.path.dirname(fmpy.__file__), 'schema', 'fmi2', 'fmi2ModelDescription.xsd')
+
+    valid = etree.fromstring(b'<fmiModelDescription fmiVersion="2.0" modelName="m" guid="{0}">'
+                             b'<ModelExchange modelIdentifier="m"/>'
+                             b'<ModelVariables><ScalarVariable name="x" valueReference="0"><Real/></ScalarVariable></ModelVariables>'
+                             b'<ModelStructure/>'
+                             b'</fmiModelDescription>')
+
+    invalid = etree.fromstring(b'<fmiModelDescription fmiVersion="2.0" modelName="m"/>')
+
+    def validate(i):
+        return validate_xml(valid if i % 2 else invalid, schema_file)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(validate, range(200)))
+
+    for i, problems in enumerate(results):
+        if i % 2:
+            assert problems == []
+        else:
+            assert problems and all(p.startswith('ERROR (line 1') for p in problems)
+
+
+def test_validate_invalid_variable(tmp_path):
+
+    filename = tmp_path / 'modelDescription.xml'
+
+    # the missing valueReference is reported by the schema validation
+    filename.write_text('<fmiModelDescription fmiVersion="2.0" modelName="m" guid="{0}">'
+                        '<ModelExchange modelIdentifier="m"/>'
+                        '<ModelVariables><ScalarVariable name="x"><Real/></ScalarVariable></ModelVariables>'
+                        '<ModelStructure/>'
+                        '</fmiModelDescription>')
+
+    with pytest.raises(ValidationError) as exception_info:
+        read_model_description(str(filename), validate=True, use_cache=False)
+
+    assert "'valueReference' is required but missing" in exception_info.value.problems[0]